@@ -0,0 +1,189 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.29;
+
+import {LibDEXMaths} from "@libraries/LibDEXMaths.sol";
+import "forge-std/Test.sol";
+
+/*
+ * @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+ * @@@@@@@@@/         '@@@@/            /@@@/         '@@@@@@@@
+ * @@@@@@@@/    /@@@    @@@@@@/    /@@@@@@@/    /@@@    @@@@@@@
+ * @@@@@@@/           _@@@@@@/    /@@@@@@@/    /.     _@@@@@@@@
+ * @@@@@@/    /@@@    '@@@@@/    /@@@@@@@/    /@@    @@@@@@@@@@
+ * @@@@@/            ,@@@@@/    /@@@@@@@/    /@@@,    @@@@@@@@@
+ * @@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@
+ *
+ * @title LibDEXMaths Differential Test - LibDEXMaths against its Python reference model
+ * @copyright 2025
+ * @notice Fuzzes LibDEXMaths and scripts/dex_maths.py (through ffi) with the same inputs
+ * @dev Results must match bit for bit, and both sides must revert on the same inputs
+ * @author BTR Team
+ */
+
+/// @dev External entry points so that library reverts can be caught
+contract LibDEXMathsHarness {
+    function tickToPriceX96V3(int24 _tick) external pure returns (uint160) {
+        return LibDEXMaths.tickToPriceX96V3(_tick);
+    }
+
+    function priceX96ToTickV3(uint160 _priceX96) external pure returns (int24) {
+        return LibDEXMaths.priceX96ToTickV3(_priceX96);
+    }
+
+    function liquidityToAmountsTickV3(int24 _currentTick, int24 _lowTick, int24 _upperTick, uint128 _liquidity)
+        external
+        pure
+        returns (uint256, uint256)
+    {
+        return LibDEXMaths.liquidityToAmountsTickV3(_currentTick, _lowTick, _upperTick, _liquidity);
+    }
+
+    function amountsToLiquidityTickV3(
+        uint160 _priceX96,
+        int24 _lowTick,
+        int24 _upperTick,
+        uint256 _amount0,
+        uint256 _amount1
+    ) external pure returns (uint128) {
+        return LibDEXMaths.amountsToLiquidityTickV3(_priceX96, _lowTick, _upperTick, _amount0, _amount1);
+    }
+
+    function roundTickToSpacing(int24 _tick, int24 _tickSpacing, bool _roundUp) external pure returns (int24) {
+        return LibDEXMaths.roundTickToSpacing(_tick, _tickSpacing, _roundUp);
+    }
+}
+
+contract LibDEXMathsDiffTest is Test {
+    uint160 constant MIN_SQRT = 4295128739;
+    uint160 constant MAX_SQRT = 1461446703485210103287273052203988822378723970342;
+    int24 constant MIN_TICK = -887272;
+    int24 constant MAX_TICK = 887272;
+
+    LibDEXMathsHarness harness;
+
+    function setUp() public {
+        harness = new LibDEXMathsHarness();
+    }
+
+    // --- HELPERS ---
+
+    /// @dev Runs the reference model, returning abi.encode(bool ok, results...)
+    function model(string memory _fn, string[] memory _args) internal returns (bytes memory) {
+        string[] memory cmd = new string[](_args.length + 4);
+        cmd[0] = "python3";
+        cmd[1] = "../scripts/dex_maths.py";
+        cmd[2] = _fn;
+        for (uint256 i = 0; i < _args.length; i++) {
+            cmd[3 + i] = _args[i];
+        }
+        cmd[cmd.length - 1] = "--abi";
+        return vm.ffi(cmd);
+    }
+
+    /// @dev Fuzzed tick with most runs within [MIN_TICK, MAX_TICK], plus the first out of range ticks
+    function boundTick(int24 _tick) internal pure returns (int24) {
+        return int24(bound(int256(_tick), int256(MIN_TICK) - 1, int256(MAX_TICK) + 1));
+    }
+
+    // --- DIFFERENTIAL FUZZ TESTS (one python process per run, hence fewer runs) ---
+
+    /// forge-config: default.fuzz.runs = 256
+    function testFuzzTickToPriceX96V3(int24 _tick) public {
+        _tick = boundTick(_tick);
+        string[] memory args = new string[](1);
+        args[0] = vm.toString(int256(_tick));
+        (bool ok, uint256 expected) = abi.decode(model("tickToPriceX96V3", args), (bool, uint256));
+
+        try harness.tickToPriceX96V3(_tick) returns (uint160 priceX96) {
+            assertTrue(ok, "Model reverts where the library does not");
+            assertEq(priceX96, expected, "tickToPriceX96V3 mismatch");
+        } catch {
+            assertFalse(ok, "Library reverts where the model does not");
+        }
+    }
+
+    /// forge-config: default.fuzz.runs = 256
+    function testFuzzPriceX96ToTickV3(uint160 _priceX96) public {
+        _priceX96 = uint160(bound(_priceX96, MIN_SQRT - 1, MAX_SQRT));
+        string[] memory args = new string[](1);
+        args[0] = vm.toString(uint256(_priceX96));
+        (bool ok, int256 expected) = abi.decode(model("priceX96ToTickV3", args), (bool, int256));
+
+        try harness.priceX96ToTickV3(_priceX96) returns (int24 tick) {
+            assertTrue(ok, "Model reverts where the library does not");
+            assertEq(tick, expected, "priceX96ToTickV3 mismatch");
+        } catch {
+            assertFalse(ok, "Library reverts where the model does not");
+        }
+    }
+
+    /// forge-config: default.fuzz.runs = 256
+    function testFuzzLiquidityToAmountsTickV3(int24 _currentTick, int24 _lowTick, int24 _upperTick, uint128 _liquidity)
+        public
+    {
+        _currentTick = boundTick(_currentTick);
+        _lowTick = boundTick(_lowTick);
+        _upperTick = boundTick(_upperTick);
+        string[] memory args = new string[](4);
+        args[0] = vm.toString(int256(_currentTick));
+        args[1] = vm.toString(int256(_lowTick));
+        args[2] = vm.toString(int256(_upperTick));
+        args[3] = vm.toString(uint256(_liquidity));
+        (bool ok, uint256 expected0, uint256 expected1) =
+            abi.decode(model("liquidityToAmountsTickV3", args), (bool, uint256, uint256));
+
+        try harness.liquidityToAmountsTickV3(_currentTick, _lowTick, _upperTick, _liquidity) returns (
+            uint256 amount0, uint256 amount1
+        ) {
+            assertTrue(ok, "Model reverts where the library does not");
+            assertEq(amount0, expected0, "liquidityToAmountsTickV3 amount0 mismatch");
+            assertEq(amount1, expected1, "liquidityToAmountsTickV3 amount1 mismatch");
+        } catch {
+            assertFalse(ok, "Library reverts where the model does not");
+        }
+    }
+
+    /// forge-config: default.fuzz.runs = 256
+    function testFuzzAmountsToLiquidityTickV3(
+        uint160 _priceX96,
+        int24 _lowTick,
+        int24 _upperTick,
+        uint256 _amount0,
+        uint256 _amount1
+    ) public {
+        _lowTick = boundTick(_lowTick);
+        _upperTick = boundTick(_upperTick);
+        string[] memory args = new string[](5);
+        args[0] = vm.toString(uint256(_priceX96));
+        args[1] = vm.toString(int256(_lowTick));
+        args[2] = vm.toString(int256(_upperTick));
+        args[3] = vm.toString(_amount0);
+        args[4] = vm.toString(_amount1);
+        (bool ok, uint256 expected) = abi.decode(model("amountsToLiquidityTickV3", args), (bool, uint256));
+
+        try harness.amountsToLiquidityTickV3(_priceX96, _lowTick, _upperTick, _amount0, _amount1) returns (
+            uint128 liquidity
+        ) {
+            assertTrue(ok, "Model reverts where the library does not");
+            assertEq(liquidity, expected, "amountsToLiquidityTickV3 mismatch");
+        } catch {
+            assertFalse(ok, "Library reverts where the model does not");
+        }
+    }
+
+    /// forge-config: default.fuzz.runs = 256
+    function testFuzzRoundTickToSpacing(int24 _tick, int24 _tickSpacing, bool _roundUp) public {
+        string[] memory args = new string[](3);
+        args[0] = vm.toString(int256(_tick));
+        args[1] = vm.toString(int256(_tickSpacing));
+        args[2] = vm.toString(_roundUp);
+        (bool ok, int256 expected) = abi.decode(model("roundTickToSpacing", args), (bool, int256));
+
+        try harness.roundTickToSpacing(_tick, _tickSpacing, _roundUp) returns (int24 tick) {
+            assertTrue(ok, "Model reverts where the library does not");
+            assertEq(tick, expected, "roundTickToSpacing mismatch");
+        } catch {
+            assertFalse(ok, "Library reverts where the model does not");
+        }
+    }
+}
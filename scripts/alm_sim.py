@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+ALM Rebalance Simulator
+
+Replays recorded pool price paths through vault range layouts and reports how often each
+layout rebalances, what it earns in fees, what rebalancing swaps cost and how far its token
+ratio drifts from the target in between. Vault accounting follows LibALMBase/LibMetrics with
+the WAD/PREC_BPS integer semantics of the contracts (balances, targetRatio0, vwap, lpPrice0)
+and the bit-exact LibDEXMaths model of dex_maths.py, so a computation that reverts on-chain
+stops the run and is reported instead of being approximated.
+
+As of writing, no price path gets through the on-chain maths: priceX96ToPrice floors the
+squared price before WAD scaling (vwap is 0 below 1 token1 per token0) and
+liquidityToAmount0PriceX96V3 overflows its uint160 denominator above ~2^-32. The default
+`--maths spec` therefore swaps these two for their documented formulas (docs/metrics/alm-vwap.md
+price, Uniswap V3 LiquidityAmounts amount0) and keeps everything else identical, to evaluate
+layouts meanwhile. `--maths onchain` runs the bit-exact maths, to check whether they still revert.
+
+Price paths are CSV or Parquet (pyarrow, pip install -e '.[sim]') with a `timestamp` column
+(seconds), a `tick` or `price_x96` column and, for fee accrual, optional `volume1` (token1
+swap volume of the interval) and `liquidity` (pool active liquidity) columns.
+
+Vault configurations are a YAML/JSON list. Every list under a configuration's `sweep` key is
+expanded into one configuration per value (cartesian product across keys):
+
+  - name: eth-usdc
+    tickSpacing: 60
+    feePpm: 3000              # pool fee tier
+    swapCostBp: 5             # price impact + fees paid on rebalancing swaps
+    amount0: 1000000000000    # initial deposit
+    amount1: 1000000000000000000
+    widths: [1200, 12000]     # full width in ticks of each range, centered on the price
+    weightsBp: [7000, 3000]
+    maxDriftBp: 500           # rebalance when ratio0 drifts this far from targetRatio0
+    rebalanceOutOfRange: true
+    sweep:
+      maxDriftBp: [200, 500, 1000]
+
+Usage: python scripts/alm_sim.py --configs sweep.yaml --prices path1.csv path2.parquet [--out results.csv]
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+from dex_maths import (Q96, WAD, Revert, amounts_to_liquidity_tick_v3,
+                       full_mul_div as mul_div_down,
+                       liquidity_to_amounts_tick_v3, price_x96_to_price,
+                       price_x96_to_tick_v3, round_tick_to_spacing,
+                       tick_to_price_x96_v3)
+from file_pipeline import add_jobs_argument
+
+BPS = 10_000
+PREC_BPS = BPS**2
+PPM = 1_000_000
+
+RESULT_FIELDS = ('name', 'path', 'steps', 'rebalances', 'rebalances_per_day',
+                 'fees1', 'swap_costs0', 'tvl0', 'hodl_tvl0', 'pnl_vs_hodl_bp',
+                 'mean_drift_bp', 'max_drift_bp', 'in_range_bp', 'reverted')
+
+# --- DEX MATHS BACKENDS ---
+
+
+def spec_price(price_x96: int) -> int:
+  """sqrtPriceX96^2 * 1e18 / 2^192 in full precision"""
+  return price_x96 * price_x96 * WAD >> 192
+
+
+def spec_liquidity_to_amounts(current_tick: int, low_tick: int,
+                              upper_tick: int, liquidity: int) -> tuple:
+  """liquidityToAmountsTickV3 with the Uniswap V3 LiquidityAmounts amount0 (no uint160 product)"""
+
+  def amount0(price_x96_a, price_x96_b):
+    price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+    return mul_div_down(liquidity << 96, price_x96_b - price_x96_a,
+                        price_x96_b) // price_x96_a
+
+  def amount1(price_x96_a, price_x96_b):
+    price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+    return mul_div_down(liquidity, price_x96_b - price_x96_a, Q96)
+
+  low, upper = tick_to_price_x96_v3(low_tick), tick_to_price_x96_v3(upper_tick)
+  if current_tick < low_tick:
+    return amount0(low, upper), 0
+  if current_tick >= upper_tick:
+    return 0, amount1(low, upper)
+  current = tick_to_price_x96_v3(current_tick)
+  return amount0(current, upper), amount1(low, current)
+
+
+MATHS = {
+    'onchain': {
+        'price': price_x96_to_price,
+        'amounts': liquidity_to_amounts_tick_v3
+    },
+    'spec': {
+        'price': spec_price,
+        'amounts': spec_liquidity_to_amounts
+    },
+}
+
+# --- CONTRACT MATHS (LibMaths / LibALMBase / DEXAdapter) ---
+
+
+def vwap(prices: list, weights_bp: list) -> int:
+  """LibALMBase.vwap of ranges priced by their pool, reverting on a 0 (stale) price"""
+  weighted_sum = sum(p * w for p, w in zip(prices, weights_bp) if w)
+  total_weight_bp = sum(w for w in weights_bp if w)
+  price = weighted_sum // total_weight_bp if total_weight_bp else 0
+  if price == 0:
+    raise Revert("StalePrice")
+  return price
+
+
+def liquidity_ratio0(maths: dict, tick: int, lower: int, upper: int) -> int:
+  """DEXAdapter.liquidityRatio0 with the PREC_BPS probe liquidity of LibALMBase.rangeRatio0"""
+  amount0, amount1 = maths['amounts'](tick, lower, upper, PREC_BPS)
+  if amount0 + amount1 == 0:
+    return 0
+  return mul_div_down(amount0, PREC_BPS, amount0 + amount1)
+
+
+def target_ratio0(maths: dict, tick: int, ranges: list) -> int:
+  """LibALMBase.targetRatio0, in PREC_BPS"""
+  target = sum(
+      mul_div_down(liquidity_ratio0(maths, tick, r['lower'], r['upper']),
+                   r['weightBp'], BPS) for r in ranges if r['weightBp'])
+  return min(target, PREC_BPS)
+
+
+def lp_price0(maths: dict, tick: int, lower: int, upper: int,
+              price: int) -> int:
+  """DEXAdapter.lpPrice0AtPrice: token0 value of WAD liquidity"""
+  amount0, amount1 = maths['amounts'](tick, lower, upper, WAD)
+  return amount0 + mul_div_down(amount1, WAD, price)
+
+
+def total_balances(maths: dict, vault: dict, tick: int) -> tuple:
+  """LibALMBase.totalBalances: range positions plus cash"""
+  balance0, balance1 = vault['cash0'], vault['cash1']
+  for r in vault['ranges']:
+    if r['liquidity']:
+      amount0, amount1 = maths['amounts'](tick, r['lower'], r['upper'],
+                                          r['liquidity'])
+      balance0 += amount0
+      balance1 += amount1
+  return balance0, balance1
+
+
+def to_token0(amount0: int, amount1: int, price: int) -> int:
+  """Token0 value of a balance at a WAD price (amountsToShares convention)"""
+  return amount0 + mul_div_down(amount1, WAD, price)
+
+
+# --- SIMULATION ---
+
+
+def expand(configs: list) -> list:
+  """One configuration per combination of each configuration's `sweep` values"""
+  expanded = []
+  for config in configs:
+    sweep = config.get('sweep', {})
+    base = {k: v for k, v in config.items() if k != 'sweep'}
+    keys = list(sweep)
+    for values in itertools.product(*(sweep[k] for k in keys)):
+      variant = dict(base, **dict(zip(keys, values)))
+      suffix = ",".join(f"{k}={v}" for k, v in zip(keys, values))
+      variant['name'] = f"{base['name']}[{suffix}]" if suffix else base['name']
+      expanded.append(variant)
+  return expanded
+
+
+@lru_cache(maxsize=None)
+def load_path(path: str) -> tuple:
+  """Price path rows as (timestamp, tick, price_x96, volume1, liquidity) int tuples"""
+  if path.endswith('.parquet'):
+    try:
+      import pyarrow.parquet as pq
+    except ImportError:
+      raise ImportError(
+          "pyarrow is required for parquet price paths: pip install -e '.[sim]'"
+      )
+    columns = pq.read_table(path).to_pydict()
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+  else:
+    with open(path, newline='') as f:
+      rows = list(csv.DictReader(f))
+
+  def column(row, name):
+    value = row.get(name)
+    return int(value) if value not in (None, '') else None
+
+  steps = []
+  for row in rows:
+    price_x96 = column(row, 'price_x96')
+    tick = column(row, 'tick')
+    if price_x96 is None:
+      price_x96 = tick_to_price_x96_v3(tick)
+    elif tick is None:
+      tick = price_x96_to_tick_v3(price_x96)
+    steps.append((column(row, 'timestamp') or 0, tick, price_x96,
+                  column(row, 'volume1') or 0, column(row, 'liquidity') or 0))
+  return tuple(steps)
+
+
+def place_ranges(config: dict, tick: int) -> list:
+  """Ranges of the layout centered on tick, snapped to the tick spacing"""
+  spacing = config['tickSpacing']
+  return [{
+      'lower': round_tick_to_spacing(tick - width // 2, spacing, False),
+      'upper': round_tick_to_spacing(tick + width // 2, spacing, True),
+      'weightBp': weight_bp,
+      'liquidity': 0
+  } for width, weight_bp in zip(config['widths'], config['weightsBp'])]
+
+
+def rebalance(maths: dict, vault: dict, config: dict, tick: int,
+              price_x96: int, price: int, stats: dict):
+  """Burn every range, swap to the new layout's token split and mint it"""
+  vault['cash0'], vault['cash1'] = total_balances(maths, vault, tick)
+  ranges = place_ranges(config, tick)
+  total0 = to_token0(vault['cash0'], vault['cash1'], price)
+  # Keep the worst case swap cost aside so the swapped balances cover the mints
+  budget0 = mul_div_down(total0, BPS - config.get('swapCostBp', 0), BPS)
+
+  needs = []
+  for r in ranges:
+    liquidity = mul_div_down(
+        mul_div_down(budget0, r['weightBp'], BPS), WAD,
+        lp_price0(maths, tick, r['lower'], r['upper'], price))
+    needs.append(maths['amounts'](tick, r['lower'], r['upper'], liquidity))
+  need0 = sum(n[0] for n in needs)
+  need1 = sum(n[1] for n in needs)
+
+  cost_bp = config.get('swapCostBp', 0)
+  if need0 > vault['cash0']:  # sell token1 for the missing token0
+    bought0 = need0 - vault['cash0']
+    sold1 = mul_div_down(bought0, price, WAD)
+    cost1 = mul_div_down(sold1, cost_bp, BPS)
+    vault['cash0'] += bought0
+    vault['cash1'] -= sold1 + cost1
+    stats['swap_costs0'] += mul_div_down(cost1, WAD, price)
+  elif need1 > vault['cash1']:  # sell token0 for the missing token1
+    bought1 = need1 - vault['cash1']
+    sold0 = mul_div_down(bought1, WAD, price)
+    cost0 = mul_div_down(sold0, cost_bp, BPS)
+    vault['cash1'] += bought1
+    vault['cash0'] -= sold0 + cost0
+    stats['swap_costs0'] += cost0
+
+  for r, (amount0, amount1) in zip(ranges, needs):
+    r['liquidity'] = amounts_to_liquidity_tick_v3(price_x96, r['lower'],
+                                                  r['upper'], amount0, amount1)
+    minted0, minted1 = maths['amounts'](tick, r['lower'], r['upper'],
+                                        r['liquidity'])
+    vault['cash0'] -= minted0
+    vault['cash1'] -= minted1
+  vault['ranges'] = ranges
+  stats['rebalances'] += 1
+
+
+def simulate(config: dict, path: str, maths_name: str = 'spec') -> dict:
+  """Replay one price path through one vault configuration"""
+  maths = MATHS[maths_name]
+  steps = load_path(path)
+  stats = {
+      'name': config['name'],
+      'path': Path(path).name,
+      'steps': 0,
+      'rebalances': 0,
+      'fees1': 0,
+      'swap_costs0': 0,
+      'reverted': ''
+  }
+  drifts, in_range = [], 0
+  vault = {
+      'cash0': int(config['amount0']),
+      'cash1': int(config['amount1']),
+      'ranges': []
+  }
+  max_drift = config.get('maxDriftBp', BPS) * (PREC_BPS // BPS)
+
+  done = 0
+  try:
+    for _, tick, price_x96, volume1, pool_liquidity in steps:
+      price = vwap([maths['price'](price_x96)], [BPS])
+      if done:
+        # LP fees of the interval, pro rata of the active liquidity
+        active = sum(r['liquidity'] for r in vault['ranges']
+                     if r['lower'] <= tick < r['upper'])
+        if active and volume1 and pool_liquidity:
+          fees1 = volume1 * config.get(
+              'feePpm', 0) // PPM * active // (pool_liquidity + active)
+          vault['cash1'] += fees1
+          stats['fees1'] += fees1
+
+        balance0, balance1 = total_balances(maths, vault, tick)
+        ratio0 = mul_div_down(balance0, PREC_BPS, balance0 +
+                              balance1) if balance0 + balance1 else 0
+        drift = abs(ratio0 - target_ratio0(maths, tick, vault['ranges']))
+        drifts.append(drift)
+        out_of_range = any(not r['lower'] <= tick < r['upper']
+                           for r in vault['ranges'])
+        in_range += not out_of_range
+        if drift > max_drift or (out_of_range
+                                 and config.get('rebalanceOutOfRange', True)):
+          rebalance(maths, vault, config, tick, price_x96, price, stats)
+      else:
+        rebalance(maths, vault, config, tick, price_x96, price, stats)
+      done += 1
+  except Revert as e:
+    stats['reverted'] = f"step {done}: {e}"
+
+  stats['steps'] = done
+  elapsed = steps[done - 1][0] - steps[0][0] if done else 0
+  stats['rebalances_per_day'] = round(stats['rebalances'] * 86400 /
+                                      elapsed, 4) if elapsed else ''
+  scale = PREC_BPS // BPS
+  stats['mean_drift_bp'] = sum(drifts) // len(drifts) // scale if drifts else 0
+  stats['max_drift_bp'] = max(drifts, default=0) // scale
+  stats['in_range_bp'] = in_range * BPS // len(drifts) if drifts else 0
+
+  stats.update(tvl0='', hodl_tvl0='', pnl_vs_hodl_bp='')
+  if done:
+    _, tick, price_x96, _, _ = steps[done - 1]
+    try:
+      price = vwap([maths['price'](price_x96)], [BPS])
+      stats['tvl0'] = to_token0(*total_balances(maths, vault, tick), price)
+      stats['hodl_tvl0'] = to_token0(int(config['amount0']),
+                                     int(config['amount1']), price)
+      stats['pnl_vs_hodl_bp'] = (stats['tvl0'] - stats['hodl_tvl0']) * BPS // (
+          stats['hodl_tvl0'] or 1)
+    except Revert:
+      pass
+  return stats
+
+
+def _simulate(job: tuple) -> dict:
+  return simulate(*job)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Replay price paths through ALM vault range layouts')
+  parser.add_argument('--configs',
+                      type=Path,
+                      required=True,
+                      help='YAML/JSON list of vault configurations')
+  parser.add_argument('--prices',
+                      nargs='+',
+                      required=True,
+                      help='price path files (.csv or .parquet)')
+  parser.add_argument('--out', type=Path, help='results CSV (default: stdout)')
+  parser.add_argument(
+      '--maths',
+      choices=MATHS,
+      default='spec',
+      help=
+      'DEX price/amount maths: documented formulas (default) or bit-exact LibDEXMaths'
+  )
+  add_jobs_argument(parser)
+  args = parser.parse_args()
+
+  with open(args.configs) as f:
+    configs = expand(yaml.safe_load(f))
+  for path in args.prices:
+    if not Path(path).is_file():
+      print(f"❌ Price path not found: {path}")
+      sys.exit(1)
+
+  jobs = [(config, path, args.maths) for config in configs
+          for path in args.prices]
+  workers = min(args.jobs or (os.cpu_count() or 1), len(jobs))
+  if workers > 1:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      results = list(
+          executor.map(_simulate,
+                       jobs,
+                       chunksize=max(1,
+                                     len(jobs) // (workers * 4))))
+  else:
+    results = [_simulate(job) for job in jobs]
+
+  out = open(args.out, 'w', newline='') if args.out else sys.stdout
+  try:
+    writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+    writer.writeheader()
+    writer.writerows(results)
+  finally:
+    if args.out:
+      out.close()
+
+  reverted = sum(1 for r in results if r['reverted'])
+  if args.out:
+    print(f"📝 {len(results)} simulation(s) written to {args.out}")
+  if reverted:
+    print(f"⚠️ {reverted} simulation(s) stopped on a reverting computation",
+          file=sys.stderr)
+    if args.maths == 'onchain':
+      print(
+          "   on-chain LibDEXMaths revert on these paths, drop --maths onchain "
+          "for the documented price/amount formulas",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+  main()
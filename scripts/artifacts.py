@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Forge Artifact Store
+
+Lazy access to the top-level keys of evm/out artifacts (abi, bytecode, deployedBytecode,
+methodIdentifiers, ast...). Files are memory-mapped and scanned key by key only as far as
+needed: values are skipped with C-level regex matches without being decoded, and only the
+requested ones are parsed, so reading `abi` never materialises the bytecode, source maps or
+AST that follow it.
+
+The byte ranges found are kept in a compact index (.cache/artifacts.index.json) keyed by
+(mtime, size) with a sha256 fallback, so later runs slice values out directly.
+
+Usage (library): store = default_store(); store.read(artifact_path("BTRDiamond"), ("abi",))
+"""
+
+import hashlib
+import json
+import mmap
+import re
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+ARTIFACTS_DIR = ROOT / "evm" / "out"
+INDEX_PATH = ROOT / ".cache" / "artifacts.index.json"
+
+OPEN_RE = re.compile(rb'\s*\{')
+# `"key":` of the top-level object, from just after `{` or `,`
+KEY_RE = re.compile(rb'\s*("(?:[^"\\]|\\.)*")\s*:\s*')
+SEPARATOR_RE = re.compile(rb'\s*([,}])')
+STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"')
+SCALAR_RE = re.compile(rb'[^,}\]\s]+')
+# Tokens that matter when skipping a container: strings (may hold brackets) and brackets
+TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]')
+
+
+def artifact_path(contract_name: str) -> Path:
+  return ARTIFACTS_DIR / f"{contract_name}.sol" / f"{contract_name}.json"
+
+
+def _skip_value(buf, start: int) -> int:
+  """End offset of the JSON value starting at start"""
+  first = buf[start:start + 1]
+  if first == b'"':
+    return STRING_RE.match(buf, start).end()
+  if first not in (b'{', b'['):
+    return SCALAR_RE.match(buf, start).end()
+  depth = 0
+  for token in TOKEN_RE.finditer(buf, start):
+    bracket = token.group()
+    if bracket[:1] == b'"':
+      continue
+    depth += 1 if bracket in (b'{', b'[') else -1
+    if depth == 0:
+      return token.end()
+  raise ValueError("unterminated JSON value")
+
+
+def _scan(buf, entry: dict, wanted: set):
+  """
+  Record the byte range of top-level keys until every wanted key is found, resuming where the
+  previous scan of this entry stopped. entry['next'] is None once the whole object is scanned.
+  """
+  pos = entry['next']
+  if pos == 0:
+    pos = OPEN_RE.match(buf).end()
+  keys = entry['keys']
+  while pos is not None and not wanted <= keys.keys():
+    match = KEY_RE.match(buf, pos)
+    if not match:  # empty object
+      pos = None
+      break
+    start = match.end()
+    end = _skip_value(buf, start)
+    keys[json.loads(match.group(1))] = [start, end]
+    separator = SEPARATOR_RE.match(buf, end)
+    pos = separator.end() if separator.group(1) == b',' else None
+  entry['next'] = pos
+
+
+class ArtifactStore:
+  """Top-level key access to forge artifacts, backed by a persistent offset index"""
+
+  def __init__(self, index_path: Path = INDEX_PATH):
+    self.index_path = index_path
+    try:
+      with open(index_path) as f:
+        self.index = json.load(f)
+    except (OSError, ValueError):
+      self.index = {}
+    self.dirty = False
+
+  def _entry(self, path: Path, buf) -> dict:
+    """Index entry of an artifact, reset when its content changed"""
+    stat = path.stat()
+    key = str(
+        path.relative_to(ROOT)) if path.is_relative_to(ROOT) else str(path)
+    entry = self.index.get(key)
+    if entry and entry['mtime'] == stat.st_mtime_ns and entry[
+        'size'] == stat.st_size:
+      return entry
+
+    digest = hashlib.sha256(buf).hexdigest()
+    if not entry or entry['hash'] != digest:
+      entry = {'hash': digest, 'keys': {}, 'next': 0}
+    entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+    self.index[key] = entry
+    self.dirty = True
+    return entry
+
+  def read(self, path: Path, keys) -> dict:
+    """Decode the requested top-level keys of an artifact (absent keys are left out)"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(),
+                                          0,
+                                          access=mmap.ACCESS_READ) as buf:
+      entry = self._entry(path, buf)
+      wanted = set(keys)
+      if not wanted <= entry['keys'].keys() and entry['next'] is not None:
+        _scan(buf, entry, wanted)
+        self.dirty = True
+      return {
+          key: json.loads(buf[start:end])
+          for key, (start, end) in entry['keys'].items() if key in wanted
+      }
+
+  def get(self, path: Path, key: str, default=None):
+    return self.read(path, (key, )).get(key, default)
+
+  def digest(self, path: Path) -> str:
+    """sha256 of an artifact's content, rehashed only when its (mtime, size) changed"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(),
+                                          0,
+                                          access=mmap.ACCESS_READ) as buf:
+      return self._entry(path, buf)['hash']
+
+  def save(self):
+    """Persist the index if anything was (re)scanned"""
+    if not self.dirty:
+      return
+    self.index_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(self.index_path, 'w') as f:
+      json.dump(self.index, f, separators=(',', ':'))
+    self.dirty = False
+
+
+@lru_cache(maxsize=None)
+def default_store() -> ArtifactStore:
+  """Process-wide store over the repository's artifact index"""
+  return ArtifactStore()
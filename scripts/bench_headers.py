@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Header Stripping Benchmark
+
+Times the format_headers and strip_headers Solidity strippers over the repository's
+.sol files and over a synthetic tree (built in a temporary directory by replicating
+those sources). Files are read but never rewritten.
+Usage: python scripts/bench_headers.py [--synthetic 10000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from format_headers import strip_header
+from strip_headers import strip_text
+from walk import iter_files
+
+ROOT = Path(__file__).parent.parent
+
+STRIPPERS = {
+    'format_headers': lambda text: strip_header(text.splitlines(), '.sol'),
+    'strip_headers': strip_text,
+}
+
+
+def repo_sources() -> list:
+  """All first-party Solidity sources (build outputs and dependencies excluded)"""
+  return list(iter_files(ROOT / 'evm'))
+
+
+def build_synthetic_tree(base: Path, sources: list, count: int) -> list:
+  """Write count files replicating sources, 100 per directory"""
+  texts = [f.read_text() for f in sources]
+  files = []
+  for i in range(count):
+    directory = base / f"d{i // 100:03d}"
+    directory.mkdir(exist_ok=True)
+    path = directory / f"F{i}.sol"
+    path.write_text(texts[i % len(texts)])
+    files.append(path)
+  return files
+
+
+def bench(label: str, files: list):
+  """Read and strip every file with each stripper, printing throughput"""
+  size = sum(f.stat().st_size for f in files)
+  print(f"{label}: {len(files)} files, {size / 1e6:.1f} MB")
+  for name, strip in STRIPPERS.items():
+    start = time.perf_counter()
+    for f in files:
+      strip(f.read_text())
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {name:<16} {elapsed:8.3f}s  {len(files) / elapsed:10.0f} files/s")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--synthetic',
+                      type=int,
+                      default=10000,
+                      help='number of files in the synthetic tree (0 to skip)')
+  args = parser.parse_args()
+
+  sources = repo_sources()
+  bench('repository', sources)
+  if args.synthetic:
+    with tempfile.TemporaryDirectory() as tmp:
+      bench('synthetic',
+            build_synthetic_tree(Path(tmp), sources, args.synthetic))
+
+
+if __name__ == '__main__':
+  main()
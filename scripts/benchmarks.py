@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Contract Size & Gas Benchmarks
+
+Records the runtime/init bytecode sizes of the diamond, its facets and adapters (read from the
+evm/out artifacts forge build --sizes reports on) and, optionally, their forge test --gas-report
+figures, per commit in a compact local store (.cache/benchmarks.json). Each record is checked
+against the EIP-170 (runtime) and EIP-3860 (initcode) limits, the gas budgets and the nearest
+recorded ancestor commit; errors (limit or budget exceeded) exit with 1.
+
+Gas budgets cap the median gas of a function call: --gas-budget applies to every function,
+a "gasBudget" entry of a contract in contracts.json (a number, or {"fn(sig)": gas}) overrides it.
+
+Usage: python scripts/benchmarks.py record [--build] [--gas] [--gas-report FILE]
+       python scripts/benchmarks.py diff [BASE] [HEAD] [--all]
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from artifacts import artifact_path, default_store
+from generate_deployers import load_contracts_config
+
+ROOT = Path(__file__).parent.parent
+EVM_DIR = ROOT / "evm"
+STORE_PATH = ROOT / ".cache" / "benchmarks.json"
+MAX_RECORDS = 500
+
+EIP170_LIMIT = 24576  # max runtime bytecode size
+EIP3860_LIMIT = 49152  # max initcode size
+
+# Gas stats order in the store
+GAS_FIELDS = ('min', 'mean', 'median', 'max', 'calls')
+# Start of the JSON gas report, past the test results
+GAS_JSON_RE = re.compile(r'^\[\s*\{', re.MULTILINE)
+# Contract header cell of a gas report table: `src/facets/X.sol:X contract`
+GAS_CONTRACT_RE = re.compile(r'^(?:\S+:)?(\w+)\s+contract$', re.IGNORECASE)
+
+
+def tracked_contracts(config: dict) -> dict:
+  """Tracked contract name -> its contracts.json entry (diamond, facets and adapters)"""
+  contracts = {'BTRDiamond': config.get('BTRDiamond', {})}
+  contracts.update(config.get('facets', {}))
+  for adapters in config.get('adapters', {}).values():
+    contracts.update(adapters)
+  return contracts
+
+
+def bytecode_size(bytecode) -> int:
+  """Byte length of an artifact's bytecode object (library placeholders count as addresses)"""
+  code = (bytecode or {}).get('object', '')
+  return len(code[2:] if code.startswith('0x') else code) // 2
+
+
+def read_sizes(names) -> dict:
+  """name -> [runtime size, init size] of every compiled contract"""
+  store = default_store()
+  sizes = {}
+  for name in names:
+    path = artifact_path(name)
+    if not path.exists():
+      continue
+    values = store.read(path, ('deployedBytecode', 'bytecode'))
+    sizes[name] = [
+        bytecode_size(values.get('deployedBytecode')),
+        bytecode_size(values.get('bytecode'))
+    ]
+  store.save()
+  return sizes
+
+
+def _as_int(cell: str) -> int:
+  try:
+    return int(float(cell.replace(',', '')))
+  except ValueError:
+    return 0
+
+
+def parse_gas_report(output: str) -> dict:
+  """
+  name -> {'deployment': [gas, size], 'functions': {fn: [min, mean, median, max, calls]}} from
+  the JSON (--gas-report --json) or table output of forge test --gas-report
+  """
+  gas = {}
+  report = None
+  start = GAS_JSON_RE.search(output)
+  if start:
+    try:
+      report, _ = json.JSONDecoder().raw_decode(output, start.start())
+    except ValueError:
+      pass
+  if isinstance(report, list):
+    for contract in report:
+      name = contract['contract'].rsplit(':', 1)[-1]
+      deployment = contract.get('deployment', {})
+      gas[name] = {
+          'deployment': [deployment.get('gas', 0),
+                         deployment.get('size', 0)],
+          'functions': {
+              fn: [stats.get(field, 0) for field in GAS_FIELDS]
+              for fn, stats in contract.get('functions', {}).items()
+          }
+      }
+    return gas
+
+  current, section = None, None
+  for line in output.splitlines():
+    line = line.strip()
+    if not line.startswith('|'):
+      continue
+    cells = [cell.strip() for cell in line.strip('|').split('|')]
+    # Rule rows: |---|---| (forge 0.2) or |---+---| (forge 1.x, a single cell)
+    if len(cells) < 2 or set(cells[0]) <= set('-+=:'):
+      continue
+    match = GAS_CONTRACT_RE.match(cells[0])
+    if match:
+      current = gas.setdefault(match.group(1), {
+          'deployment': [0, 0],
+          'functions': {}
+      })
+      section = None
+    elif current is None or not cells[0]:
+      continue
+    elif cells[0] in ('Deployment Cost', 'Function Name'):
+      section = cells[0]
+    elif section == 'Deployment Cost':
+      current['deployment'] = [_as_int(cells[0]), _as_int(cells[1])]
+    elif section == 'Function Name' and len(cells) >= 6:
+      # Table columns: min, avg, median, max, # calls
+      current['functions'][cells[0]] = [_as_int(c) for c in cells[1:6]]
+  return gas
+
+
+def git(*args) -> str:
+  result = subprocess.run(['git', *args],
+                          cwd=ROOT,
+                          capture_output=True,
+                          text=True)
+  if result.returncode != 0:
+    sys.exit(f"git {args[0]} failed: {result.stderr.strip()}")
+  return result.stdout.strip()
+
+
+def current_key() -> str:
+  """HEAD commit, suffixed with -dirty when tracked files are modified"""
+  commit = git('rev-parse', 'HEAD')
+  dirty = git('status', '--porcelain', '--untracked-files=no', '--', 'evm')
+  return f"{commit}-dirty" if dirty else commit
+
+
+def resolve_key(store: dict, ref: str) -> str:
+  """Store key of a git ref, or of a recorded commit/key prefix"""
+  if ref in store:
+    return ref
+  matches = [key for key in store if key.startswith(ref)]
+  if len(matches) == 1:
+    return matches[0]
+  result = subprocess.run(
+      ['git', 'rev-parse', '--verify', '--quiet', f"{ref}^{{commit}}"],
+      cwd=ROOT,
+      capture_output=True,
+      text=True)
+  if result.stdout.strip() in store:
+    return result.stdout.strip()
+  sys.exit(f"❌ No benchmark recorded for {ref}")
+
+
+def baseline_key(store: dict, key: str):
+  """Nearest recorded first-parent ancestor of key (HEAD itself for a dirty record)"""
+  commit = key.removesuffix('-dirty')
+  history = git('rev-list', '--first-parent', '--max-count=1000', commit)
+  for candidate in history.splitlines():
+    if candidate != key and candidate in store:
+      return candidate
+  return None
+
+
+def load_store(path: Path = STORE_PATH) -> dict:
+  try:
+    with open(path) as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+def save_store(store: dict, path: Path = STORE_PATH):
+  """Persist the newest MAX_RECORDS records"""
+  keys = sorted(store, key=lambda key: store[key]['time'])[-MAX_RECORDS:]
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump({key: store[key]
+               for key in keys},
+              f,
+              separators=(',', ':'),
+              sort_keys=True)
+
+
+def gas_budgets(contract_config: dict, default: int) -> tuple:
+  """(default budget, {fn: budget}) of a contract"""
+  budget = contract_config.get('gasBudget')
+  if isinstance(budget, dict):
+    return default, budget
+  return budget or default, {}
+
+
+def check(record: dict, baseline: dict, contracts: dict, gas_budget: int,
+          size_margin: int, max_increase: float) -> tuple:
+  """(errors, warnings) of a record against the limits, gas budgets and baseline"""
+  errors, warnings = [], []
+  base_sizes = (baseline or {}).get('sizes', {})
+  for name, (runtime, init) in sorted(record['sizes'].items()):
+    if runtime > EIP170_LIMIT:
+      errors.append(
+          f"{name}: runtime size {runtime} exceeds EIP-170 ({EIP170_LIMIT})")
+    elif runtime > EIP170_LIMIT - size_margin:
+      warnings.append(
+          f"{name}: runtime size {runtime} within {EIP170_LIMIT - runtime} bytes of EIP-170"
+      )
+    if init > EIP3860_LIMIT:
+      errors.append(
+          f"{name}: init size {init} exceeds EIP-3860 ({EIP3860_LIMIT})")
+    if name in base_sizes and runtime > base_sizes[name][0]:
+      warnings.append(
+          f"{name}: runtime size {base_sizes[name][0]} -> {runtime} (+{runtime - base_sizes[name][0]})"
+      )
+
+  base_gas = (baseline or {}).get('gas', {})
+  median = GAS_FIELDS.index('median')
+  for name, report in sorted(record.get('gas', {}).items()):
+    default, budgets = gas_budgets(contracts.get(name, {}), gas_budget)
+    base_functions = base_gas.get(name, {}).get('functions', {})
+    for fn, stats in sorted(report['functions'].items()):
+      budget = budgets.get(fn, default)
+      if budget and stats[median] > budget:
+        errors.append(
+            f"{name}.{fn}: median gas {stats[median]} exceeds budget {budget}")
+      previous = base_functions.get(fn)
+      if previous and previous[median] and stats[median] > previous[median] * (
+          1 + max_increase / 100):
+        warnings.append(
+            f"{name}.{fn}: median gas {previous[median]} -> {stats[median]}"
+            f" (+{100 * (stats[median] / previous[median] - 1):.1f}%)")
+  return errors, warnings
+
+
+def run_forge(args: list) -> str:
+  """Run a forge command in evm/, echoing and returning its output"""
+  result = subprocess.run(['forge', *args],
+                          cwd=EVM_DIR,
+                          capture_output=True,
+                          text=True)
+  print(result.stdout, end='')
+  if result.returncode != 0:
+    print(result.stderr, end='', file=sys.stderr)
+    print(f"❌ forge {args[0]} failed")
+    sys.exit(1)
+  return result.stdout
+
+
+def record(args):
+  config = load_contracts_config()
+  contracts = tracked_contracts(config)
+  if args.build:
+    run_forge(['build', '--sizes'])
+
+  sizes = read_sizes(contracts)
+  if not sizes:
+    print("❌ No artifacts found in evm/out, build first (or pass --build)")
+    sys.exit(1)
+  entry = {'time': int(time.time()), 'sizes': sizes}
+
+  report = None
+  if args.gas_report:
+    report = Path(args.gas_report).read_text()
+  elif args.gas:
+    report = run_forge(['test', '--gas-report'])
+  if report is not None:
+    entry['gas'] = {
+        name: gas
+        for name, gas in parse_gas_report(report).items() if name in contracts
+    }
+
+  store = load_store()
+  key = current_key()
+  base_key = baseline_key(store, key)
+  baseline = store.get(base_key)
+  store[key] = entry
+  if not args.dry_run:
+    save_store(store)
+    print(f"📝 Recorded {len(sizes)} contract(s) for {key[:12]}"
+          f"{'-dirty' if key.endswith('-dirty') else ''}")
+
+  errors, warnings = check(entry, baseline, contracts, args.gas_budget,
+                           args.size_margin, args.max_increase)
+  if base_key:
+    print(f"Compared with {base_key[:12]}")
+  for warning in warnings:
+    print(f"⚠️  {warning}")
+  for error in errors:
+    print(f"❌ {error}")
+  if errors:
+    sys.exit(1)
+  print("✅ Sizes and gas within limits")
+
+
+def _delta(old, new) -> str:
+  if old is None:
+    return f"{new:>8}       (new)"
+  if new is None:
+    return f"{old:>8}   (removed)"
+  change = new - old
+  return f"{new:>8} {change:+8}" + (f" {100 * change / old:+6.1f}%"
+                                    if old else "")
+
+
+def diff(args):
+  store = load_store()
+  head = resolve_key(store, args.head) if args.head else current_key()
+  if head not in store:
+    sys.exit(f"❌ No benchmark recorded for {head[:12]} (run record first)")
+  base = resolve_key(store, args.base) if args.base else baseline_key(
+      store, head)
+  if not base:
+    sys.exit(f"❌ No recorded ancestor of {head[:12]} to compare with")
+  old, new = store[base], store[head]
+  print(f"Sizes {base[:12]} -> {head[:12]} (runtime bytes, EIP-170 margin)")
+
+  old_sizes, new_sizes = old['sizes'], new['sizes']
+  for name in sorted(old_sizes.keys() | new_sizes.keys()):
+    before = old_sizes.get(name, [None])[0]
+    after = new_sizes.get(name, [None])[0]
+    if before == after and not args.all:
+      continue
+    margin = f"{EIP170_LIMIT - after:>7}" if after is not None else ""
+    print(f"  {name:<48} {_delta(before, after)} {margin}")
+
+  old_gas, new_gas = old.get('gas', {}), new.get('gas', {})
+  if not old_gas or not new_gas:
+    return
+  median = GAS_FIELDS.index('median')
+  print("Gas (median per call)")
+  for name in sorted(old_gas.keys() | new_gas.keys()):
+    old_functions = old_gas.get(name, {}).get('functions', {})
+    new_functions = new_gas.get(name, {}).get('functions', {})
+    for fn in sorted(old_functions.keys() | new_functions.keys()):
+      before = old_functions[fn][median] if fn in old_functions else None
+      after = new_functions[fn][median] if fn in new_functions else None
+      if before != after or args.all:
+        print(f"  {f'{name}.{fn}':<48} {_delta(before, after)}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  commands = parser.add_subparsers(dest='command', required=True)
+
+  record_parser = commands.add_parser(
+      'record', help='record the current sizes (and gas) and check them')
+  record_parser.add_argument('--build',
+                             action='store_true',
+                             help='run forge build --sizes first')
+  record_parser.add_argument('--gas',
+                             action='store_true',
+                             help='run forge test --gas-report')
+  record_parser.add_argument(
+      '--gas-report',
+      metavar='FILE',
+      help='read a saved forge test --gas-report output instead')
+  record_parser.add_argument(
+      '--gas-budget',
+      type=int,
+      default=0,
+      help='max median gas of any function call (0: none)')
+  record_parser.add_argument(
+      '--size-margin',
+      type=int,
+      default=1024,
+      help='warn when a runtime size gets this close to EIP-170')
+  record_parser.add_argument(
+      '--max-increase',
+      type=float,
+      default=5.0,
+      help='warn when a median gas grows more than this percentage')
+  record_parser.add_argument('--dry-run',
+                             action='store_true',
+                             help='check without storing the record')
+
+  diff_parser = commands.add_parser('diff',
+                                    help='compare the records of two commits')
+  diff_parser.add_argument(
+      'base',
+      nargs='?',
+      help='base commit (default: nearest recorded ancestor of head)')
+  diff_parser.add_argument('head',
+                           nargs='?',
+                           help='head commit (default: current tree)')
+  diff_parser.add_argument('--all',
+                           action='store_true',
+                           help='include unchanged entries')
+
+  args = parser.parse_args()
+  if args.command == 'record':
+    record(args)
+  else:
+    diff(args)
+
+
+if __name__ == '__main__':
+  main()
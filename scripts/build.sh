@@ -7,37 +7,108 @@ cd "$(dirname "${BASH_SOURCE[0]}")/.." || exit 1
 
 # Parse arguments
 SIZES_FLAG=""
+INCREMENTAL=""
 for arg in "$@"; do
     case $arg in
         --sizes) SIZES_FLAG="--sizes" ;;
+        --incremental) INCREMENTAL=1 ;;
         --facets-only) cd "./evm" && forge build --contracts src/facets $SIZES_FLAG && exit 0 ;;
         --deployer-only) cd "./evm" && forge build $SIZES_FLAG && exit 0 ;;
         *) echo "Unknown argument: $arg" && exit 1 ;;
     esac
 done
 
-cd "./evm" && rm -rf out
+cd "./evm"
+
+# With --sizes, sizes are also recorded for the current commit and checked against EIP-170/3860
+record_sizes() {
+    [ -z "$SIZES_FLAG" ] || python3 ../scripts/benchmarks.py record
+}
+
+# Sources modified after this point are rebuilt by the next --incremental run
+mkdir -p ../.cache && touch ../.cache/build.pending
+build_done() {
+    mv ../.cache/build.pending ../.cache/build.stamp
+    record_sizes
+}
+
+# Compile the sources changed since the last build and their dependents (import_graph.py)
+compile_affected() {
+    local files
+    files=$(python3 ../scripts/import_graph.py affected --since-build) || return $?
+    [ -n "$files" ] || return 0
+    echo "⚡ Recompiling $(wc -l <<< "$files") affected file(s)..."
+    # shellcheck disable=SC2086
+    forge build $SIZES_FLAG $files || { echo "❌ Incremental compilation failed" && exit 1; }
+}
+
+# Incremental: keep out/, compile affected files, regenerate, compile what generation changed
+if [ -n "$INCREMENTAL" ]; then
+    echo "🚀 BTR Incremental Build"
+    if ! python3 ../scripts/verify_addresses.py; then
+        echo "❌ CREATE3 address verification failed" && exit 1
+    fi
+    AFFECTED_STATUS=0
+    compile_affected || AFFECTED_STATUS=$?
+    if [ "$AFFECTED_STATUS" -eq 0 ]; then
+        GEN_STATUS=0
+        python3 ../scripts/generate_deployers.py || GEN_STATUS=$?
+        if [ "$GEN_STATUS" -eq 0 ]; then
+            compile_affected || { echo "❌ Incremental compilation failed" && exit 1; }
+        elif [ "$GEN_STATUS" -ne 3 ]; then
+            echo "❌ Generation failed" && exit 1
+        fi
+        echo "✅ Incremental build complete"
+        build_done
+        exit 0
+    elif [ "$AFFECTED_STATUS" -ne 3 ]; then
+        echo "❌ Import graph failed" && exit 1
+    fi
+    echo "↪️ Falling back to a full build"
+fi
+
+rm -rf out
 
 echo "🚀 BTR 3-Step Build Process"
 
+# Salts and expected addresses are checked offline, before any compilation
+if ! python3 ../scripts/verify_addresses.py; then
+    echo "❌ CREATE3 address verification failed" && exit 1
+fi
+
 # Step 1: Clean and compile core contracts
+# Existing generated files are compiled along when they still build, so an unchanged
+# generation (exit code 3) makes the final compilation redundant
 echo "⚡ Step 1/3 - Core contracts..."
-find . -name "*.gen.sol" -delete 2>/dev/null || true
-[ -d scripts ] && mv scripts scripts_hidden
-[ -d tests ] && mv tests tests_hidden
+# Generated files under scripts/ and tests/ are kept: they are hidden below if they fail to build
+find . -name "*.gen.sol" -not -path "./scripts/*" -not -path "./tests/*" -delete 2>/dev/null || true
+FULL_BUILD=""
+if [ -f scripts/DiamondDeployerScript.gen.s.sol ] && [ -f tests/BaseDiamondTest.gen.t.sol ] && forge build $SIZES_FLAG; then
+    FULL_BUILD=1
+else
+    [ -d scripts ] && mv scripts scripts_hidden
+    [ -d tests ] && mv tests tests_hidden
+
+    if ! forge build $SIZES_FLAG; then
+        [ -d scripts_hidden ] && mv scripts_hidden scripts
+        [ -d tests_hidden ] && mv tests_hidden tests
+        echo "❌ Core compilation failed" && exit 1
+    fi
 
-if ! forge build $SIZES_FLAG; then
     [ -d scripts_hidden ] && mv scripts_hidden scripts
     [ -d tests_hidden ] && mv tests_hidden tests
-    echo "❌ Core compilation failed" && exit 1
 fi
 
 # Step 2: Generate deployment files
 echo "📝 Step 2/3 - Generating deployment files..."
-[ -d scripts_hidden ] && mv scripts_hidden scripts
-[ -d tests_hidden ] && mv tests_hidden tests
+GEN_STATUS=0
+python3 ../scripts/generate_deployers.py || GEN_STATUS=$?
 
-if ! python3 ../scripts/generate_deployers.py; then
+if [ "$GEN_STATUS" -eq 3 ] && [ -n "$FULL_BUILD" ]; then
+    echo "✅ Build complete - generated files unchanged, final compilation skipped"
+    build_done
+    exit 0
+elif [ "$GEN_STATUS" -ne 0 ] && [ "$GEN_STATUS" -ne 3 ]; then
     echo "❌ Generation failed" && exit 1
 fi
 
@@ -48,3 +119,4 @@ if ! forge build $SIZES_FLAG; then
 fi
 
 echo "✅ Build complete - all steps successful"
+build_done
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Chain Metadata
+
+Chains known to the repository, shared by the deployment planner, the test runner and the
+RPC cache: every evm/utils/meta contract names its foundry rpc alias in `__id()`, and
+foundry.toml's rpc_endpoints map each alias to its chain id through HTTPS_RPC_<chain id>.
+
+Usage (library): load_chains(); load_chain_ids(); alias_rpc_url('base')
+"""
+
+import os
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+META_DIR = ROOT / "evm" / "utils" / "meta"
+FOUNDRY_TOML = ROOT / "evm" / "foundry.toml"
+
+# `function __id() ... { return "<foundry rpc alias>"; }` of a chain meta contract
+ID_RE = re.compile(r'function\s+__id\(\)[^{]*\{\s*return\s+"([^"]+)"')
+# `<alias> = "https://${HTTPS_RPC_<chain id>}"` of foundry.toml's rpc_endpoints
+RPC_RE = re.compile(r'^(\w+)\s*=\s*"[^"\n]*HTTPS_RPC_(\d+)', re.MULTILINE)
+
+
+def load_chains() -> dict:
+  """Map every chain meta file to its foundry rpc alias"""
+  chains = {}
+  for meta_path in sorted(META_DIR.glob("*.sol")):
+    match = ID_RE.search(meta_path.read_text())
+    if match:
+      chains[meta_path] = match.group(1)
+  return chains
+
+
+def load_chain_ids() -> dict:
+  """Map foundry rpc aliases to chain ids (from the HTTPS_RPC_<id> endpoint variables)"""
+  return {
+      alias: int(chain_id)
+      for alias, chain_id in RPC_RE.findall(FOUNDRY_TOML.read_text())
+  }
+
+
+def alias_rpc_url(alias: str):
+  """Endpoint of a foundry rpc alias from its HTTPS_RPC_<chain id> variable, None if unset"""
+  chain_id = load_chain_ids().get(alias)
+  host = os.environ.get(f"HTTPS_RPC_{chain_id}") if chain_id else None
+  return f"https://{host}" if host else None
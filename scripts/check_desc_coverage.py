@@ -5,53 +5,34 @@ Check desc.yml coverage for Solidity files
 Finds all .sol files and checks which ones are missing from desc.yml
 """
 
-import yaml
-from pathlib import Path
+import argparse
 
+from desc_index import default_index
+from git_changes import add_changed_argument, changed_files
+from walk import DEFAULT_EXCLUDES, add_exclude_argument, iter_files
 
-def get_all_sol_files():
-  """Get all .sol files in the project"""
-  root = Path('.')
-  sol_files = []
 
-  for file in root.rglob('*.sol'):
-    # Skip build artifacts and dependencies
-    if any(skip in str(file) for skip in ['/out/', '/.deps/', '/arrakis-v2/']):
-      continue
-    sol_files.append(file)
-
-  return sorted(sol_files)
+def get_all_sol_files(excludes=DEFAULT_EXCLUDES):
+  """Get all .sol files in the project, skipping build artifacts and dependencies"""
+  return sorted(iter_files('.', ('.sol', ), excludes))
 
 
 def get_desc_entries():
   """Get all .sol file entries from desc.yml"""
-  desc_path = Path('assets/desc.yml')
-  if not desc_path.exists():
-    return set()
-
-  with open(desc_path) as f:
-    desc = yaml.safe_load(f)
-
-  entries = set()
-
-  def collect_entries(node, base_path=""):
-    if isinstance(node, dict):
-      for key, value in node.items():
-        if key.endswith('.sol'):
-          entries.add(f"{base_path}/{key}" if base_path else key)
-        elif isinstance(value, dict):
-          new_path = f"{base_path}/{key}" if base_path else key
-          collect_entries(value, new_path)
-
-  # Collect from evm section
-  if 'evm' in desc:
-    collect_entries(desc['evm'], 'evm')
-
-  return entries
+  return set(default_index().paths('evm', ('.sol', )))
 
 
 def main():
-  sol_files = get_all_sol_files()
+  parser = argparse.ArgumentParser(description='Check desc.yml coverage')
+  add_exclude_argument(parser)
+  add_changed_argument(parser)
+  args = parser.parse_args()
+
+  excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+  if args.changed:
+    sol_files = sorted(changed_files(args.changed, '.', ('.sol', ), excludes))
+  else:
+    sol_files = get_all_sol_files(excludes)
   desc_entries = get_desc_entries()
 
   print(f"Found {len(sol_files)} .sol files")
@@ -74,6 +55,10 @@ def main():
   else:
     print("\n✅ All .sol files are covered in desc.yml")
 
+  # Orphaned entries can only be detected against the whole tree
+  if args.changed:
+    return
+
   # Also check for entries in desc.yml that don't exist as files
   existing_files = {
       str(f)[2:] if str(f).startswith('./') else str(f)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+CreateX CREATE3 Address Derivation
+
+Off-chain mirror of CreateX's salt guard (`_guard`) and `computeCreate3Address`, used to
+mine vanity salts and to verify the salt/address pairs of contracts.json without a node.
+"""
+
+from typing import Optional
+
+from keccak import keccak256
+
+CREATEX = bytes.fromhex('ba5Ed099633D3B313e4D5F7bdc1305d3c28ba5Ed')
+
+# keccak256 of CreateX's CREATE3 proxy init code (0x67363d3d37363d34f03d5260086018f3)
+PROXY_INITCODE_HASH = bytes.fromhex(
+    '21c35dbe1b344a2488cf3321d6ce542f8e9f305544ff09e4993a62319a497c1f')
+
+# Byte 21 of a salt: cross-chain redeploy protection flag
+FLAG_FALSE, FLAG_TRUE = 0x00, 0x01
+
+
+class InvalidSalt(ValueError):
+  """Salt CreateX would reject (reverts with InvalidSalt)."""
+
+
+def to_bytes(value: str, length: int) -> bytes:
+  """Decode a 0x-prefixed hex string of exactly length bytes"""
+  raw = bytes.fromhex(value.removeprefix('0x'))
+  if len(raw) != length:
+    raise ValueError(f"expected {length} bytes, got {len(raw)}: {value}")
+  return raw
+
+
+def to_checksum_address(address: bytes) -> str:
+  """EIP-55 mixed-case checksum encoding"""
+  hex_addr = address.hex()
+  digest = keccak256(hex_addr.encode()).hex()
+  return '0x' + ''.join(c.upper() if int(digest[i], 16) >= 8 else c
+                        for i, c in enumerate(hex_addr))
+
+
+def guard_salt(salt: bytes,
+               sender: bytes,
+               chain_id: Optional[int] = None) -> bytes:
+  """
+  Apply CreateX's salt guard for a deployment sent by sender.
+  chain_id is only required for cross-chain protected salts (flag 0x01).
+  """
+  prefix, flag = salt[:20], salt[20]
+  if prefix == sender:
+    if flag == FLAG_TRUE:
+      return keccak256(
+          sender.rjust(32, b'\x00') + _chain_word(chain_id) + salt)
+    if flag == FLAG_FALSE:
+      return keccak256(sender.rjust(32, b'\x00') + salt)
+    raise InvalidSalt(f"unspecified redeploy protection flag {flag:#04x}")
+  if prefix == bytes(20):
+    if flag == FLAG_TRUE:
+      return keccak256(_chain_word(chain_id) + salt)
+    if flag != FLAG_FALSE:
+      raise InvalidSalt(f"unspecified redeploy protection flag {flag:#04x}")
+  return keccak256(salt)
+
+
+def _chain_word(chain_id: int) -> bytes:
+  if chain_id is None:
+    raise InvalidSalt("cross-chain protected salt requires a chain id")
+  return chain_id.to_bytes(32, 'big')
+
+
+def create3_address(guarded_salt: bytes, deployer: bytes = CREATEX) -> bytes:
+  """Address deployed by CreateX's CREATE3 proxy for an already guarded salt"""
+  proxy = keccak256(b'\xff' + deployer + guarded_salt +
+                    PROXY_INITCODE_HASH)[12:]
+  return keccak256(b'\xd6\x94' + proxy + b'\x01')[12:]
+
+
+def compute_address(salt: str,
+                    sender: Optional[str] = None,
+                    chain_id: Optional[int] = None) -> str:
+  """
+  Checksummed CREATE3 address of a deployCreate3(salt, ...) call.
+  The sender defaults to the salt's 20-byte prefix, i.e. the intended permissioned deployer.
+  """
+  salt_bytes = to_bytes(salt, 32)
+  sender_bytes = to_bytes(sender, 20) if sender else salt_bytes[:20]
+  return to_checksum_address(
+      create3_address(guard_salt(salt_bytes, sender_bytes, chain_id)))
+
+
+def parse_salts_file(path) -> list:
+  """Parse a `<salt> => <address>` list into (salt, address) pairs, lowercased"""
+  pairs = []
+  with open(path) as f:
+    for line in f:
+      if '=>' in line:
+        salt, address = (part.strip().lower() for part in line.split('=>', 1))
+        pairs.append((salt, address))
+  return pairs
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Source Description Index
+
+Flat view of assets/desc.yml shared by the header and coverage scripts: every node is indexed
+by its repository path ('evm/src/BTR.sol', 'scripts/build.sh') with its scalar fields, so a
+file's header metadata is one dict lookup instead of a walk down the nested mapping.
+
+desc.yml is parsed with the libyaml loader when available, and the flattened index is kept in
+.cache/desc_index.pickle, keyed by the file's (mtime, size) with a sha256 fallback, so later
+runs only unpickle it.
+
+Usage (library): index = default_index(); index.fields('evm/src/BTR.sol'); index.defaults
+"""
+
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).parent.parent
+DESC_PATH = ROOT / 'assets' / 'desc.yml'
+CACHE_PATH = ROOT / '.cache' / 'desc_index.pickle'
+# Bump when the flattened layout changes
+INDEX_VERSION = 1
+
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def flatten(desc: dict) -> dict:
+  """Path -> scalar fields of every node below the top-level sections, in desc.yml order"""
+  nodes = {}
+
+  def walk(node: dict, base: str):
+    for key, value in node.items():
+      path = f"{base}/{key}" if base else str(key)
+      if isinstance(value, dict):
+        nodes[path] = {
+            k: v
+            for k, v in value.items() if not isinstance(v, dict)
+        }
+        walk(value, path)
+      else:
+        nodes[path] = {}
+
+  for section, node in desc.items():
+    if section != 'defaults' and isinstance(node, dict):
+      walk(node, str(section))
+  return nodes
+
+
+class DescIndex:
+  """Flattened desc.yml: defaults plus the fields of each indexed path"""
+
+  def __init__(self, defaults: dict, nodes: dict):
+    self.defaults = defaults
+    self.nodes = nodes
+
+  def fields(self, path: str) -> dict:
+    """Fields of a repository path such as 'evm/src/BTR.sol' ({} if not described)"""
+    return self.nodes.get(path, {})
+
+  def paths(self, section: str, suffixes: tuple) -> list:
+    """Described paths below a top-level section ending with suffixes, in desc.yml order"""
+    prefix = f"{section}/"
+    return [
+        path for path in self.nodes
+        if path.startswith(prefix) and path.endswith(suffixes)
+    ]
+
+
+def _parse(text: bytes) -> DescIndex:
+  desc = yaml.load(text, Loader=Loader) or {}
+  return DescIndex(desc.get('defaults') or {}, flatten(desc))
+
+
+def load_index(desc_path: Path = DESC_PATH,
+               cache_path: Path = CACHE_PATH) -> DescIndex:
+  """Index of desc_path, from the cache unless the file changed since it was built"""
+  try:
+    stat = desc_path.stat()
+  except FileNotFoundError:
+    return DescIndex({}, {})
+  key = (stat.st_mtime_ns, stat.st_size)
+
+  try:
+    with open(cache_path, 'rb') as f:
+      cached = pickle.load(f)
+    if cached['version'] != INDEX_VERSION:
+      cached = None
+  except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+    cached = None
+  if cached and cached['key'] == key:
+    return DescIndex(cached['defaults'], cached['nodes'])
+
+  # Touched or replaced: reparse only if the content differs
+  text = desc_path.read_bytes()
+  digest = hashlib.sha256(text).hexdigest()
+  if cached and cached['hash'] == digest:
+    index = DescIndex(cached['defaults'], cached['nodes'])
+  else:
+    index = _parse(text)
+
+  cache_path.parent.mkdir(parents=True, exist_ok=True)
+  tmp = cache_path.with_suffix(f".{os.getpid()}.tmp")
+  with open(tmp, 'wb') as f:
+    pickle.dump(
+        {
+            'version': INDEX_VERSION,
+            'key': key,
+            'hash': digest,
+            'defaults': index.defaults,
+            'nodes': index.nodes
+        },
+        f,
+        protocol=pickle.HIGHEST_PROTOCOL)
+  os.replace(tmp, cache_path)
+  return index
+
+
+@lru_cache(maxsize=None)
+def default_index() -> DescIndex:
+  """Process-wide index of the repository's desc.yml"""
+  return load_index()
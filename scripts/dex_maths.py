@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+LibDEXMaths Reference Model
+
+Bit-exact Python port of the V3 tick/price/liquidity maths of evm/src/libraries/LibDEXMaths.sol,
+checked 0.8 arithmetic included: whatever reverts on-chain (failed require, overflow, division by
+zero) raises Revert here. The *_array variants score whole batches of candidate ranges for offline
+backtesting: they need numpy (pip install -e '.[sim]'), keep 256-bit intermediates exact in
+object arrays of python ints, convert each distinct tick/price once, and return an `ok` mask
+flagging the elements whose on-chain call would revert (their results are 0) instead of raising.
+
+The Solidity side is checked against this model by evm/tests/unit/LibDEXMathsDiffTest.t.sol
+through forge ffi (--abi prints abi.encode(bool ok, results...)).
+
+Usage: python scripts/dex_maths.py tickToPriceX96V3 -887272
+       python scripts/dex_maths.py liquidityToAmountsTickV3 <current> <low> <upper> <liquidity> --abi
+"""
+
+import argparse
+import sys
+
+try:
+  import numpy as np  # optional, only needed by the *_array functions
+except ImportError:
+  np = None
+
+MIN_TICK = -887272
+MAX_TICK = -MIN_TICK
+MIN_SQRT = 4295128739
+MAX_SQRT = 1461446703485210103287273052203988822378723970342
+Q96 = 1 << 96
+Q192 = 1 << 192
+WAD = 10**18
+
+UINT128_MAX = (1 << 128) - 1
+UINT160_MAX = (1 << 160) - 1
+UINT256_MAX = (1 << 256) - 1
+INT24_MIN, INT24_MAX = -(1 << 23), (1 << 23) - 1
+
+# tickToPriceX96V3 Q128.128 factors, sqrt(1.0001)^-(2^i) for i = 1..19
+TICK_RATIOS = (
+    0xfff97272373d413259a46990580e213a, 0xfff2e50f5f656932ef12357cf3c7fdcc,
+    0xffe5caca7e10e4e61c3624eaa0941cd0, 0xffcb9843d60f6159c9db58835c926644,
+    0xff973b41fa98c081472e6896dfb254c0, 0xff2ea16466c96a3843ec78b326b52861,
+    0xfe5dee046a99a2a811c461f1969c3053, 0xfcbe86c7900a88aedcffc83b479aa3a4,
+    0xf987a7253ac413176f2b074cf7815e54, 0xf3392b0822b70005940c7a398e4b70f3,
+    0xe7159475a2c29b7443b29c7fa6e889d9, 0xd097f3bdfd2022b8845ad8f792aa5825,
+    0xa9f746462d870fdf8a65dc1f90e061e5, 0x70d869a156d2a1b890bb3df62baf32f7,
+    0x31be135f97d08fd981231505542fcfa6, 0x9aa508b5b7a84e1c677de54f3e99bc9,
+    0x5d6af8dedb81196699c329225ee604, 0x2216e584f5fa1ea926041bedfe98,
+    0x48a170391f7dc42444e8fa2)
+
+
+class Revert(ArithmeticError):
+  """Raised where the Solidity implementation reverts"""
+
+
+def _checked(value: int, maximum: int, minimum: int = 0) -> int:
+  if not minimum <= value <= maximum:
+    raise Revert(f"arithmetic overflow: {value} out of [{minimum}, {maximum}]")
+  return value
+
+
+def full_mul_div(x: int, y: int, d: int) -> int:
+  """LibMaths.fullMulDiv: floor(x * y / d) over 512 bits, reverts on d == 0 or a 256-bit overflow"""
+  if d == 0:
+    raise Revert("division by zero")
+  return _checked(x * y // d, UINT256_MAX)
+
+
+# --- SCALAR (one call of the Solidity function) ---
+
+
+def tick_to_price_x96_v3(tick: int) -> int:
+  abs_tick = abs(tick)
+  if abs_tick > MAX_TICK:
+    raise Revert(f"tick {tick} out of range")
+  ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 1 else 1 << 128
+  for i, factor in enumerate(TICK_RATIOS, 1):
+    if abs_tick >> i & 1:
+      ratio = (ratio * factor) >> 128
+  if tick > 0:
+    ratio = UINT256_MAX // ratio
+  # Q128.128 -> Q64.96, rounding up
+  return (ratio >> 32) + (1 if ratio & 0xffffffff else 0)
+
+
+def price_x96_to_tick_v3(price_x96: int) -> int:
+  if not MIN_SQRT <= price_x96 < MAX_SQRT:
+    raise Revert(f"priceX96 {price_x96} out of range")
+  ratio = price_x96 << 32
+  msb = ratio.bit_length() - 1
+  r = ratio >> (msb - 127) if msb >= 128 else ratio << (127 - msb)
+
+  # The low 64 bits of l2 are clear, so or-ing in the fraction bits matches the int256 assembly
+  l2 = (msb - 128) << 64
+  for bit in range(63, 49, -1):
+    r = (r * r) >> 127
+    f = r >> 128
+    l2 |= f << bit
+    r >>= f
+
+  log_sqrt10001 = l2 * 255738958999603826347141  # Q128.128
+  low_tick = (log_sqrt10001 - 3402992956809132418596140100660247210) >> 128
+  high_tick = (log_sqrt10001 + 291339464771989622907027621153398088495) >> 128
+  if low_tick == high_tick:
+    return low_tick
+  return high_tick if tick_to_price_x96_v3(
+      high_tick) <= price_x96 else low_tick
+
+
+def price_x96_to_price(price_x96: int) -> int:
+  """WAD price of a Q64.96 sqrt price (the squared price is floored before WAD scaling)"""
+  return full_mul_div(price_x96, price_x96, Q192) * WAD
+
+
+def liquidity_to_amount0_price_x96_v3(price_x96_a: int, price_x96_b: int,
+                                      liquidity: int) -> int:
+  price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+  # The denominator is a uint160 product, overflow checked as such
+  denominator = _checked(price_x96_a * price_x96_b, UINT160_MAX)
+  numerator = _checked(liquidity * Q96 * (price_x96_b - price_x96_a),
+                       UINT256_MAX)
+  if denominator == 0:
+    raise Revert("division by zero")
+  return numerator // denominator
+
+
+def liquidity_to_amount1_price_x96_v3(price_x96_a: int, price_x96_b: int,
+                                      liquidity: int) -> int:
+  price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+  return liquidity * (price_x96_b - price_x96_a) // Q96
+
+
+def amount0_to_liquidity_x96_v3(price_x96_a: int, price_x96_b: int,
+                                amount0: int) -> int:
+  price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+  intermediate = full_mul_div(price_x96_a, price_x96_b, Q96)
+  # uint128() is an unchecked downcast
+  return full_mul_div(amount0, intermediate,
+                      price_x96_b - price_x96_a) & UINT128_MAX
+
+
+def amount1_to_liquidity_price_x96_v3(price_x96_a: int, price_x96_b: int,
+                                      amount1: int) -> int:
+  price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+  return full_mul_div(amount1, Q96, price_x96_b - price_x96_a) & UINT128_MAX
+
+
+def amounts_to_liquidity_price_x96_v3(price_x96: int, price_x96_a: int,
+                                      price_x96_b: int, amount0: int,
+                                      amount1: int) -> int:
+  price_x96_a, price_x96_b = sorted((price_x96_a, price_x96_b))
+  if price_x96 <= price_x96_a:
+    return amount0_to_liquidity_x96_v3(price_x96_a, price_x96_b, amount0)
+  if price_x96 < price_x96_b:
+    return min(
+        amount0_to_liquidity_x96_v3(price_x96, price_x96_b, amount0),
+        amount1_to_liquidity_price_x96_v3(price_x96_a, price_x96, amount1))
+  return amount1_to_liquidity_price_x96_v3(price_x96_a, price_x96_b, amount1)
+
+
+def liquidity_to_amounts_tick_v3(current_tick: int, low_tick: int,
+                                 upper_tick: int, liquidity: int) -> tuple:
+  if current_tick < low_tick:
+    return liquidity_to_amount0_price_x96_v3(tick_to_price_x96_v3(low_tick),
+                                             tick_to_price_x96_v3(upper_tick),
+                                             liquidity), 0
+  if current_tick >= upper_tick:
+    return 0, liquidity_to_amount1_price_x96_v3(
+        tick_to_price_x96_v3(low_tick), tick_to_price_x96_v3(upper_tick),
+        liquidity)
+  amount0 = liquidity_to_amount0_price_x96_v3(
+      tick_to_price_x96_v3(current_tick), tick_to_price_x96_v3(upper_tick),
+      liquidity)
+  amount1 = liquidity_to_amount1_price_x96_v3(
+      tick_to_price_x96_v3(low_tick), tick_to_price_x96_v3(current_tick),
+      liquidity)
+  return amount0, amount1
+
+
+def amounts_to_liquidity_tick_v3(price_x96: int, low_tick: int,
+                                 upper_tick: int, amount0: int,
+                                 amount1: int) -> int:
+  return amounts_to_liquidity_price_x96_v3(price_x96,
+                                           tick_to_price_x96_v3(low_tick),
+                                           tick_to_price_x96_v3(upper_tick),
+                                           amount0, amount1)
+
+
+def _int24(value: int) -> int:
+  return _checked(value, INT24_MAX, INT24_MIN)
+
+
+def round_tick_to_spacing(tick: int, tick_spacing: int, round_up: bool) -> int:
+  if tick_spacing == 0:
+    raise Revert("modulo by zero")
+  # Solidity's % truncates towards zero (sign of the dividend), python's floors
+  remainder = abs(tick) % abs(tick_spacing) * (-1 if tick < 0 else 1)
+  if remainder == 0:
+    return tick
+  if round_up:
+    if remainder < 0:
+      return _int24(tick - remainder)
+    return _int24(tick + _int24(tick_spacing - remainder))
+  if remainder < 0:
+    return _int24(tick - _int24(remainder + tick_spacing))
+  return _int24(tick - remainder)
+
+
+# --- ARRAYS (numpy, one element per call, reverting elements masked out) ---
+
+
+def _require_numpy():
+  if np is None:
+    raise ImportError(
+        "numpy is required for array maths: pip install -e '.[sim]'")
+
+
+def _ints(values):
+  """Object array of python ints (exact 256-bit arithmetic)"""
+  values = np.asarray(values)
+  return values if values.dtype == object else values.astype(object)
+
+
+def _apply_unique(fn, values):
+  """fn over the distinct values only -> (results as object array, ok mask)"""
+  unique, inverse = np.unique(values, return_inverse=True)
+  results = np.zeros(len(unique), dtype=object)
+  ok = np.ones(len(unique), dtype=bool)
+  for i, value in enumerate(unique.tolist()):
+    try:
+      results[i] = fn(value)
+    except Revert:
+      ok[i] = False
+  inverse = inverse.reshape(np.shape(values))
+  return results[inverse], ok[inverse]
+
+
+def tick_to_price_x96_v3_array(ticks) -> tuple:
+  """(priceX96, ok) of every tick"""
+  _require_numpy()
+  return _apply_unique(tick_to_price_x96_v3, np.asarray(ticks, dtype=np.int64))
+
+
+def price_x96_to_tick_v3_array(prices_x96) -> tuple:
+  """(tick, ok) of every priceX96, ticks as int64"""
+  _require_numpy()
+  ticks, ok = _apply_unique(price_x96_to_tick_v3, _ints(prices_x96))
+  return ticks.astype(np.int64), ok
+
+
+def _sorted_pair(a, b) -> tuple:
+  swap = a > b
+  return np.where(swap, b, a), np.where(swap, a, b)
+
+
+def _safe(denominator, valid):
+  """Denominator with the invalid/zero elements replaced by 1 (masked out afterwards)"""
+  return np.where(valid & (denominator != 0), denominator, 1)
+
+
+def _liquidity_to_amount0(price_x96_a, price_x96_b, liquidity) -> tuple:
+  price_x96_a, price_x96_b = _sorted_pair(price_x96_a, price_x96_b)
+  denominator = price_x96_a * price_x96_b
+  numerator = liquidity * Q96 * (price_x96_b - price_x96_a)
+  ok = denominator != 0
+  ok &= (denominator <= UINT160_MAX) & (numerator <= UINT256_MAX)
+  return numerator // _safe(denominator, ok), ok
+
+
+def _liquidity_to_amount1(price_x96_a, price_x96_b, liquidity):
+  price_x96_a, price_x96_b = _sorted_pair(price_x96_a, price_x96_b)
+  return liquidity * (price_x96_b - price_x96_a) // Q96
+
+
+def _full_mul_div_array(x, y, d) -> tuple:
+  product = x * y
+  ok = d != 0
+  result = product // _safe(d, ok)
+  return result, ok & (result <= UINT256_MAX)
+
+
+def _amount0_to_liquidity(price_x96_a, price_x96_b, amount0) -> tuple:
+  price_x96_a, price_x96_b = _sorted_pair(price_x96_a, price_x96_b)
+  intermediate = price_x96_a * price_x96_b // Q96
+  liquidity, ok = _full_mul_div_array(amount0, intermediate,
+                                      price_x96_b - price_x96_a)
+  return liquidity & UINT128_MAX, ok
+
+
+def _amount1_to_liquidity(price_x96_a, price_x96_b, amount1) -> tuple:
+  price_x96_a, price_x96_b = _sorted_pair(price_x96_a, price_x96_b)
+  liquidity, ok = _full_mul_div_array(amount1, Q96, price_x96_b - price_x96_a)
+  return liquidity & UINT128_MAX, ok
+
+
+def _tick_prices(*tick_arrays) -> tuple:
+  """priceX96 of several tick arrays, converting their distinct ticks once"""
+  prices, ok = _apply_unique(tick_to_price_x96_v3,
+                             np.stack([np.ravel(t) for t in tick_arrays]))
+  shape = np.shape(tick_arrays[0])
+  return [p.reshape(shape) for p in prices], [o.reshape(shape) for o in ok]
+
+
+def liquidity_to_amounts_tick_v3_array(current_ticks, low_ticks, upper_ticks,
+                                       liquidity) -> tuple:
+  """(amount0, amount1, ok) of every (current, low, upper, liquidity), broadcast together"""
+  _require_numpy()
+  current_ticks, low_ticks, upper_ticks, liquidity = np.broadcast_arrays(
+      np.asarray(current_ticks, dtype=np.int64),
+      np.asarray(low_ticks, dtype=np.int64),
+      np.asarray(upper_ticks, dtype=np.int64), _ints(liquidity))
+  (current_prices, low_prices,
+   upper_prices), tick_ok = _tick_prices(current_ticks, low_ticks, upper_ticks)
+
+  below = current_ticks < low_ticks
+  above = ~below & (current_ticks >= upper_ticks)
+  inside = ~below & ~above
+  # Ticks converted on-chain: low and upper always, current only in range
+  ok = tick_ok[1] & tick_ok[2] & (tick_ok[0] | ~inside)
+
+  amount0, ok0 = _liquidity_to_amount0(
+      np.where(below, low_prices, current_prices), upper_prices, liquidity)
+  amount1 = _liquidity_to_amount1(
+      low_prices, np.where(above, upper_prices, current_prices), liquidity)
+  ok &= ok0 | above
+  amount0 = np.where(ok & ~above, amount0, 0)
+  amount1 = np.where(ok & ~below, amount1, 0)
+  return amount0, amount1, ok
+
+
+def amounts_to_liquidity_tick_v3_array(prices_x96, low_ticks, upper_ticks,
+                                       amounts0, amounts1) -> tuple:
+  """(liquidity, ok) of every (priceX96, low, upper, amount0, amount1), broadcast together"""
+  _require_numpy()
+  prices_x96, low_ticks, upper_ticks, amounts0, amounts1 = np.broadcast_arrays(
+      _ints(prices_x96), np.asarray(low_ticks, dtype=np.int64),
+      np.asarray(upper_ticks, dtype=np.int64), _ints(amounts0),
+      _ints(amounts1))
+  (price_a, price_b), tick_ok = _tick_prices(low_ticks, upper_ticks)
+  price_a, price_b = _sorted_pair(price_a, price_b)
+  ok = tick_ok[0] & tick_ok[1]
+
+  below = prices_x96 <= price_a
+  above = ~below & (prices_x96 >= price_b)
+  liquidity0, ok0 = _amount0_to_liquidity(np.where(below, price_a, prices_x96),
+                                          price_b, amounts0)
+  liquidity1, ok1 = _amount1_to_liquidity(price_a,
+                                          np.where(above, price_b, prices_x96),
+                                          amounts1)
+  ok &= (ok0 | above) & (ok1 | below)
+  liquidity = np.where(
+      below, liquidity0,
+      np.where(above, liquidity1, np.minimum(liquidity0, liquidity1)))
+  return np.where(ok, liquidity, 0), ok
+
+
+def round_tick_to_spacing_array(ticks, tick_spacings, round_up) -> tuple:
+  """(tick, ok) of every (tick, spacing, round up), broadcast together, in int64"""
+  _require_numpy()
+  ticks, tick_spacings, round_up = np.broadcast_arrays(
+      np.asarray(ticks, dtype=np.int64),
+      np.asarray(tick_spacings, dtype=np.int64),
+      np.asarray(round_up, dtype=bool))
+  ok = tick_spacings != 0
+  remainder = np.fmod(ticks, np.where(ok, tick_spacings, 1))  # truncated
+
+  def in_int24(values):
+    return (values >= INT24_MIN) & (values <= INT24_MAX)
+
+  up_step = tick_spacings - remainder
+  down_step = remainder + tick_spacings
+  up = np.where(remainder < 0, ticks - remainder, ticks + up_step)
+  down = np.where(remainder < 0, ticks - down_step, ticks - remainder)
+  rounded = np.where(round_up, up, down)
+  ok &= (remainder == 0) | (in_int24(rounded)
+                            & np.where(round_up,
+                                       (remainder < 0) | in_int24(up_step),
+                                       (remainder >= 0) | in_int24(down_step)))
+  return np.where(ok, np.where(remainder == 0, ticks, rounded), 0), ok
+
+
+# --- CLI / FFI ---
+
+FUNCTIONS = {
+    'priceX96ToPrice': (price_x96_to_price, 1),
+    'tickToPriceX96V3': (tick_to_price_x96_v3, 1),
+    'priceX96ToTickV3': (price_x96_to_tick_v3, 1),
+    'liquidityToAmountsTickV3': (liquidity_to_amounts_tick_v3, 2),
+    'amountsToLiquidityTickV3': (amounts_to_liquidity_tick_v3, 1),
+    'roundTickToSpacing': (round_tick_to_spacing, 1),
+}
+
+
+def parse_arg(value: str):
+  if value.lower() in ('true', 'false'):
+    return value.lower() == 'true'
+  return int(value, 0)
+
+
+def abi_encode(ok: bool, results: tuple) -> str:
+  """abi.encode(bool ok, results...) of static int/uint words, two's complement"""
+  words = [int(ok)] + [value % (1 << 256) for value in results]
+  return '0x' + ''.join(f"{word:064x}" for word in words)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Evaluate LibDEXMaths functions off-chain')
+  parser.add_argument('function', choices=FUNCTIONS)
+  parser.add_argument('args',
+                      nargs='*',
+                      help='integer (or true/false) arguments')
+  parser.add_argument(
+      '--abi',
+      action='store_true',
+      help='print abi.encode(bool ok, results...) for forge ffi')
+  args = parser.parse_args()
+
+  fn, outputs = FUNCTIONS[args.function]
+  try:
+    results = fn(*map(parse_arg, args.args))
+    ok = True
+  except Revert as e:
+    if not args.abi:
+      print(f"❌ {args.function} reverts: {e}")
+      sys.exit(1)
+    results, ok = (0, ) * outputs, False
+  except TypeError as e:
+    print(f"❌ {e}")
+    sys.exit(1)
+  if not isinstance(results, tuple):
+    results = (results, )
+
+  print(abi_encode(ok, results) if args.abi else " ".join(map(str, results)))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Diamond Cut Diff Generator
+
+Diffs the selector -> facet mapping of contracts.json and the compiled ABIs against a snapshot of
+the mapping deployed on a chain (evm/snapshots/<alias>.json), and renders the minimal upgrade:
+Add for new selectors, Replace for selectors whose facet address changed, Remove for selectors no
+longer served. Selectors are grouped into one FacetCut per (action, facet address) to keep the
+diamondCut calldata small. Facets with includeInCuts: false (cut at diamond construction) are
+never touched.
+
+Usage: python scripts/diff_cuts.py --chain base             # emit evm/scripts/upgrades/BaseDiamondCut.gen.s.sol
+       python scripts/diff_cuts.py --chain base --write     # snapshot the current mapping once cut
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from createx import to_bytes, to_checksum_address
+from generate_deployers import (build_ownership_index,
+                                find_selector_collisions,
+                                get_facet_function_selectors,
+                                load_contracts_config, load_selector_cache,
+                                load_template, save_selector_cache,
+                                write_if_changed)
+from keccak import selector
+
+ROOT = Path(__file__).parent.parent
+SNAPSHOTS_DIR = ROOT / "evm" / "snapshots"
+UPGRADES_DIR = ROOT / "evm" / "scripts" / "upgrades"
+CUT_TEMPLATE = "DiamondCutScript.s.sol.tpl"
+
+# FacetCutAction order, also the order cuts are emitted in
+ADD, REPLACE, REMOVE = 'Add', 'Replace', 'Remove'
+ZERO_ADDRESS = '0x' + '00' * 20
+
+
+def current_mapping(config: dict) -> dict:
+  """selector -> {facet, address, signature} of every facet cut into the diamond"""
+  facets = config.get("facets", {})
+  owned_index = build_ownership_index(facets)
+  cache = load_selector_cache()
+  facet_selectors = {}
+  for facet_name, facet_config in facets.items():
+    if not facet_config.get('includeInCuts', True):
+      continue
+    facet_selectors[facet_name] = get_facet_function_selectors(
+        facet_name, facet_config.get('ownedSelectors', []), owned_index, cache)
+  save_selector_cache(cache)
+
+  collisions = find_selector_collisions(facet_selectors)
+  if collisions:
+    for collision in collisions:
+      print(f"❌ Selector collision {collision}")
+    sys.exit(1)
+
+  mapping = {}
+  for facet_name, signatures in facet_selectors.items():
+    address = to_checksum_address(
+        to_bytes(facets[facet_name]['expectedAddress'], 20))
+    for signature in signatures:
+      mapping[selector(signature)] = {
+          'facet': facet_name,
+          'address': address,
+          'signature': signature
+      }
+  return mapping
+
+
+def load_snapshot(path: Path) -> dict:
+  try:
+    with open(path) as f:
+      return json.load(f)['selectors']
+  except (OSError, ValueError, KeyError):
+    return {}
+
+
+def save_snapshot(path: Path, mapping: dict):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump({'selectors': mapping}, f, indent=2, sort_keys=True)
+    f.write('\n')
+
+
+def diff_cuts(deployed: dict, current: dict, frozen: set) -> list:
+  """
+  Minimal cuts turning deployed into current, as (action, address, facets, [(selector, signature)])
+  grouped by action and facet address. Selectors of frozen facets are left alone.
+  """
+  groups = {}
+
+  def add(action, address, facet, sel, signature):
+    # Removals all target address(0), so a single cut may span several facets
+    facets, selectors = groups.setdefault((action, address), ([], []))
+    if facet not in facets:
+      facets.append(facet)
+    selectors.append((sel, signature))
+
+  for sel, entry in current.items():
+    previous = deployed.get(sel)
+    if previous is None:
+      add(ADD, entry['address'], entry['facet'], sel, entry['signature'])
+    elif previous['address'].lower() != entry['address'].lower():
+      add(REPLACE, entry['address'], entry['facet'], sel, entry['signature'])
+
+  for sel, previous in deployed.items():
+    if sel not in current and previous['facet'] not in frozen:
+      add(REMOVE, ZERO_ADDRESS, previous['facet'], sel, previous['signature'])
+
+  order = (ADD, REPLACE, REMOVE)
+  return [(action, address, ', '.join(facets), sorted(selectors))
+          for (action, address), (facets, selectors) in sorted(
+              groups.items(),
+              key=lambda item: (order.index(item[0][0]), item[0][1]))]
+
+
+def format_cuts(cuts: list) -> str:
+  """Solidity filling the cuts array, one selector array per cut"""
+  lines = []
+  for i, (action, address, facet, selectors) in enumerate(cuts):
+    target = facet if action != REMOVE else f"{facet} (removed)"
+    lines.append(
+        f"\n        // {action} {len(selectors)} selector(s): {target}")
+    lines.append(f"        selectors = new bytes4[]({len(selectors)});")
+    lines += [
+        f"        selectors[{j}] = bytes4({sel}); // {signature}"
+        for j, (sel, signature) in enumerate(selectors)
+    ]
+    facet_address = 'address(0)' if action == REMOVE else address
+    lines.append(
+        f"        cuts[{i}] = FacetCut({{facetAddress: {facet_address}, "
+        f"action: FacetCutAction.{action}, functionSelectors: selectors}});")
+  return "\n".join(lines)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Generate the minimal diamond cut from a selector snapshot')
+  parser.add_argument('--chain',
+                      required=True,
+                      help='rpc alias of the chain (snapshot name)')
+  parser.add_argument(
+      '--snapshot',
+      type=Path,
+      help='snapshot path (default: evm/snapshots/<chain>.json)')
+  parser.add_argument(
+      '--write',
+      action='store_true',
+      help='store the current mapping as the deployed snapshot')
+  args = parser.parse_args()
+
+  config = load_contracts_config()
+  snapshot_path = args.snapshot or SNAPSHOTS_DIR / f"{args.chain}.json"
+  current = current_mapping(config)
+
+  if args.write:
+    save_snapshot(snapshot_path, current)
+    print(f"✅ Snapshot of {len(current)} selectors written to {snapshot_path}")
+    return
+
+  deployed = load_snapshot(snapshot_path)
+  if not deployed:
+    print(
+        f"❌ No selector snapshot at {snapshot_path} (create it with --write)")
+    sys.exit(1)
+
+  frozen = {
+      name
+      for name, facet_config in config.get("facets", {}).items()
+      if not facet_config.get('includeInCuts', True)
+  }
+  cuts = diff_cuts(deployed, current, frozen)
+  chain_name = ''.join(part.capitalize() for part in args.chain.split('_'))
+  script_path = UPGRADES_DIR / f"{chain_name}DiamondCut.gen.s.sol"
+  if not cuts:
+    script_path.unlink(missing_ok=True)
+    print(
+        f"✅ {args.chain}: deployed selectors match contracts.json, no cut needed"
+    )
+    return
+
+  for action, address, facet, selectors in cuts:
+    print(f"{action:<8} {len(selectors):>3} selector(s) {facet} {address}")
+
+  context = {
+      "CHAIN_NAME":
+      chain_name,
+      "CHAIN_ALIAS":
+      args.chain,
+      "DIAMOND_ADDRESS":
+      to_checksum_address(to_bytes(config['BTRDiamond']['expectedAddress'],
+                                   20)),
+      "CUT_COUNT":
+      str(len(cuts)),
+      "CUTS":
+      format_cuts(cuts),
+  }
+  UPGRADES_DIR.mkdir(parents=True, exist_ok=True)
+  write_if_changed(script_path, load_template(CUT_TEMPLATE).render(context))
+  print(f"📝 {len(cuts)} cut(s) written to {script_path.relative_to(ROOT)}")
+
+
+if __name__ == '__main__':
+  main()
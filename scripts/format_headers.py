@@ -18,22 +18,32 @@ using templates from assets/headers/
 """
 
 #!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import random
 import sys
 import re
-import yaml
 from pathlib import Path
 from string import Template
 
+from desc_index import default_index
+from file_pipeline import PROCESSED, SKIPPED, ERROR, add_jobs_argument, run
+from git_changes import add_changed_argument, changed_files
+from walk import iter_files
+from sol_scan import SourceLines, SPDX, PRAGMA, BLANK, BLOCK, COMMENT
+
 # Paths
 ROOT = Path(__file__).parent.parent
-DESC_PATH = ROOT / 'assets' / 'desc.yml'
 HDR_DIR = ROOT / 'assets' / 'headers'
 SCRIPTS_DIR = ROOT / 'scripts'
 EVM_DIR = ROOT / 'evm'
+CACHE_PATH = ROOT / '.cache' / 'headers.json'
 
-# Load metadata
-desc = yaml.safe_load(DESC_PATH.read_text()) or {}
-defaults = desc.get('defaults', {})
+# Bump when strip_header/render_header produce different output for the same inputs
+CACHE_VERSION = 1
+# Files re-checked by a bare --verify
+VERIFY_SAMPLE = 20
 
 # Load header templates
 templates = {}
@@ -45,32 +55,22 @@ for ext in ('sol', 'py', 'sh'):
     txt = pattern.sub(r'${\1}', text)
     templates[f'.{ext}'] = Template(txt)
 
-# Collect target files
-files = []
-# Off-chain scripts
-for name in desc.get('scripts', {}):
-  if name.endswith(('.py', '.sh')):
-    files.append(SCRIPTS_DIR / name)
-
-
-# On-chain EVM sources
-def collect_sols(node, base):
-  for k, v in node.items():
-    path = base / k
-    if k.endswith('.sol'):
-      files.append(path)
-    elif isinstance(v, dict):
-      collect_sols(v, path)
 
+def collect_files():
+  """Collect target files: scripts and EVM sources listed in desc.yml, plus all interfaces"""
+  index = default_index()
+  # Off-chain scripts, then on-chain EVM sources
+  files = [ROOT / path for path in index.paths('scripts', ('.py', '.sh'))]
+  files += [ROOT / path for path in index.paths('evm', ('.sol', ))]
 
-collect_sols(desc.get('evm', {}), EVM_DIR)
-
-# Also collect interface files directly
-interfaces_dir = EVM_DIR / 'interfaces'
-if interfaces_dir.exists():
-  for interface_file in interfaces_dir.rglob('*.sol'):
-    if interface_file not in files:
-      files.append(interface_file)
+  # Also collect interface files directly
+  interfaces_dir = EVM_DIR / 'interfaces'
+  if interfaces_dir.exists():
+    listed = set(files)
+    for interface_file in iter_files(interfaces_dir):
+      if interface_file not in listed:
+        files.append(interface_file)
+  return files
 
 
 def is_interface_file(file_path):
@@ -83,134 +83,100 @@ def create_interface_header(sol_version):
   return f"// SPDX-License-Identifier: MIT\npragma solidity {sol_version};"
 
 
-# Function to strip existing headers
-def strip_header(lines, ext):
-  shebang = ''
-  if lines and lines[0].startswith('#!'):
-    shebang = lines.pop(0)
+# Keywords marking header-like block comments and line comments in Solidity sources
+HEADER_BLOCK_KEYWORDS = ('@title', '@copyright', '@notice', '@dev', '@author',
+                         '@' * 60)
+HEADER_COMMENT_KEYWORDS = ('title', 'author', 'notice', 'dev', 'copyright',
+                           'spdx')
 
-  if ext == '.sol':
-    # For Solidity files, we need to remove ALL header-like content throughout the file
-    i = 0
-    while i < len(lines):
-      line = lines[i].strip()
-
-      # Always remove SPDX and pragma lines
-      if (line.startswith('// SPDX-License-Identifier')
-          or line.startswith('pragma ')):
-        lines.pop(i)
-        continue
 
-      # Remove blank lines at the beginning
-      if not line and i < 10:  # Only remove blank lines near the top
-        lines.pop(i)
-        continue
+def strip_sol_header(lines):
+  """Remove ALL header-like content throughout a Solidity file in a single pass"""
+  src = SourceLines(lines)
+  block_keywords = src.keyword_counts(HEADER_BLOCK_KEYWORDS)
+  body = []
+  i, n = 0, len(lines)
+  while i < n:
+    kind = src.kinds[i]
+
+    # Always remove SPDX and pragma lines
+    if kind in (SPDX, PRAGMA):
+      i += 1
+      continue
+
+    # Remove blank lines at the beginning (only near the top)
+    if kind == BLANK and len(body) < 10:
+      i += 1
+      continue
 
-      # Remove NatSpec comment blocks that contain header keywords
-      if line.startswith('/*'):
-        # Look ahead to see if this block contains header content
-        block_content = []
-        j = i
-
-        # Collect the entire block
-        while j < len(lines):
-          block_content.append(lines[j])
-          if lines[j].strip().endswith('*/'):
-            break
-          j += 1
-
-        # Check if this block contains header keywords
-        block_text = ' '.join(block_content).lower()
-        is_header_block = any(keyword in block_text for keyword in [
-            '@title', '@copyright', '@notice', '@dev', '@author',
-            '@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@'
-        ])
-
-        if is_header_block:
-          # Remove the entire block
-          for _ in range(j - i + 1):
-            if i < len(lines):
-              lines.pop(i)
-          continue
-        else:
-          # Keep this block, move to next line
-          i += 1
-          continue
-
-      # Remove single-line comments that look like headers
-      if line.startswith('//') and any(
-          keyword in line.lower() for keyword in
-          ['title', 'author', 'notice', 'dev', 'copyright', 'spdx']):
-        lines.pop(i)
+    # Remove NatSpec comment blocks that contain header keywords
+    if kind == BLOCK:
+      end = src.block_end[i]
+      if block_keywords[end] > block_keywords[i]:
+        i = end
         continue
 
-      # Move to next line
+    # Remove single-line comments that look like headers
+    elif kind == COMMENT and any(k in src.stripped[i].lower()
+                                 for k in HEADER_COMMENT_KEYWORDS):
       i += 1
+      continue
+
+    body.append(lines[i])
+    i += 1
+  return body
+
+
+# Function to strip existing headers
+def strip_header(lines, ext):
+  shebang = ''
+  if lines and lines[0].startswith('#!'):
+    shebang, lines = lines[0], lines[1:]
 
+  i, n = 0, len(lines)
+  if ext == '.sol':
+    lines = strip_sol_header(lines)
   elif ext == '.py':
     # Remove SPDX, leading blanks
-    while lines and 'SPDX-License-Identifier' in lines[0]:
-      lines.pop(0)
-    while lines and not lines[0].strip():
-      lines.pop(0)
+    while i < n and 'SPDX-License-Identifier' in lines[i]:
+      i += 1
+    while i < n and not lines[i].strip():
+      i += 1
     # Remove module docstring
-    if lines and (lines[0].startswith('"""') or lines[0].startswith("'''")):
-      delim = lines.pop(0)[:3]
-      while lines and delim not in lines[0]:
-        lines.pop(0)
-      if lines:
-        lines.pop(0)
+    if i < n and (lines[i].startswith('"""') or lines[i].startswith("'''")):
+      delim = lines[i][:3]
+      i += 1
+      while i < n and delim not in lines[i]:
+        i += 1
+      if i < n:
+        i += 1
+    lines = lines[i:]
   elif ext == '.sh':
     # Remove leading comments/blanks
-    while lines and (lines[0].lstrip().startswith('#')
-                     or not lines[0].strip()):
-      lines.pop(0)
+    while i < n and (lines[i].lstrip().startswith('#')
+                     or not lines[i].strip()):
+      i += 1
+    lines = lines[i:]
 
-  if shebang:
-    lines.insert(0, shebang)
-  return lines
+  return [shebang] + lines if shebang else lines
 
 
-# Process files
-processed = skipped = errors = 0
-for fp in files:
+def render_header(fp):
+  """Render the header of a file from desc.yml metadata, None if no template applies"""
   ext = fp.suffix
-  if not fp.is_file():
-    skipped += 1
-    continue
+  defaults = default_index().defaults
 
-  # Handle interface files specially
+  # Interface files get a minimal header
   if ext == '.sol' and is_interface_file(fp):
-    header = create_interface_header(defaults.get('sol_version', '0.8.29'))
-
-    original = fp.read_text()
-    lines = original.splitlines()
-    body_lines = strip_header(lines[:], ext)
-    body = '\n'.join(body_lines).lstrip('\n')
-    new_content = f"{header}\n\n{body}\n"
-
-    if new_content != original:
-      try:
-        fp.write_text(new_content)
-        print(f"✔️ Processed interface {fp.relative_to(ROOT)}")
-        processed += 1
-      except Exception as e:
-        print(f"❌ Error {fp.relative_to(ROOT)}: {e}")
-        errors += 1
-    else:
-      skipped += 1
-    continue
-
-  # Handle regular files with full templates
+    return create_interface_header(defaults.get('sol_version', '0.8.29'))
+
+  # Regular files use full templates
   tpl = templates.get(ext)
   if not tpl:
-    skipped += 1
-    continue
+    return None
 
   # Gather metadata for this file
-  node = desc
-  for part in fp.relative_to(ROOT).parts:
-    node = node.get(part, {}) if isinstance(node, dict) else {}
+  node = default_index().fields(fp.relative_to(ROOT).as_posix())
 
   # Start with defaults
   data = dict(defaults)
@@ -263,22 +229,174 @@ for fp in files:
     # For non-Solidity files, use the template as before
     header = tpl.substitute(data).rstrip()
 
-  original = fp.read_text()
-  lines = original.splitlines()
-  body_lines = strip_header(lines[:], ext)
+  return header
+
+
+def apply_header(fp, content):
+  """Return content with the rendered header of fp replacing its current one (None if no template applies)"""
+  header = render_header(fp)
+  if header is None:
+    return None
+  body_lines = strip_header(content.splitlines(), fp.suffix)
   body = '\n'.join(body_lines).lstrip('\n')
-  new_content = f"{header}\n\n{body}\n"
+  return f"{header}\n\n{body}\n"
 
-  if new_content != original:
-    try:
-      fp.write_text(new_content)
-      print(f"✔️ Processed {fp.relative_to(ROOT)}")
-      processed += 1
-    except Exception as e:
-      print(f"❌ Error {fp.relative_to(ROOT)}: {e}")
-      errors += 1
-  else:
-    skipped += 1
 
-print(f"Result: {processed} processed, {skipped} skipped, {errors} errors")
-sys.exit(1 if errors else 0)
+def process_file(fp):
+  """Apply the rendered header to a single file, returning a pipeline (status, message)"""
+  if not fp.is_file():
+    return SKIPPED, None
+
+  original = fp.read_text()
+  new_content = apply_header(fp, original)
+  if new_content is None or new_content == original:
+    return SKIPPED, None
+  kind = 'interface ' if fp.suffix == '.sol' and is_interface_file(fp) else ''
+  try:
+    fp.write_text(new_content)
+    return PROCESSED, f"✔️ Processed {kind}{fp.relative_to(ROOT)}"
+  except Exception as e:
+    return ERROR, f"❌ Error {fp.relative_to(ROOT)}: {e}"
+
+
+def _sha(text):
+  return hashlib.sha256(text.encode()).hexdigest()
+
+
+class HeaderCache:
+  """
+  Record of the files left in their final form by the last runs: (mtime, size) of the file
+  with the hashes of its rendered header and body. A file whose stat and rendered header
+  both match its record is skipped without being read.
+  """
+
+  def __init__(self, path=CACHE_PATH):
+    self.path = path
+    try:
+      with open(path) as f:
+        data = json.load(f)
+      self.records = data['files'] if data.get(
+          'version') == CACHE_VERSION else {}
+    except (OSError, ValueError, KeyError):
+      self.records = {}
+    self.dirty = False
+
+  @staticmethod
+  def _key(fp):
+    return fp.relative_to(ROOT).as_posix()
+
+  def fresh(self, fp, header):
+    """Whether fp is unchanged since it was recorded with this header (a stat, no read)"""
+    record = self.records.get(self._key(fp))
+    if not record or record['header'] != _sha(header):
+      return False
+    try:
+      stat = fp.stat()
+    except OSError:
+      return False
+    return record['mtime'] == stat.st_mtime_ns and record[
+        'size'] == stat.st_size
+
+  def drifted(self, fp, header):
+    """Whether the content of a fresh file no longer matches its record"""
+    record = self.records[self._key(fp)]
+    content = fp.read_text()
+    prefix = f"{header}\n\n"
+    return (not content.startswith(prefix)
+            or _sha(content[len(prefix):]) != record['body']
+            or apply_header(fp, content) != content)
+
+  def record(self, fp, header):
+    """Record fp if it holds its final header, forget it otherwise"""
+    key = self._key(fp)
+    try:
+      stat = fp.stat()
+      content = fp.read_text()
+    except OSError:
+      content = None
+    self.dirty = True
+    if content is None or apply_header(fp, content) != content:
+      self.records.pop(key, None)
+      return
+    self.records[key] = {
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'header': _sha(header),
+        'body': _sha(content[len(header) + 2:])
+    }
+
+  def forget(self, fp):
+    self.dirty |= self.records.pop(self._key(fp), None) is not None
+
+  def save(self):
+    if not self.dirty:
+      return
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    with open(self.path, 'w') as f:
+      json.dump({
+          'version': CACHE_VERSION,
+          'files': self.records
+      },
+                f,
+                separators=(',', ':'))
+    self.dirty = False
+
+
+def main():
+  """Apply headers to all collected files"""
+  parser = argparse.ArgumentParser(description='Format source file headers')
+  add_jobs_argument(parser)
+  add_changed_argument(parser)
+  parser.add_argument(
+      '--verify',
+      nargs='?',
+      type=int,
+      const=VERIFY_SAMPLE,
+      metavar='N',
+      help=
+      f"re-read N (default {VERIFY_SAMPLE}, 0 for all) cached files to detect drift"
+  )
+  parser.add_argument('--no-cache',
+                      action='store_true',
+                      help='process every file, ignoring the header cache')
+  args = parser.parse_args()
+
+  files = collect_files()
+  if args.changed:
+    changed = set(changed_files(args.changed, ROOT, ('.sol', '.py', '.sh')))
+    files = [fp for fp in files if fp in changed]
+
+  cache = HeaderCache()
+  headers = {fp: render_header(fp) for fp in files}
+  fresh = set() if args.no_cache else {
+      fp
+      for fp in files
+      if headers[fp] is not None and cache.fresh(fp, headers[fp])
+  }
+
+  if args.verify is not None and fresh:
+    sample = sorted(fresh)
+    if args.verify:
+      sample = random.sample(sample, min(args.verify, len(sample)))
+    drifted = [fp for fp in sample if cache.drifted(fp, headers[fp])]
+    for fp in drifted:
+      print(f"⚠️ Drift in {fp.relative_to(ROOT)}, reprocessing")
+      cache.forget(fp)
+    fresh.difference_update(drifted)
+    print(f"Verified {len(sample)} cached file(s), {len(drifted)} drifted")
+
+  stale = [fp for fp in files if fp not in fresh]
+  counts = run(stale, process_file, args.jobs)
+  for fp in stale:
+    if headers[fp] is not None:
+      cache.record(fp, headers[fp])
+  cache.save()
+
+  print(
+      f"Result: {counts[PROCESSED]} processed, {counts[SKIPPED] + len(fresh)} skipped "
+      f"({len(fresh)} unchanged since the last run), {counts[ERROR]} errors")
+  sys.exit(1 if counts[ERROR] else 0)
+
+
+if __name__ == '__main__':
+  main()
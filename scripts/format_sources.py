@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Solidity Source Formatter
+
+Single pre-commit pass over the Solidity sources: each file is read once, run through the
+selected in-memory stages (strip -> organize -> headers, always in that order), and written
+once, only if the final text differs. `forge fmt` then runs in one batched call over the
+processed files, instead of once per file.
+
+Stages:
+  strip     remove SPDX/NatSpec headers (strip_headers.py)
+  organize  sort and group imports (organize_imports.py)
+  headers   render desc.yml headers of the files format_headers.py targets
+
+Usage: python scripts/format_sources.py [--changed [REF]] [--stages organize,headers] [--jobs N]
+"""
+
+import argparse
+import subprocess
+import sys
+from functools import lru_cache, partial
+from pathlib import Path
+
+from file_pipeline import PROCESSED, SKIPPED, ERROR, add_jobs_argument, run
+from format_headers import apply_header, collect_files
+from git_changes import add_changed_argument, changed_files
+from organize_imports import organize_text
+from strip_headers import strip_text
+from walk import DEFAULT_EXCLUDES, add_exclude_argument, iter_files
+
+ROOT = Path(__file__).parent.parent
+EVM_DIR = ROOT / 'evm'
+
+
+@lru_cache(maxsize=None)
+def _header_targets() -> frozenset:
+  return frozenset(collect_files())
+
+
+def _headers(fp: Path, content: str) -> str:
+  if fp not in _header_targets():
+    return content
+  return apply_header(fp, content) or content
+
+
+# Stage name -> transform(path, text) -> text, in application order
+STAGES = {
+    'strip': lambda fp, content: strip_text(content),
+    'organize': lambda fp, content: organize_text(content),
+    'headers': _headers,
+}
+DEFAULT_STAGES = ('organize', )
+
+
+def parse_stages(value: str) -> tuple:
+  names = [name.strip() for name in value.split(',') if name.strip()]
+  unknown = [name for name in names if name not in STAGES]
+  if unknown:
+    raise argparse.ArgumentTypeError(
+        f"unknown stage(s) {', '.join(unknown)} (choose from {', '.join(STAGES)})"
+    )
+  return tuple(name for name in STAGES if name in names)
+
+
+def format_file(stages: tuple, fp: Path):
+  """Run the stages over a single file, returning a pipeline (status, message)"""
+  try:
+    original = fp.read_text()
+    content = original
+    for name in stages:
+      content = STAGES[name](fp, content)
+
+    # Leave unchanged files untouched (no mtime bump for watchers/forge)
+    if content == original:
+      return SKIPPED, None
+    fp.write_text(content)
+    return PROCESSED, f"✔️ {fp.relative_to(ROOT)}"
+  except Exception as e:
+    return ERROR, f"❌ Error {fp.relative_to(ROOT)}: {e}"
+
+
+def forge_fmt(files: list) -> bool:
+  """Run forge fmt once over the evm sources among files"""
+  paths = [
+      str(fp.relative_to(EVM_DIR)) for fp in files if EVM_DIR in fp.parents
+  ]
+  if not paths:
+    return True
+  try:
+    result = subprocess.run(['forge', 'fmt', *paths], cwd=EVM_DIR)
+  except FileNotFoundError:
+    print("❌ forge not found (install foundry or pass --no-fmt)")
+    return False
+  return result.returncode == 0
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument(
+      '--stages',
+      type=parse_stages,
+      default=DEFAULT_STAGES,
+      help=
+      f"comma-separated stages to run (default: {','.join(DEFAULT_STAGES)})")
+  parser.add_argument('--no-fmt',
+                      action='store_true',
+                      help='skip the forge fmt pass')
+  add_jobs_argument(parser)
+  add_exclude_argument(parser)
+  add_changed_argument(parser)
+  args = parser.parse_args()
+
+  excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+  if args.changed:
+    files = changed_files(args.changed, ROOT, ('.sol', ), excludes)
+  else:
+    files = list(iter_files(ROOT, ('.sol', ), excludes))
+
+  counts = run(files, partial(format_file, args.stages), args.jobs)
+  formatted = args.no_fmt or forge_fmt(files)
+
+  # Staged files are re-staged with their formatted content
+  if args.changed == 'staged' and files:
+    subprocess.run(['git', 'add', '--', *map(str, files)],
+                   cwd=ROOT,
+                   check=True)
+
+  print(f"Formatted {counts[PROCESSED]}/{len(files)} files "
+        f"({'+'.join(args.stages) or 'no stages'}"
+        f"{'' if args.no_fmt else ', forge fmt'})")
+  sys.exit(0 if formatted and not counts[ERROR] else 1)
+
+
+if __name__ == '__main__':
+  main()
@@ -4,9 +4,37 @@ Generate BTR deployment scripts and test base with embedded deployment logic.
 Creates self-contained deployment logic in script and test files.
 """
 
+import hashlib
 import json
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 
+from artifacts import artifact_path as get_artifact_path, default_store
+from createx import to_bytes, to_checksum_address
+from keccak import selector
+
+ROOT = Path(__file__).parent.parent
+SELECTOR_CACHE_PATH = ROOT / ".cache" / "selectors.json"
+MANIFEST_PATH = ROOT / ".cache" / "deployers.manifest.json"
+SCRIPT_TEMPLATE = "DiamondDeployerScript.s.sol.tpl"
+TEST_TEMPLATE = "BaseDiamondTest.t.sol.tpl"
+ADAPTER_TEMPLATE = "AdapterDeployer.sol.tpl"
+ADAPTER_SCRIPT_TEMPLATE = "AdapterDeployerScript.s.sol.tpl"
+TEMPLATE_NAMES = (SCRIPT_TEMPLATE, TEST_TEMPLATE, ADAPTER_TEMPLATE,
+                  ADAPTER_SCRIPT_TEMPLATE)
+ADAPTERS_SRC_DIR = ROOT / "evm" / "src" / "adapters"
+# Code producing the generated files: a change to any of them invalidates the manifest
+GENERATOR_SOURCES = ("generate_deployers.py", "keccak.py", "createx.py",
+                     "artifacts.py")
+
+# Template placeholder, e.g. {{SALT}} (`{{{NAME}}}` renders NAME within literal braces)
+PLACEHOLDER_RE = re.compile(r"\{\{([A-Z_]+)\}\}")
+
+# Exit code signaling that no generated file was (re)written, cf. build.sh
+EXIT_UNCHANGED = 3
+
 
 def load_contracts_config():
   """Load contracts configuration from contracts.json."""
@@ -17,17 +45,99 @@ def load_contracts_config():
     return json.load(f)
 
 
-def load_template(template_name: str) -> str:
-  """Load a template file from the templates directory."""
+class Template:
+  """
+    A template tokenized once into literal and placeholder segments.
+    Rendering fills the placeholder slots from a context and joins the segments in one pass.
+    """
+
+  def __init__(self, source: str, name: str = "<string>"):
+    self.name = name
+    # Literals at even indexes, placeholder names at odd indexes
+    self.segments = PLACEHOLDER_RE.split(source)
+
+  def render(self, context: dict) -> str:
+    segments = self.segments[:]
+    for i in range(1, len(segments), 2):
+      try:
+        segments[i] = context[segments[i]]
+      except KeyError:
+        raise KeyError(
+            f"{self.name}: no value for placeholder {segments[i]}") from None
+    return "".join(segments)
+
+
+@lru_cache(maxsize=None)
+def load_template(template_name: str) -> Template:
+  """Load and tokenize a template file from the templates directory."""
   script_dir = Path(__file__).parent
   template_path = script_dir.parent / "templates" / template_name
 
   with open(template_path, 'r') as f:
-    return f.read()
+    return Template(f.read(), template_name)
+
+
+def load_selector_cache() -> dict:
+  """Load the persistent selector cache (artifact digest -> ABI signatures)."""
+  try:
+    with open(SELECTOR_CACHE_PATH, 'r') as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+def save_selector_cache(cache: dict):
+  """Persist the selector cache and the artifact index it was read through."""
+  SELECTOR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+  with open(SELECTOR_CACHE_PATH, 'w') as f:
+    json.dump(cache, f, indent=2, sort_keys=True)
+  default_store().save()
+
+
+def build_ownership_index(all_facets: dict) -> dict:
+  """Map every explicitly owned signature to the set of facets declaring it."""
+  owned_index = {}
+  for facet_name, facet_config in all_facets.items():
+    for signature in facet_config.get('ownedSelectors', []) or []:
+      owned_index.setdefault(signature, set()).add(facet_name)
+  return owned_index
+
+
+def read_abi_signatures(artifact_path: Path, cache: dict) -> list:
+  """
+    Return all function signatures of a compiled artifact, in ABI order.
+    Only the abi of artifacts whose content hash changed since the last run is decoded
+    (through the artifact store); unchanged (mtime, size) skips reading the file altogether.
+    """
+  stat = artifact_path.stat()
+  key = str(artifact_path.relative_to(ROOT))
+  entry = cache.get(key)
+  if entry and entry['mtime'] == stat.st_mtime_ns and entry[
+      'size'] == stat.st_size:
+    return entry['signatures']
+
+  store = default_store()
+  digest = store.digest(artifact_path)
+  if entry and entry['hash'] == digest:
+    signatures = entry['signatures']
+  else:
+    signatures = [
+        f"{item.get('name', '')}({','.join(inp.get('type', '') for inp in item.get('inputs', []))})"
+        for item in store.get(artifact_path, 'abi', [])
+        if item.get('type') == 'function'
+    ]
+
+  cache[key] = {
+      'mtime': stat.st_mtime_ns,
+      'size': stat.st_size,
+      'hash': digest,
+      'signatures': signatures
+  }
+  return signatures
 
 
 def get_facet_function_selectors(facet_name: str, owned_selectors: list,
-                                 all_facets: dict) -> list:
+                                 owned_index: dict, cache: dict) -> list:
   """
     Extract function selectors from compiled artifacts.
     If ownedSelectors is provided in config, use those.
@@ -38,8 +148,7 @@ def get_facet_function_selectors(facet_name: str, owned_selectors: list,
     return owned_selectors
 
   # Extract from compiled artifacts
-  script_dir = Path(__file__).parent
-  artifact_path = script_dir.parent / "evm" / "out" / f"{facet_name}.sol" / f"{facet_name}.json"
+  artifact_path = get_artifact_path(facet_name)
 
   if not artifact_path.exists():
     print(
@@ -48,40 +157,15 @@ def get_facet_function_selectors(facet_name: str, owned_selectors: list,
     return []
 
   try:
-    with open(artifact_path, 'r') as f:
-      artifact = json.load(f)
-
-    # Collect all function signatures owned by other facets
-    owned_by_others = set()
-    for other_facet_name, other_facet_config in all_facets.items():
-      if other_facet_name != facet_name:
-        other_owned = other_facet_config.get('ownedSelectors', [])
-        if other_owned and len(other_owned) > 0:
-          owned_by_others.update(other_owned)
-
     function_signatures = []
-    for item in artifact.get('abi', []):
-      if item.get('type') == 'function':
-        name = item.get('name', '')
-        inputs = item.get('inputs', [])
-
-        # Build function signature
-        input_types = [inp.get('type', '') for inp in inputs]
-        signature = f"{name}({','.join(input_types)})"
-
-        # Only include if not owned by another facet
-        if signature not in owned_by_others:
-          function_signatures.append(signature)
-
     excluded_count = 0
-    for item in artifact.get('abi', []):
-      if item.get('type') == 'function':
-        name = item.get('name', '')
-        inputs = item.get('inputs', [])
-        input_types = [inp.get('type', '') for inp in inputs]
-        signature = f"{name}({','.join(input_types)})"
-        if signature in owned_by_others:
-          excluded_count += 1
+    for signature in read_abi_signatures(artifact_path, cache):
+      # Only include if not owned by another facet
+      owners = owned_index.get(signature, ())
+      if any(owner != facet_name for owner in owners):
+        excluded_count += 1
+      else:
+        function_signatures.append(signature)
 
     print(
         f"Extracted {len(function_signatures)} function selectors from {facet_name} artifact (excluded {excluded_count} owned by other facets)"
@@ -93,15 +177,87 @@ def get_facet_function_selectors(facet_name: str, owned_selectors: list,
     return []
 
 
+def compute_input_manifest(config: dict) -> dict:
+  """
+    Hash every input of the generation: contracts.json, templates, the generator sources
+    and the ABI of each deployed facet artifact (bytecode-only changes do not affect the
+    generated code).
+    """
+  sha = lambda data: hashlib.sha256(data).hexdigest()
+  inputs = {
+      "scripts/contracts.json":
+      sha((ROOT / "scripts" / "contracts.json").read_bytes())
+  }
+  for template_name in TEMPLATE_NAMES:
+    inputs[f"templates/{template_name}"] = sha(
+        (ROOT / "templates" / template_name).read_bytes())
+  for source_name in GENERATOR_SOURCES:
+    inputs[f"scripts/{source_name}"] = sha(
+        (ROOT / "scripts" / source_name).read_bytes())
+
+  cache = load_selector_cache()
+  for facet_name, facet_config in config.get("facets", {}).items():
+    if not facet_config.get('includeInDeployer', True):
+      continue
+    artifact_path = get_artifact_path(facet_name)
+    if artifact_path.exists():
+      signatures = read_abi_signatures(artifact_path, cache)
+      inputs[str(artifact_path.relative_to(ROOT))] = sha(
+          json.dumps(signatures).encode())
+  save_selector_cache(cache)
+  return inputs
+
+
+def load_manifest() -> dict:
+  """Load the manifest of the previous generation run."""
+  try:
+    with open(MANIFEST_PATH, 'r') as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+def save_manifest(inputs: dict, outputs: dict):
+  """Persist generation inputs and rendered output hashes."""
+  MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+  with open(MANIFEST_PATH, 'w') as f:
+    json.dump({
+        "inputs": inputs,
+        "outputs": outputs
+    },
+              f,
+              indent=2,
+              sort_keys=True)
+
+
+def outputs_match(outputs: dict) -> bool:
+  """Check that every recorded output still exists with its recorded content."""
+  for rel_path, digest in outputs.items():
+    path = ROOT / rel_path
+    if not path.is_file() or hashlib.sha256(
+        path.read_bytes()).hexdigest() != digest:
+      return False
+  return bool(outputs)
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+  """Write content only if it differs from the file on disk, preserving mtime otherwise."""
+  data = content.encode()
+  if path.is_file() and path.read_bytes() == data:
+    return False
+  path.write_bytes(data)
+  return True
+
+
 def format_selectors_array(selectors: list) -> str:
   """Format function selectors as Solidity array initialization code."""
   if not selectors:
     return "bytes4[] memory selectors = new bytes4[](0);"
 
-  # Convert function signatures to selector format
+  # Convert function signatures to precomputed selector literals
   formatted_selectors = []
   for sig in selectors:
-    formatted_selectors.append(f'bytes4(keccak256("{sig}"))')
+    formatted_selectors.append(f'bytes4({selector(sig)}); // {sig}')
 
   # Generate inline array creation code
   array_size = len(formatted_selectors)
@@ -109,12 +265,32 @@ def format_selectors_array(selectors: list) -> str:
   lines.append(f"bytes4[] memory selectors = new bytes4[]({array_size});")
 
   # Add assignment statements for each selector
-  for i, selector in enumerate(formatted_selectors):
-    lines.append(f"        selectors[{i}] = {selector};")
+  for i, formatted in enumerate(formatted_selectors):
+    lines.append(f"        selectors[{i}] = {formatted}")
 
   return "\n        ".join(lines)
 
 
+def find_selector_collisions(facet_selectors: dict) -> list:
+  """
+    Check that no 4-byte selector is registered twice across facets, either because the
+    same signature is owned by several facets or because two signatures hash alike.
+    """
+  seen = {}
+  collisions = []
+  for facet_name, signatures in facet_selectors.items():
+    for sig in signatures:
+      sel = selector(sig)
+      if sel in seen:
+        other_facet, other_sig = seen[sel]
+        collisions.append(
+            f"{sel}: {other_facet}.{other_sig} collides with {facet_name}.{sig}"
+        )
+      else:
+        seen[sel] = (facet_name, sig)
+  return collisions
+
+
 def generate_initialization_calls(facets: dict) -> str:
   """Generate initialization calls for facets marked as initializable."""
   init_calls = []
@@ -160,88 +336,141 @@ def generate_initialization_calls(facets: dict) -> str:
   return "\n".join(init_calls)
 
 
-def generate_facet_deployment_code(facets: dict) -> tuple[str, str, str]:
-  """Generate facet deployment code, imports, and initialization calls for embedded deployment."""
-  facet_imports = []
-  facet_deployments = []
+# Deployment block of a facet, embedded as FACET_DEPLOYMENTS in the deployer script and test base
+FACET_DEPLOYMENT = Template(
+    """
+        // Deploy {{CONTRACT_NAME}}
+        console.log("Deploying {{CONTRACT_NAME}}...");
+        {
+            address facetAddr = CREATEX.deployCreate3(
+                {{SALT}},
+                type({{CONTRACT_NAME}}).creationCode
+            );
+            require(facetAddr == {{EXPECTED_ADDRESS}}, "{{CONTRACT_NAME}} address mismatch");
+            console.log("{{CONTRACT_NAME}} deployed at:", facetAddr);
+
+            // Create selectors for {{CONTRACT_NAME}}
+            {{SELECTOR_ARRAY_CREATION}}
+            initialCuts[cutIndex] = FacetCut({
+                facetAddress: facetAddr,
+                action: FacetCutAction.{{CUT_ACTION}},
+                functionSelectors: selectors
+            });
+            cutIndex++;
+        }""", "FACET_DEPLOYMENT")
+
+
+def build_facet_contexts(facets: dict, diamond_address: str) -> dict:
+  """
+    Build the template context of every deployed facet, extracting selectors once.
+    Exits on selector collisions across facets.
+    """
+  owned_index = build_ownership_index(facets)
+  cache = load_selector_cache()
+  facet_selectors = {}
+  contexts = {}
 
   for facet_name, facet_config in facets.items():
     # Skip facets not included in deployment
     if not facet_config.get('includeInDeployer', True):
       continue
 
-    # Add import
-    facet_imports.append(
-        f'import {{{facet_name}}} from "@facets/{facet_name}.sol";')
-
     # Get selectors for this facet - either from config or from compiled artifacts
     owned_selectors = facet_config.get('ownedSelectors', [])
     selectors = get_facet_function_selectors(facet_name, owned_selectors,
-                                             facets)
-    selector_array_creation = format_selectors_array(selectors)
-
-    # Generate deployment code
-    deployment_code = f"""
-        // Deploy {facet_name}
-        console.log("Deploying {facet_name}...");
-        {{
-            address facetAddr = CREATEX.deployCreate3(
-                {facet_config["salt"]},
-                type({facet_name}).creationCode
-            );
-            require(facetAddr == {facet_config["expectedAddress"]}, "{facet_name} address mismatch");
-            console.log("{facet_name} deployed at:", facetAddr);
+                                             owned_index, cache)
+    facet_selectors[facet_name] = selectors
 
-            // Create selectors for {facet_name}
-            {selector_array_creation}
-            initialCuts[cutIndex] = FacetCut({{
-                facetAddress: facetAddr,
-                action: FacetCutAction.Add,
-                functionSelectors: selectors
-            }});
-            cutIndex++;
-        }}"""
+    contexts[facet_name] = {
+        "CONTRACT_NAME": facet_name,
+        "SALT": facet_config["salt"],
+        "EXPECTED_ADDRESS": facet_config["expectedAddress"],
+        "DIAMOND_ADDRESS": diamond_address,
+        "SELECTOR_ARRAY_CREATION": format_selectors_array(selectors),
+        "CUT_ACTION": "Add",
+    }
 
-    facet_deployments.append(deployment_code)
+  save_selector_cache(cache)
 
-  # Generate initialization calls
-  initialization_calls = generate_initialization_calls(facets)
+  collisions = find_selector_collisions(facet_selectors)
+  if collisions:
+    for collision in collisions:
+      print(f"❌ Selector collision {collision}")
+    sys.exit(1)
 
-  return "\n".join(facet_imports), "\n".join(
-      facet_deployments), initialization_calls
-
-
-def generate_script(config: dict) -> str:
-  """Generate the DiamondDeployer script with embedded deployment logic."""
-  facets = config.get("facets", {})
+  return contexts
 
-  # Filter facets that should be included in deployment
-  deployment_facets = {
-      name: conf
-      for name, conf in facets.items() if conf.get('includeInDeployer', True)
-  }
 
-  facet_imports, facet_deployments, initialization_calls = generate_facet_deployment_code(
-      deployment_facets)
+# Adapter deployment step of AdapterDeployerScript.s.sol.tpl
+ADAPTER_DEPLOYMENT = Template(
+    """
+        // {{DESCRIPTION}}
+        console.log("{{CONTRACT_NAME}}:", {{CONTRACT_NAME}}Deployer.deploy({{CONSTRUCTOR_ARGS}}));""",
+    "ADAPTER_DEPLOYMENT")
 
-  # Get configuration values
-  btr_config = config.get("BTR", {})
-  diamond_config = config.get("BTRDiamond", {})
+# Same, for adapters whose extra constructor arguments are chain specific (set per chain in env)
+ADAPTER_DEPLOYMENT_WITH_ENV_ARGS = Template(
+    """
+        // {{DESCRIPTION}}
+        if ({{ARGS_SET}}) {
+            console.log("{{CONTRACT_NAME}}:", {{CONTRACT_NAME}}Deployer.deploy({{CONSTRUCTOR_ARGS}}));
+        } else {
+            console.log("Skipping {{CONTRACT_NAME}}: {{ARG_NAMES}} not set");
+        }""", "ADAPTER_DEPLOYMENT_WITH_ENV_ARGS")
 
-  template = load_template("DiamondDeployerScript.s.sol.tpl")
 
-  return template.replace("{{FACET_IMPORTS}}", facet_imports)\
-                .replace("{{BTR_SALT}}", btr_config.get("salt", "0x0"))\
-                .replace("{{BTR_EXPECTED_ADDRESS}}", btr_config.get("expectedAddress", "address(0)"))\
-                .replace("{{DIAMOND_SALT}}", diamond_config.get("salt", "0x0"))\
-                .replace("{{DIAMOND_EXPECTED_ADDRESS}}", diamond_config.get("expectedAddress", "address(0)"))\
-                .replace("{{FACET_COUNT}}", str(len(deployment_facets)))\
-                .replace("{{FACET_DEPLOYMENTS}}", facet_deployments)\
-                .replace("{{INITIALIZATION_CALLS}}", initialization_calls)
+def build_adapter_contexts(config: dict) -> dict:
+  """
+    Build the template context of every configured adapter (dexs, oracles).
+    Adapters take the diamond as first constructor argument, followed by the addresses named
+    in their optional constructorArgs (environment variables, set per chain).
+    """
+  contexts = {}
+  for group, adapters in config.get("adapters", {}).items():
+    for name, adapter_config in adapters.items():
+      env_args = adapter_config.get("constructorArgs", [])
+      contexts[name] = {
+          "CONTRACT_NAME":
+          name,
+          "IMPORT_PATH":
+          f"@{group}/{name}.sol",
+          "SALT":
+          adapter_config["salt"],
+          # Solidity only accepts checksummed address literals
+          "EXPECTED_ADDRESS":
+          to_checksum_address(to_bytes(adapter_config["expectedAddress"], 20)),
+          "DESCRIPTION":
+          adapter_config.get("description", name),
+          "CONSTRUCTOR_ARGS":
+          "abi.encode(" +
+          ", ".join(["diamond"] +
+                    [f'vm.envAddress("{arg}")' for arg in env_args]) + ")",
+          "ARGS_SET":
+          " && ".join(f'vm.envOr("{arg}", address(0)) != address(0)'
+                      for arg in env_args),
+          "ARG_NAMES":
+          ", ".join(env_args),
+      }
+  return contexts
+
+
+def find_unconfigured_adapters(adapter_contexts: dict) -> list:
+  """List concrete adapter sources with no contracts.json entry (hence no deployer)."""
+  unconfigured = []
+  for source in sorted(ADAPTERS_SRC_DIR.glob("*/*.sol")):
+    if source.stem in adapter_contexts:
+      continue
+    if "abstract contract " in source.read_text():
+      continue
+    unconfigured.append(f"{source.parent.name}/{source.stem}")
+  return unconfigured
 
 
-def generate_test(config: dict) -> str:
-  """Generate the BaseDiamondTest with embedded deployment logic."""
+def build_deployment_model(config: dict) -> dict:
+  """
+    Compute everything the templates need once: the shared context of the deployer
+    script and test base, and the per-contract contexts (facets, adapters).
+    """
   facets = config.get("facets", {})
 
   # Filter facets that should be included in deployment
@@ -250,23 +479,59 @@ def generate_test(config: dict) -> str:
       for name, conf in facets.items() if conf.get('includeInDeployer', True)
   }
 
-  facet_imports, facet_deployments, initialization_calls = generate_facet_deployment_code(
-      deployment_facets)
-
   # Get configuration values
   btr_config = config.get("BTR", {})
   diamond_config = config.get("BTRDiamond", {})
 
-  template = load_template("BaseDiamondTest.t.sol.tpl")
+  facet_contexts = build_facet_contexts(
+      deployment_facets, diamond_config.get("expectedAddress", "address(0)"))
+
+  context = {
+      "FACET_IMPORTS":
+      "\n".join(f'import {{{name}}} from "@facets/{name}.sol";'
+                for name in facet_contexts),
+      "BTR_SALT":
+      btr_config.get("salt", "0x0"),
+      "BTR_EXPECTED_ADDRESS":
+      btr_config.get("expectedAddress", "address(0)"),
+      "DIAMOND_SALT":
+      diamond_config.get("salt", "0x0"),
+      "DIAMOND_EXPECTED_ADDRESS":
+      diamond_config.get("expectedAddress", "address(0)"),
+      "FACET_COUNT":
+      str(len(deployment_facets)),
+      "FACET_DEPLOYMENTS":
+      "\n".join(
+          FACET_DEPLOYMENT.render(facet_context)
+          for facet_context in facet_contexts.values()),
+      "INITIALIZATION_CALLS":
+      generate_initialization_calls(deployment_facets),
+  }
 
-  return template.replace("{{FACET_IMPORTS}}", facet_imports)\
-                .replace("{{BTR_SALT}}", btr_config.get("salt", "0x0"))\
-                .replace("{{BTR_EXPECTED_ADDRESS}}", btr_config.get("expectedAddress", "address(0)"))\
-                .replace("{{DIAMOND_SALT}}", diamond_config.get("salt", "0x0"))\
-                .replace("{{DIAMOND_EXPECTED_ADDRESS}}", diamond_config.get("expectedAddress", "address(0)"))\
-                .replace("{{FACET_COUNT}}", str(len(deployment_facets)))\
-                .replace("{{FACET_DEPLOYMENTS}}", facet_deployments)\
-                .replace("{{INITIALIZATION_CALLS}}", initialization_calls)
+  adapter_contexts = build_adapter_contexts(config)
+  context.update({
+      "DIAMOND_ADDRESS":
+      to_checksum_address(
+          to_bytes(diamond_config.get("expectedAddress", "0x" + "00" * 20),
+                   20)),
+      "ADAPTER_COUNT":
+      str(len(adapter_contexts)),
+      "ADAPTER_IMPORTS":
+      "\n".join(
+          f'import {{{name}Deployer}} from "@scripts/adapters/{name}Deployer.gen.sol";'
+          for name in adapter_contexts),
+      "ADAPTER_DEPLOYMENTS":
+      "\n".join(
+          (ADAPTER_DEPLOYMENT_WITH_ENV_ARGS if adapter_context["ARGS_SET"] else
+           ADAPTER_DEPLOYMENT).render(adapter_context)
+          for adapter_context in adapter_contexts.values()),
+  })
+
+  return {
+      "context": context,
+      "facets": facet_contexts,
+      "adapters": adapter_contexts,
+  }
 
 
 def main():
@@ -283,26 +548,46 @@ def main():
 
   print("🔧 Generating BTR deployment files...")
 
-  # Generate DiamondDeployer script
-  script_code = generate_script(config)
   script_path = script_output_dir / "DiamondDeployerScript.gen.s.sol"
-  with open(script_path, 'w') as f:
-    f.write(script_code)
-  print("✅ Generated DiamondDeployerScript.gen.s.sol")
-
-  # Generate BaseDiamondTest
-  test_code = generate_test(config)
   test_path = test_output_dir / "BaseDiamondTest.gen.t.sol"
-  with open(test_path, 'w') as f:
-    f.write(test_code)
-  print("✅ Generated BaseDiamondTest.gen.t.sol")
-
-  # Count facets for summary
-  facets = config.get("facets", {})
-  deployment_facets = {
-      name: conf
-      for name, conf in facets.items() if conf.get('includeInDeployer', True)
-  }
+  adapter_script_path = script_output_dir / "AdapterDeployerScript.gen.s.sol"
+  adapter_output_dir = script_output_dir / "adapters"
+
+  # Skip rendering altogether when no input changed since the last run
+  inputs = compute_input_manifest(config)
+  previous = load_manifest()
+  if previous.get("inputs") == inputs and outputs_match(
+      previous.get("outputs", {})):
+    print("✅ Inputs unchanged, generated files are up to date")
+    sys.exit(EXIT_UNCHANGED)
+
+  # Single model rendered into every output
+  model = build_deployment_model(config)
+  targets = [(script_path, SCRIPT_TEMPLATE, model["context"]),
+             (test_path, TEST_TEMPLATE, model["context"]),
+             (adapter_script_path, ADAPTER_SCRIPT_TEMPLATE, model["context"])]
+  targets += [(adapter_output_dir / f"{name}Deployer.gen.sol",
+               ADAPTER_TEMPLATE, adapter_context)
+              for name, adapter_context in model["adapters"].items()]
+  adapter_output_dir.mkdir(exist_ok=True)
+
+  outputs = {}
+  written = 0
+  for path, template_name, context in targets:
+    code = load_template(template_name).render(context)
+    if write_if_changed(path, code):
+      written += 1
+      print(f"✅ Generated {path.name}")
+    else:
+      print(f"✅ {path.name} unchanged")
+    outputs[str(path.relative_to(ROOT))] = hashlib.sha256(
+        code.encode()).hexdigest()
+  save_manifest(inputs, outputs)
+
+  unconfigured = find_unconfigured_adapters(model["adapters"])
+  if unconfigured:
+    print(f"⚠️  No contracts.json entry (salt) for adapters: "
+          f"{', '.join(unconfigured)}")
 
   print(f"""
 🎉 Generation complete!
@@ -310,7 +595,9 @@ def main():
 📊 Summary:
 - Deployment script: DiamondDeployerScript.gen.s.sol
 - Test base: BaseDiamondTest.gen.t.sol
-- Facets included: {len(deployment_facets)}
+- Facets included: {len(model['facets'])}
+- Adapter deployment script: AdapterDeployerScript.gen.s.sol
+- Adapters included: {len(model['adapters'])}
 
 📁 Generated files use embedded deployment logic:
 - No separate deployer contracts needed
@@ -318,6 +605,7 @@ def main():
 - Uses CreateX for deterministic addresses
 - Includes comprehensive logging and verification
 - Automatically extracts function selectors from compiled artifacts
+- Precomputes selectors as bytes4 literals and rejects selector collisions
 - Calls initialize functions for initializable facets
 
 ⚠️  Note: Function selectors are extracted from compiled artifacts when
@@ -325,6 +613,9 @@ def main():
     before running this generator.
 """)
 
+  if not written:
+    sys.exit(EXIT_UNCHANGED)
+
 
 if __name__ == "__main__":
   main()
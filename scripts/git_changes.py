@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Git Changed Files
+
+Candidate file sets for the source formatters' --changed mode, read from a single
+`git diff --name-only -z` call: staged changes (default), working tree changes against
+HEAD, or changes against any base ref.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from walk import DEFAULT_EXCLUDES
+
+
+def add_changed_argument(parser):
+  """Register the --changed [staged|worktree|REF] option on an argparse parser"""
+  parser.add_argument(
+      '--changed',
+      nargs='?',
+      const='staged',
+      metavar='REF',
+      help=
+      "only process changed files: 'staged' (default), 'worktree' or against a git ref"
+  )
+
+
+def changed_files(mode='staged',
+                  root='.',
+                  suffixes=('.sol', ),
+                  excludes=DEFAULT_EXCLUDES) -> list:
+  """
+  Return existing changed files under root (as root-joined paths) ending with suffixes,
+  skipping those inside excluded directories.
+  """
+  cmd = [
+      'git', 'diff', '--name-only', '-z', '--relative', '--diff-filter=ACMR'
+  ]
+  if mode == 'staged':
+    cmd.append('--cached')
+  elif mode == 'worktree':
+    cmd.append('HEAD')
+  else:
+    cmd.append(mode)
+
+  result = subprocess.run(cmd, cwd=root, capture_output=True)
+  if result.returncode != 0:
+    sys.exit(f"git diff failed: {result.stderr.decode().strip()}")
+
+  excludes = frozenset(excludes)
+  files = []
+  for name in result.stdout.decode().split('\0'):
+    if not name.endswith(suffixes):
+      continue
+    path = Path(root) / name
+    if excludes.isdisjoint(Path(name).parts[:-1]) and path.is_file():
+      files.append(path)
+  return files
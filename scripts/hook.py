@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Git Hook Shim
+
+Forwards check_name.py arguments to the hook server (scripts/hook_server.py) when it listens
+on <git dir>/btr-hooks.sock, and runs check_name.py in-process otherwise. Only stdlib
+socket/json are imported on the fast path.
+
+Usage: python3 scripts/hook.py -c | -b | -p [--commit-msg-file FILE]
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_NAME = 'btr-hooks.sock'
+
+
+def find_socket():
+  """Server socket of the enclosing repository (plain .git directories only)"""
+  directory = os.getcwd()
+  while True:
+    git_dir = os.path.join(directory, '.git')
+    if os.path.isdir(git_dir):
+      return os.path.join(git_dir, SOCKET_NAME)
+    parent = os.path.dirname(directory)
+    if parent == directory:
+      return None
+    directory = parent
+
+
+def forward(path, args):
+  """Exit code of the checks run by the server (None when it is not reachable)"""
+  try:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+      sock.settimeout(10)
+      sock.connect(path)
+      sock.sendall(json.dumps({'args': args}).encode() + b'\n')
+      response = json.loads(sock.makefile('rb').readline())
+  except (OSError, ValueError):
+    return None
+  for line in response['output']:
+    print(line, file=sys.stderr)
+  return response['code']
+
+
+def main():
+  path = find_socket()
+  code = forward(path, sys.argv[1:]) if path and os.path.exists(path) else None
+  if code is None:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import check_name
+    check_name.main()
+  sys.exit(code)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Git Hook Server
+
+Optional long-lived server answering the check_name.py hook checks over a Unix socket
+(<git dir>/btr-hooks.sock), so hooks skip uv environment resolution and interpreter startup.
+The repository state (root, branch, upstream) is read with one git call and kept until
+.git/HEAD or .git/config change. The server exits after an hour without requests.
+
+Hooks call the scripts/hook.py shim, which falls back to running the checks in-process
+when no server is listening.
+
+Usage: python scripts/hook_server.py start|stop|status
+       python scripts/hook_server.py serve    # foreground
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from check_name import check, parse_flags, repo_state
+
+SOCKET_NAME = 'btr-hooks.sock'
+IDLE_TIMEOUT = 3600
+START_TIMEOUT = 5
+
+
+def socket_path(git_dir: str) -> Path:
+  return Path(git_dir) / SOCKET_NAME
+
+
+class StateCache:
+  """repo_state() of the repository, refreshed when HEAD or the git config change"""
+
+  def __init__(self, root: str):
+    self.root = root
+    self.state = repo_state(root)
+    self.key = self._key()
+
+  def _key(self) -> tuple:
+    git_dir = Path(self.state['git_dir'])
+    return tuple(
+        (git_dir / name).stat().st_mtime_ns for name in ('HEAD', 'config'))
+
+  def get(self) -> dict:
+    key = self._key()
+    if key != self.key:
+      self.state, self.key = repo_state(self.root), key
+    return self.state
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+
+  def handle(self):
+    request = json.loads(self.rfile.readline())
+    if request.get('cmd') == 'stop':
+      self.server.stopping = True
+      response = {'code': 0, 'output': []}
+    else:
+      failures = check(parse_flags(request.get('args', [])),
+                       self.server.cache.get())
+      response = {'code': 1 if failures else 0, 'output': failures}
+    self.wfile.write(json.dumps(response).encode() + b'\n')
+    self.server.last_request = time.monotonic()
+
+
+class HookServer(socketserver.UnixStreamServer):
+  timeout = 60  # handle_request() wakeup, to check the idle timeout
+
+  def __init__(self, path: Path, cache: StateCache):
+    super().__init__(str(path), HookHandler)
+    self.cache = cache
+    self.stopping = False
+    self.last_request = time.monotonic()
+
+
+def request(path: Path, payload: dict, timeout: float = 10):
+  """Send a request to the server at path, returning its response (None if none listens)"""
+  try:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+      sock.settimeout(timeout)
+      sock.connect(str(path))
+      sock.sendall(json.dumps(payload).encode() + b'\n')
+      return json.loads(sock.makefile('rb').readline())
+  except (OSError, ValueError):
+    return None
+
+
+def serve(state: dict):
+  path = socket_path(state['git_dir'])
+  if request(path, {'args': []}, timeout=1) is not None:
+    sys.exit(f"Hook server already listening on {path}")
+  path.unlink(missing_ok=True)
+  server = HookServer(path, StateCache(state['root']))
+  try:
+    while not server.stopping:
+      if time.monotonic() - server.last_request > IDLE_TIMEOUT:
+        break
+      server.handle_request()
+  finally:
+    server.server_close()
+    path.unlink(missing_ok=True)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('command', choices=('start', 'stop', 'status', 'serve'))
+  args = parser.parse_args()
+
+  state = repo_state()
+  if not state['root']:
+    sys.exit("[POLICY] Error: Not a git repository?")
+  path = socket_path(state['git_dir'])
+
+  if args.command == 'serve':
+    serve(state)
+  elif args.command == 'start':
+    if request(path, {'args': []}, timeout=1) is not None:
+      print(f"✅ Hook server already running on {path}")
+      return
+    subprocess.Popen([sys.executable, __file__, 'serve'],
+                     cwd=state['root'],
+                     stdin=subprocess.DEVNULL,
+                     stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while request(path, {'args': []}, timeout=1) is None:
+      if time.monotonic() > deadline:
+        sys.exit("❌ Hook server failed to start")
+      time.sleep(0.05)
+    print(f"✅ Hook server listening on {path}")
+  elif args.command == 'stop':
+    stopped = request(path, {'cmd': 'stop'}) is not None
+    print("✅ Hook server stopped" if stopped else "Hook server not running")
+  else:
+    running = request(path, {'args': []}, timeout=1) is not None
+    print(
+        f"Hook server {'running on ' + str(path) if running else 'not running'}"
+    )
+    sys.exit(0 if running else 1)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Solidity Import Graph
+
+Import dependency graph of the evm sources (src, interfaces, utils, scripts, tests), with
+remappings.txt applied, so a change can be mapped to the files that need recompiling: the
+changed files plus everything importing them, transitively. Each file's resolved imports
+are kept in .cache/import_graph.json keyed by (mtime, size), so only edited files are
+re-parsed.
+
+`affected --since-build` lists the files changed since the last successful build.sh run
+(.cache/build.stamp) and their dependents, for `build.sh --incremental`. It exits with
+code 3 when a full build is required instead: no previous build, or foundry.toml or
+remappings.txt changed since.
+
+Usage: python scripts/import_graph.py affected [--since-build | --changed [REF]]
+       python scripts/import_graph.py hubs [--top 20]
+"""
+
+import argparse
+import hashlib
+import json
+import posixpath
+import sys
+from collections import deque
+from pathlib import Path
+
+from git_changes import add_changed_argument, changed_files
+from organize_imports import IMPORT_RE
+from walk import DEFAULT_EXCLUDES, iter_files
+
+ROOT = Path(__file__).parent.parent
+EVM_DIR = ROOT / 'evm'
+REMAPPINGS_PATH = EVM_DIR / 'remappings.txt'
+CACHE_PATH = ROOT / '.cache' / 'import_graph.json'
+STAMP_PATH = ROOT / '.cache' / 'build.stamp'
+# Project sources, relative to evm (dependencies under .deps are leaves)
+SOURCE_DIRS = ('src', 'interfaces', 'utils', 'scripts', 'tests')
+# Build inputs other than sources: any change requires a full build
+BUILD_CONFIG = ('foundry.toml', 'remappings.txt')
+CACHE_VERSION = 1
+EXIT_FULL_BUILD = 3
+
+
+def load_remappings(path: Path = REMAPPINGS_PATH) -> list:
+  """(prefix, target) pairs of remappings.txt, longest prefix first as forge applies them"""
+  remappings = []
+  if path.is_file():
+    for line in path.read_text().splitlines():
+      line = line.strip()
+      if not line or line.startswith('#') or '=' not in line:
+        continue
+      prefix, target = line.split('=', 1)
+      # Drop the optional `context:` part of `context:prefix=target`
+      remappings.append((prefix.rsplit(':', 1)[-1], target))
+  return sorted(remappings, key=lambda r: len(r[0]), reverse=True)
+
+
+def resolve(importer: str, target: str, remappings: list) -> str:
+  """evm-relative path of an import of target from importer (evm-relative)"""
+  if target.startswith(('./', '../')):
+    path = posixpath.join(posixpath.dirname(importer), target)
+  else:
+    path = next((dest + target[len(prefix):]
+                 for prefix, dest in remappings if target.startswith(prefix)),
+                target)
+  return posixpath.normpath(path)
+
+
+class ImportGraph:
+  """File -> resolved imports of the evm sources, re-parsing files whose (mtime, size) changed"""
+
+  def __init__(self, cache_path: Path = CACHE_PATH):
+    self.cache_path = cache_path
+    remappings_text = REMAPPINGS_PATH.read_bytes() if REMAPPINGS_PATH.is_file(
+    ) else b''
+    self.remappings = load_remappings()
+    self.remappings_hash = hashlib.sha256(remappings_text).hexdigest()
+    try:
+      with open(cache_path) as f:
+        cache = json.load(f)
+      valid = (cache.get('version') == CACHE_VERSION
+               and cache.get('remappings') == self.remappings_hash)
+      cached = cache['files'] if valid else {}
+    except (OSError, ValueError, KeyError):
+      cached = {}
+
+    self.files = {}
+    self.dirty = False
+    for directory in SOURCE_DIRS:
+      if not (EVM_DIR / directory).is_dir():
+        continue
+      # Generated sources are compiled too, whether or not they are gitignored
+      for fp in iter_files(EVM_DIR / directory, ('.sol', ),
+                           DEFAULT_EXCLUDES,
+                           gitignore=False):
+        self._add(fp, cached)
+    self.dirty |= cached.keys() != self.files.keys()
+    self.imports = {
+        path: entry['imports']
+        for path, entry in self.files.items()
+    }
+
+  def _add(self, fp: Path, cached: dict):
+    path = fp.relative_to(EVM_DIR).as_posix()
+    stat = fp.stat()
+    entry = cached.get(path)
+    if not entry or entry['mtime'] != stat.st_mtime_ns or entry[
+        'size'] != stat.st_size:
+      entry = {
+          'mtime': stat.st_mtime_ns,
+          'size': stat.st_size,
+          'imports': self.parse(path, fp.read_text())
+      }
+      self.dirty = True
+    self.files[path] = entry
+
+  def parse(self, path: str, content: str) -> list:
+    """Resolved, deduplicated imports of a source"""
+    imports = {
+        resolve(path, match.group(2), self.remappings)
+        for match in IMPORT_RE.finditer(content)
+    }
+    imports.discard(path)
+    return sorted(imports)
+
+  def save(self):
+    if not self.dirty:
+      return
+    self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(self.cache_path, 'w') as f:
+      json.dump(
+          {
+              'version': CACHE_VERSION,
+              'remappings': self.remappings_hash,
+              'files': self.files
+          },
+          f,
+          separators=(',', ':'))
+    self.dirty = False
+
+  def dependents(self) -> dict:
+    """File -> files importing it directly"""
+    reverse = {}
+    for path, imports in self.imports.items():
+      for target in imports:
+        reverse.setdefault(target, []).append(path)
+    return reverse
+
+  def affected(self, changed) -> list:
+    """Project sources depending on any of changed (included), transitively"""
+    reverse = self.dependents()
+    seen = set(changed)
+    queue = deque(changed)
+    while queue:
+      for importer in reverse.get(queue.popleft(), ()):
+        if importer not in seen:
+          seen.add(importer)
+          queue.append(importer)
+    return sorted(path for path in seen if path in self.imports)
+
+  def hubs(self) -> list:
+    """(transitive dependents, direct dependents, file) of every imported file, heaviest first"""
+    reverse = self.dependents()
+    return sorted(((len(self.affected([target])) -
+                    (target in self.imports), len(importers), target)
+                   for target, importers in reverse.items()),
+                  reverse=True)
+
+
+def changed_since_build(graph: ImportGraph):
+  """Sources modified since the last build stamp, None if a full build is required"""
+  if not STAMP_PATH.is_file():
+    return None
+  stamp = STAMP_PATH.stat().st_mtime_ns
+  for name in BUILD_CONFIG:
+    config = EVM_DIR / name
+    if config.is_file() and config.stat().st_mtime_ns > stamp:
+      return None
+  return [
+      path for path, entry in graph.files.items() if entry['mtime'] > stamp
+  ]
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  commands = parser.add_subparsers(dest='command', required=True)
+  affected = commands.add_parser(
+      'affected', help='list the sources to recompile, relative to evm')
+  affected.add_argument(
+      '--since-build',
+      action='store_true',
+      help='sources modified since the last build.sh run (exit 3: full build needed)')
+  add_changed_argument(affected)
+  hubs = commands.add_parser('hubs',
+                             help='files with the most transitive dependents')
+  hubs.add_argument('--top', type=int, default=20)
+  args = parser.parse_args()
+
+  graph = ImportGraph()
+  graph.save()
+
+  if args.command == 'hubs':
+    print(
+        f"{'dependents':>10} {'direct':>7}  file ({len(graph.imports)} sources)"
+    )
+    for transitive, direct, target in graph.hubs()[:args.top]:
+      print(f"{transitive:>10} {direct:>7}  {target}")
+    return
+
+  if args.since_build:
+    changed = changed_since_build(graph)
+    if changed is None:
+      print(
+          "⚠️ No previous build or build config changed, full build required",
+          file=sys.stderr)
+      sys.exit(EXIT_FULL_BUILD)
+  else:
+    changed = [
+        fp.relative_to(EVM_DIR).as_posix()
+        for fp in changed_files(args.changed or 'worktree', EVM_DIR, (
+            '.sol', ))
+    ]
+  for path in graph.affected(changed):
+    print(path)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Keccak-256 (Ethereum flavour, not NIST SHA3-256) used by the off-chain tooling.
+
+Uses pycryptodome's C implementation when installed and falls back to a pure-Python
+Keccak-f[1600] permutation otherwise.
+"""
+
+try:
+  from Crypto.Hash import keccak as _keccak  # pycryptodome (optional)
+except ImportError:
+  _keccak = None
+
+_MASK = (1 << 64) - 1
+_RATE = 136  # bytes, 1088 bits for 256-bit output
+
+_ROUND_CONSTANTS = (0x0000000000000001, 0x0000000000008082, 0x800000000000808A,
+                    0x8000000080008000, 0x000000000000808B, 0x0000000080000001,
+                    0x8000000080008081, 0x8000000000008009, 0x000000000000008A,
+                    0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+                    0x000000008000808B, 0x800000000000008B, 0x8000000000008089,
+                    0x8000000000008003, 0x8000000000008002, 0x8000000000000080,
+                    0x000000000000800A, 0x800000008000000A, 0x8000000080008081,
+                    0x8000000000008080, 0x0000000080000001, 0x8000000080008008)
+
+# Rotation offsets indexed by lane x + 5 * y
+_ROTATIONS = (0, 1, 62, 28, 27, 36, 44, 6, 55, 20, 3, 10, 43, 25, 39, 41, 45,
+              15, 21, 8, 18, 2, 61, 56, 14)
+
+# pi step destination lane for each source lane: (x, y) -> (y, 2x + 3y)
+_PI = tuple(y + 5 * ((2 * x + 3 * y) % 5) for y in range(5) for x in range(5))
+
+
+def _keccak_f(state: list):
+  """Apply the Keccak-f[1600] permutation in place on 25 64-bit lanes."""
+  for rc in _ROUND_CONSTANTS:
+    # theta
+    c = [
+        state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20]
+        for x in range(5)
+    ]
+    for x in range(5):
+      d = c[(x - 1) % 5] ^ (((c[(x + 1) % 5] << 1) | (c[(x + 1) % 5] >> 63))
+                            & _MASK)
+      for y in range(0, 25, 5):
+        state[x + y] ^= d
+    # rho and pi
+    b = [0] * 25
+    for i in range(25):
+      r = _ROTATIONS[i]
+      lane = state[i]
+      b[_PI[i]] = ((lane << r) | (lane >> (64 - r))) & _MASK if r else lane
+    # chi
+    for y in range(0, 25, 5):
+      b0, b1, b2, b3, b4 = b[y:y + 5]
+      state[y] = b0 ^ (~b1 & b2)
+      state[y + 1] = b1 ^ (~b2 & b3)
+      state[y + 2] = b2 ^ (~b3 & b4)
+      state[y + 3] = b3 ^ (~b4 & b0)
+      state[y + 4] = b4 ^ (~b0 & b1)
+    # iota
+    state[0] ^= rc
+
+
+def _keccak256_py(data: bytes) -> bytes:
+  """Pure-Python Keccak-256 sponge."""
+  padded = bytearray(data)
+  padded.append(0x01)
+  padded.extend(b'\x00' * (-len(padded) % _RATE))
+  padded[-1] |= 0x80
+
+  state = [0] * 25
+  for offset in range(0, len(padded), _RATE):
+    block = padded[offset:offset + _RATE]
+    for i in range(_RATE // 8):
+      state[i] ^= int.from_bytes(block[8 * i:8 * i + 8], 'little')
+    _keccak_f(state)
+  return b''.join(lane.to_bytes(8, 'little') for lane in state[:4])
+
+
+def keccak256(data: bytes) -> bytes:
+  """Return the 32-byte Keccak-256 digest of data."""
+  if _keccak is not None:
+    return _keccak.new(digest_bits=256, data=data).digest()
+  return _keccak256_py(data)
+
+
+def selector(signature: str) -> str:
+  """Return the 4-byte function selector of a canonical signature as 0x-prefixed hex."""
+  return '0x' + keccak256(signature.encode()).hex()[:8]
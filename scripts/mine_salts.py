@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+CreateX CREATE3 Vanity Salt Miner
+
+Mines permissioned CreateX salts (deployer prefix + redeploy protection flag + 11 bytes of
+entropy) whose CREATE3 address matches a hex prefix and/or suffix, across all cores.
+Progress is checkpointed under .cache/ so interrupted runs resume where they stopped, and
+hits are appended to assets/createx3-salts in the existing `<salt> => <address>` format.
+
+Usage: python scripts/mine_salts.py --prefix b712 --suffix b712 [--count 5] [--jobs N]
+Install pycryptodome for a practical hash rate (pure-Python Keccak fallback otherwise).
+"""
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from createx import (CREATEX, FLAG_FALSE, FLAG_TRUE, PROXY_INITCODE_HASH,
+                     parse_salts_file, to_bytes, to_checksum_address)
+from file_pipeline import add_jobs_argument
+from keccak import keccak256
+
+ROOT = Path(__file__).parent.parent
+SALTS_DIR = ROOT / 'assets' / 'createx3-salts'
+PROGRESS_DIR = ROOT / '.cache' / 'mine_salts'
+
+# Default deployer, matching the existing salt lists
+DEPLOYER = '0x0a37aEc263CbA0aaBC09Bac56A0F2074a22E69A3'
+
+# Entropy (11 bytes) = run seed (4 bytes) + candidate counter (7 bytes)
+SEED_BYTES, COUNTER_BYTES = 4, 7
+
+
+def mine_batch(salt_head: bytes, guard_head: bytes, seed: bytes, start: int,
+               size: int, prefix: str, suffix: str) -> list:
+  """
+  Evaluate size consecutive counters from start, returning matching (salt, address) pairs.
+  The constant parts of the three Keccak preimages are built once per batch.
+  """
+  create2_head = b'\xff' + CREATEX
+  rlp_head = b'\xd6\x94'
+  head = salt_head + seed
+  hits = []
+  for counter in range(start, start + size):
+    salt = head + counter.to_bytes(COUNTER_BYTES, 'big')
+    guarded = keccak256(guard_head + salt)
+    proxy = keccak256(create2_head + guarded + PROXY_INITCODE_HASH)[12:]
+    address = keccak256(rlp_head + proxy + b'\x01')[12:].hex()
+    if address.startswith(prefix) and address.endswith(suffix):
+      hits.append((salt, bytes.fromhex(address)))
+  return hits
+
+
+def load_progress(path: Path) -> dict:
+  try:
+    return json.loads(path.read_text())
+  except (OSError, ValueError):
+    return {'seed': secrets.token_hex(SEED_BYTES), 'next': 0, 'tried': 0}
+
+
+def save_progress(path: Path, progress: dict):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(progress))
+
+
+def append_salts(path: Path, hits: list):
+  """Append hits, matching the list's address casing (checksummed unless all lowercase)"""
+  existing = parse_salts_file(path) if path.exists() else []
+  known = {salt for salt, _ in existing}
+  checksummed = not path.exists() or any(c.isupper() for c in path.read_text())
+  lines = []
+  for salt, address in hits:
+    salt_hex = '0x' + salt.hex()
+    if salt_hex in known:
+      continue
+    addr = to_checksum_address(
+        address) if checksummed else '0x' + address.hex()
+    lines.append(f"{salt_hex} => {addr}\n")
+  if lines:
+    content = path.read_text() if path.exists() else ''
+    with open(path, 'a') as f:
+      if content and not content.endswith('\n'):
+        f.write('\n')
+      f.writelines(lines)
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Mine CreateX CREATE3 vanity salts')
+  parser.add_argument(
+      '--deployer',
+      default=DEPLOYER,
+      help='permissioned deployer (salt prefix and msg.sender)')
+  parser.add_argument('--crosschain',
+                      type=int,
+                      metavar='CHAIN_ID',
+                      help='mine cross-chain protected salts for this chain')
+  parser.add_argument('--prefix', default='', help='address hex prefix')
+  parser.add_argument('--suffix', default='', help='address hex suffix')
+  parser.add_argument('--count',
+                      type=int,
+                      default=1,
+                      help='salts to find before stopping')
+  add_jobs_argument(parser)
+  parser.add_argument('--batch',
+                      type=int,
+                      default=20000,
+                      help='candidates per worker task')
+  parser.add_argument('--out', type=Path, help='salt list to append to')
+  args = parser.parse_args()
+  args.jobs = args.jobs or os.cpu_count() or 1
+
+  prefix, suffix = args.prefix.lower(), args.suffix.lower()
+  if not prefix and not suffix:
+    sys.exit('At least one of --prefix/--suffix is required')
+  if any(c not in '0123456789abcdef' for c in prefix + suffix):
+    sys.exit('Patterns must be hexadecimal')
+
+  deployer = to_bytes(args.deployer, 20)
+  flag = FLAG_FALSE if args.crosschain is None else FLAG_TRUE
+  salt_head = deployer + bytes([flag])
+  guard_head = deployer.rjust(32, b'\x00')
+  if args.crosschain is not None:
+    guard_head += args.crosschain.to_bytes(32, 'big')
+
+  out = args.out or SALTS_DIR / f"salts-{prefix or 'any'}_{suffix or 'any'}.txt"
+  key = f"{deployer.hex()}-{flag:02x}-{args.crosschain or 0}-{prefix}_{suffix}"
+  progress_path = PROGRESS_DIR / f"{key}.json"
+  progress = load_progress(progress_path)
+  seed = bytes.fromhex(progress['seed'])
+  expected = 16**(len(prefix) + len(suffix))
+  print(
+      f"⛏️  Mining 0x{prefix}…{suffix} for {args.deployer} on {args.jobs} "
+      f"cores (~{expected:,} candidates per hit), resuming at {progress['tried']:,}"
+  )
+
+  found = 0
+  started = time.time()
+  tried_at_start = progress['tried']
+  with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+    while found < args.count:
+      base = progress['next']
+      starts = [base + i * args.batch for i in range(args.jobs)]
+      futures = [
+          pool.submit(mine_batch, salt_head, guard_head, seed, start,
+                      args.batch, prefix, suffix) for start in starts
+      ]
+      hits = [hit for future in futures for hit in future.result()]
+
+      progress['next'] = base + args.jobs * args.batch
+      progress['tried'] += args.jobs * args.batch
+      if progress['next'] >= 1 << (8 * COUNTER_BYTES):
+        progress.update(seed=secrets.token_hex(SEED_BYTES), next=0)
+        seed = bytes.fromhex(progress['seed'])
+      if hits:
+        append_salts(out, hits)
+        for salt, address in hits:
+          print(f"\r✔️ 0x{salt.hex()} => {to_checksum_address(address)}")
+        found += len(hits)
+      save_progress(progress_path, progress)
+
+      rate = (progress['tried'] - tried_at_start) / (time.time() - started)
+      print(f"\r{progress['tried']:,} tried, {rate:,.0f}/s",
+            end='',
+            flush=True)
+
+  print(f"\nFound {found} salt(s), appended to {out}")
+
+
+if __name__ == '__main__':
+  main()
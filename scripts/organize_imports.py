@@ -3,18 +3,40 @@
 Solidity Import Organizer
 
 Organizes imports in order: Types/Events/Errors, Libraries, Interfaces, Abstract, Contracts
-Usage: python scripts/organize_imports.py
+Usage: python scripts/organize_imports.py [--jobs N]
 """
 
+import argparse
 import re
+from functools import lru_cache
 from pathlib import Path
 
+from file_pipeline import PROCESSED, SKIPPED, ERROR, add_jobs_argument, run
+from git_changes import add_changed_argument, changed_files
+from sol_scan import collapse_blank_lines
+from walk import DEFAULT_EXCLUDES, add_exclude_argument, iter_files
+
+# Import statement: optional `{items} from` clause, then the quoted path
+IMPORT_RE = re.compile(r'import\s+(?:{([^}]+)}\s+from\s+)?["\']([^"\']+)["\']',
+                       re.DOTALL)
+
+# Imported symbols that mark a Types/Events/Errors import whatever its path
+TYPE_ITEMS = frozenset(
+    ['TokenType', 'FeeType', 'AccessControl', 'Diamond', 'Range'])
+
 
 def categorize_import(path: str, items: list) -> int:
   """Return category: 1=Types/Events/Errors, 2=Libraries, 3=Interfaces, 4=Abstract, 5=Contracts"""
+  if not TYPE_ITEMS.isdisjoint(items):
+    return 1
+  return _categorize_path(path)
+
+
+@lru_cache(maxsize=None)
+def _categorize_path(path: str) -> int:
+  """Path-only part of categorize_import, memoized as the same paths recur across files"""
   # Types, Events, Errors
-  if any(x in path for x in ['Types.sol', 'Events.sol', 'Errors.sol']) or \
-     any(x in items for x in ['TokenType', 'FeeType', 'AccessControl', 'Diamond', 'Range']):
+  if any(x in path for x in ['Types.sol', 'Events.sol', 'Errors.sol']):
     return 1
 
   # Libraries
@@ -23,110 +45,104 @@ def categorize_import(path: str, items: list) -> int:
     return 2
 
   # Interfaces
-  if path.startswith('I') or '/I' in path or 'interface' in path.lower():
+  lower = path.lower()
+  if path.startswith('I') or '/I' in path or 'interface' in lower:
     return 3
 
   # Abstract contracts
-  if 'abstract' in path.lower() or 'Abstract' in path or 'Base' in path:
+  if 'abstract' in lower or 'Base' in path:
     return 4
 
   # Contracts
   return 5
 
 
+def _is_header(stripped: str) -> bool:
+  return (stripped == '' or stripped.startswith('// SPDX-License-Identifier')
+          or stripped.startswith('pragma '))
+
+
+def organize_text(content: str) -> str:
+  """Return Solidity source text with its imports organized (unchanged if it has none)"""
+  # Single pass: split import statements from the other lines and locate the
+  # first line past the SPDX/pragma header, where imports are reinserted
+  imports = []
+  other_lines = []
+  insert_idx = None
+  statement = None
+
+  for line in content.split('\n'):
+    stripped = line.strip()
+
+    if statement is None and not stripped.startswith('import '):
+      if insert_idx is None and not _is_header(stripped):
+        insert_idx = len(other_lines)
+      other_lines.append(line)
+      continue
+
+    # Import statements may span several lines
+    if statement is None:
+      statement = [line]
+    else:
+      statement.append(line)
+    if not stripped.endswith(';'):
+      continue
+
+    import_text = '\n'.join(statement).strip()
+    statement = None
+    match = IMPORT_RE.search(import_text)
+    if match:
+      items_str = match.group(1)
+      items = [x.strip() for x in items_str.split(',')
+               if x.strip()] if items_str else []
+      path = match.group(2)
+      imports.append((categorize_import(path, items), '@openzeppelin'
+                      in path, import_text))
+
+  if not imports:
+    return content
+
+  # Sort imports: by category, then OpenZeppelin first, then alphabetically
+  imports.sort(key=lambda x: (x[0], not x[1], x[2]))
+
+  insert_idx = insert_idx or 0
+  new_lines = (other_lines[:insert_idx] + [''] + [imp[2] for imp in imports] +
+               [''] + other_lines[insert_idx:])
+  return '\n'.join(collapse_blank_lines(new_lines)).rstrip() + '\n'
+
+
 def organize_file(file_path: Path):
-  """Organize imports in a single Solidity file"""
+  """Organize imports in a single Solidity file, returning a pipeline (status, message)"""
   try:
     content = file_path.read_text()
-    lines = content.split('\n')
-
-    imports = []
-    other_lines = []
-    current_import = ""
-    in_multiline_import = False
-
-    for line in lines:
-      stripped = line.strip()
-
-      # Handle multi-line imports
-      if stripped.startswith('import ') or in_multiline_import:
-        current_import += line + '\n'
-        in_multiline_import = True
-
-        if stripped.endswith(';'):
-          # Parse the complete import
-          import_text = current_import.strip()
-          match = re.search(
-              r'import\s+(?:{([^}]+)}\s+from\s+)?["\']([^"\']+)["\']',
-              import_text, re.DOTALL)
-          if match:
-            items_str = match.group(1) or ''
-            items = [x.strip() for x in items_str.split(',')
-                     if x.strip()] if items_str else []
-            path = match.group(2)
-            category = categorize_import(path, items)
-            is_oz = '@openzeppelin' in path
-            imports.append((category, is_oz, import_text))
-
-          current_import = ""
-          in_multiline_import = False
-      else:
-        other_lines.append(line)
-
-    if not imports:
-      return False
-
-    # Sort imports: by category, then OpenZeppelin first, then alphabetically
-    imports.sort(key=lambda x: (x[0], not x[1], x[2]))
-
-    # Find where to insert imports (after SPDX and pragma)
-    insert_idx = 0
-    for i, line in enumerate(other_lines):
-      stripped = line.strip()
-      if not (stripped.startswith('// SPDX-License-Identifier')
-              or stripped.startswith('pragma ') or stripped == ''):
-        insert_idx = i
-        break
-
-    # Insert organized imports
-    import_lines = [imp[2] for imp in imports]
-    new_lines = (other_lines[:insert_idx] + [''] + import_lines + [''] +
-                 other_lines[insert_idx:])
-
-    # Clean up excessive empty lines
-    cleaned_lines = []
-    prev_empty = False
-    for line in new_lines:
-      if line.strip() == '':
-        if not prev_empty:
-          cleaned_lines.append(line)
-        prev_empty = True
-      else:
-        cleaned_lines.append(line)
-        prev_empty = False
-
-    new_content = '\n'.join(cleaned_lines).rstrip() + '\n'
+    new_content = organize_text(content)
+
+    # Leave already organized files untouched (no mtime bump for watchers/forge)
+    if new_content == content:
+      return SKIPPED, None
     file_path.write_text(new_content)
-    return True
+    return PROCESSED, None
 
   except Exception as e:
-    print(f"Error processing {file_path}: {e}")
-    return False
+    return ERROR, f"Error processing {file_path}: {e}"
 
 
 def main():
   """Organize imports in all Solidity files"""
-  sol_files = list(Path('.').rglob('*.sol'))
-  sol_files = [
-      f for f in sol_files if '/out/' not in str(f) and '/.deps/' not in str(f)
-  ]
-
-  organized = 0
-  for file_path in sol_files:
-    if organize_file(file_path):
-      organized += 1
-
-  print(f"Organized imports in {organized}/{len(sol_files)} files")
+  parser = argparse.ArgumentParser(description='Organize Solidity imports')
+  add_jobs_argument(parser)
+  add_exclude_argument(parser)
+  add_changed_argument(parser)
+  args = parser.parse_args()
+
+  excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+  if args.changed:
+    sol_files = changed_files(args.changed, '.', ('.sol', ), excludes)
+  else:
+    sol_files = list(iter_files('.', ('.sol', ), excludes))
+
+  counts = run(sol_files, organize_file, args.jobs)
+  print(f"Organized imports in {counts[PROCESSED]}/{len(sol_files)} files")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Multi-Chain Deployment Planner
+
+Compares the facets and adapters of contracts.json with what each chain of evm/utils/meta has
+recorded in evm/registry.json ("chains" section), by address and runtime bytecode hash, and
+emits a minimal deploy + cut script per chain (evm/scripts/plans/<Chain>DeploymentPlan.gen.s.sol).
+Chains are planned in parallel. Requires compiled artifacts (make build), which also generates
+the adapter deployer libraries the plans import.
+
+A contract is:
+- missing: not recorded on the chain -> deployed
+- moved: recorded at another address, i.e. its salt changed -> deployed
+- stale: recorded at its expected address with another bytecode hash. CREATE3 addresses do not
+  depend on bytecode, so it cannot be redeployed before a new salt is set in contracts.json
+- current: nothing to do
+
+Facets are then cut in per selector, as diff_cuts.py does: the selectors each recorded facet
+serves (its "selectors" in the registry) are diffed against the current mapping into Add,
+Replace and Remove cuts. Facets recorded without selectors are assumed to serve their current
+ones.
+
+Recording a broadcast plan (--record) reads the chain itself, through HTTPS_RPC_<chain id> or
+--rpc-url: only contracts with code at their expected address are registered, and each facet's
+selectors are those the diamond loupe routes to it.
+
+Usage: python scripts/plan_deployments.py [--chains base,sonic] [--jobs N]
+       python scripts/plan_deployments.py --record base   # after broadcasting base's plan
+"""
+
+import argparse
+import json
+import sys
+import urllib.request
+from functools import partial
+from pathlib import Path
+
+from artifacts import artifact_path, default_store
+from chains import alias_rpc_url, load_chain_ids, load_chains
+from createx import to_bytes, to_checksum_address
+from diff_cuts import (ADD, REPLACE, REMOVE, current_mapping, diff_cuts,
+                       format_cuts)
+from file_pipeline import (PROCESSED, SKIPPED, ERROR, add_jobs_argument, run)
+from generate_deployers import (ADAPTER_DEPLOYMENT,
+                                ADAPTER_DEPLOYMENT_WITH_ENV_ARGS, Template,
+                                build_adapter_contexts, load_contracts_config,
+                                load_template, write_if_changed)
+from keccak import keccak256, selector
+
+ROOT = Path(__file__).parent.parent
+REGISTRY_PATH = ROOT / "evm" / "registry.json"
+PLANS_DIR = ROOT / "evm" / "scripts" / "plans"
+PLAN_TEMPLATE = "DeploymentPlanScript.s.sol.tpl"
+
+MISSING, MOVED, STALE, CURRENT = 'missing', 'moved', 'stale', 'current'
+
+# IDiamondLoupe.facetAddress(bytes4)
+FACET_ADDRESS_SELECTOR = selector('facetAddress(bytes4)')
+RPC_BATCH_SIZE = 100
+RPC_TIMEOUT = 60
+
+# Deployment of a facet, cut in afterwards by the plan's selector cuts
+FACET_DEPLOYMENT = Template(
+    """
+        // Deploy {{CONTRACT_NAME}}
+        console.log("Deploying {{CONTRACT_NAME}}...");
+        {
+            address facetAddr = CREATEX.deployCreate3(
+                {{SALT}},
+                type({{CONTRACT_NAME}}).creationCode
+            );
+            require(facetAddr == {{EXPECTED_ADDRESS}}, "{{CONTRACT_NAME}} address mismatch");
+            console.log("{{CONTRACT_NAME}} deployed at:", facetAddr);
+        }""", "FACET_DEPLOYMENT")
+
+
+def load_registry() -> dict:
+  with open(REGISTRY_PATH) as f:
+    return json.load(f)
+
+
+def save_registry(registry: dict):
+  with open(REGISTRY_PATH, 'w') as f:
+    json.dump(registry, f, indent=4)
+    f.write('\n')
+
+
+def artifact_codehash(contract_name: str):
+  """keccak256 of a contract's compiled runtime bytecode, None if not compiled"""
+  try:
+    bytecode = default_store().get(artifact_path(contract_name),
+                                   'deployedBytecode')['object']
+  except (OSError, ValueError, KeyError, TypeError):
+    return None
+  return '0x' + keccak256(bytes.fromhex(bytecode.removeprefix('0x'))).hex()
+
+
+def load_targets(config: dict) -> dict:
+  """Expected address and local bytecode hash of every deployable facet and adapter"""
+  targets = {}
+  for name, facet_config in config.get("facets", {}).items():
+    if facet_config.get('includeInDeployer', True):
+      targets[name] = {
+          'kind': 'facet',
+          'address': facet_config['expectedAddress']
+      }
+  for adapters in config.get("adapters", {}).values():
+    for name, adapter_config in adapters.items():
+      targets[name] = {
+          'kind': 'adapter',
+          'address': adapter_config['expectedAddress']
+      }
+  for name, target in targets.items():
+    target['address'] = to_checksum_address(to_bytes(target['address'], 20))
+    target['codehash'] = artifact_codehash(name)
+  return targets
+
+
+def classify(target: dict, recorded) -> str:
+  if not recorded:
+    return MISSING
+  if recorded['address'].lower() != target['address'].lower():
+    return MOVED
+  if recorded.get('codehash') != target['codehash']:
+    return STALE
+  return CURRENT
+
+
+def frozen_facets(config: dict) -> set:
+  """Facets cut at diamond construction (includeInCuts: false), never cut by a plan"""
+  return {
+      name
+      for name, facet_config in config.get("facets", {}).items()
+      if not facet_config.get('includeInCuts', True)
+  }
+
+
+def facet_signatures(mapping: dict) -> dict:
+  """facet -> signatures it serves in a selector mapping"""
+  signatures = {}
+  for entry in mapping.values():
+    signatures.setdefault(entry['facet'], []).append(entry['signature'])
+  return signatures
+
+
+def deployed_mapping(recorded: dict, signatures: dict) -> dict:
+  """selector -> {facet, address, signature} served by a chain's diamond, as recorded"""
+  mapping = {}
+  for name, entry in recorded.items():
+    if 'selectors' not in entry and name not in signatures:
+      continue  # diamond, adapters, facets cut at construction
+    address = to_checksum_address(to_bytes(entry['address'], 20))
+    for signature in entry.get('selectors', signatures.get(name, [])):
+      mapping[selector(signature)] = {
+          'facet': name,
+          'address': address,
+          'signature': signature
+      }
+  return mapping
+
+
+def plan_chain(shared: dict, meta_path: Path):
+  """Plan and render one chain's deployment script, returning a pipeline (status, message)"""
+  alias = shared['chains'][meta_path]
+  chain_name = meta_path.stem
+  plan_path = PLANS_DIR / f"{chain_name}DeploymentPlan.gen.s.sol"
+  recorded = shared['registry'].get(alias, {})
+
+  if 'BTRDiamond' not in recorded:
+    plan_path.unlink(missing_ok=True)
+    return SKIPPED, (f"🆕 {alias}: no diamond recorded, full deployment "
+                     f"(DiamondDeployerScript + AdapterDeployerScript)")
+
+  facets, adapters, blocked = {}, {}, []
+  for name, target in shared['targets'].items():
+    status = classify(target, recorded.get(name))
+    if status == STALE:
+      blocked.append(name)
+    elif status in (MISSING, MOVED):
+      if target['kind'] == 'facet':
+        facets[name] = shared['facet_contexts'][name]
+      else:
+        adapters[name] = shared['adapter_contexts'][name]
+
+  # Stale facets keep serving their recorded selectors until redeployed
+  current = {
+      sel: entry
+      for sel, entry in shared['mapping'].items()
+      if entry['facet'] not in blocked
+  }
+  cuts = diff_cuts(deployed_mapping(recorded, shared['signatures']), current,
+                   shared['frozen'] | set(blocked))
+
+  lines = [
+      f"  ⚠️ {name}: stale bytecode at its expected address, set a new salt"
+      for name in blocked
+  ]
+  if not facets and not adapters and not cuts:
+    plan_path.unlink(missing_ok=True)
+    return SKIPPED, "\n".join([f"✅ {alias}: up to date"] + lines)
+
+  chain_id = shared['chain_ids'].get(alias)
+  context = {
+      "CHAIN_NAME":
+      chain_name,
+      "CHAIN_ALIAS":
+      alias,
+      "CHAIN_CHECK":
+      f'require(block.chainid == {chain_id}, "Plan is for {alias}");'
+      if chain_id else
+      f"// No foundry rpc endpoint for {alias}: chain id not checked",
+      "DIAMOND_ADDRESS":
+      to_checksum_address(to_bytes(recorded['BTRDiamond']['address'], 20)),
+      "FACET_IMPORTS":
+      "\n".join(f'import {{{name}}} from "@facets/{name}.sol";'
+                for name in facets),
+      "FACET_COUNT":
+      str(len(facets)),
+      "FACET_DEPLOYMENTS":
+      "\n".join(FACET_DEPLOYMENT.render(c) for c in facets.values()),
+      "CUT_COUNT":
+      str(len(cuts)),
+      "CUTS":
+      format_cuts(cuts),
+      "ADAPTER_IMPORTS":
+      "\n".join(
+          f'import {{{name}Deployer}} from "@scripts/adapters/{name}Deployer.gen.sol";'
+          for name in adapters),
+      "ADAPTER_COUNT":
+      str(len(adapters)),
+      "ADAPTER_DEPLOYMENTS":
+      "\n".join((ADAPTER_DEPLOYMENT_WITH_ENV_ARGS
+                 if c["ARGS_SET"] else ADAPTER_DEPLOYMENT).render(c)
+                for c in adapters.values()),
+  }
+  write_if_changed(plan_path, load_template(PLAN_TEMPLATE).render(context))
+
+  counts = {action: 0 for action in (ADD, REPLACE, REMOVE)}
+  for action, _, _, selectors in cuts:
+    counts[action] += len(selectors)
+  parts = []
+  if facets or adapters:
+    parts.append("deploys " + ", ".join(list(facets) + list(adapters)))
+  if cuts:
+    parts.append("cuts " +
+                 ", ".join(f"{count} {action.lower()}"
+                           for action, count in counts.items() if count) +
+                 " selector(s)")
+  if not chain_id:
+    lines.append(
+        f"  ⚠️ no foundry rpc endpoint for {alias}, chain id unchecked")
+  return PROCESSED, "\n".join(
+      [f"📝 {alias}: {plan_path.name} {' and '.join(parts)}"] + lines)
+
+
+def rpc_batch(rpc_url: str, calls: list) -> list:
+  """Results of (method, params) JSON-RPC calls, in order, sent as batches"""
+  results = []
+  for start in range(0, len(calls), RPC_BATCH_SIZE):
+    batch = calls[start:start + RPC_BATCH_SIZE]
+    payload = [{
+        'jsonrpc': '2.0',
+        'id': i,
+        'method': method,
+        'params': params
+    } for i, (method, params) in enumerate(batch)]
+    request = urllib.request.Request(
+        rpc_url,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=RPC_TIMEOUT) as response:
+      replies = json.loads(response.read())
+    if not isinstance(replies, list):
+      replies = [replies]
+    by_id = {}
+    for reply in replies:
+      if 'error' in reply:
+        raise ValueError(
+            f"rpc error: {reply['error'].get('message', reply['error'])}")
+      by_id[reply.get('id')] = reply.get('result')
+    results += [by_id.get(i) for i in range(len(batch))]
+  return results
+
+
+def record_chain(alias: str, registry: dict, config: dict, targets: dict,
+                 signatures: dict, rpc_url: str) -> list:
+  """
+  Record a chain's plan as broadcast, as read from the chain: missing/moved contracts with
+  code at their expected address are registered with the local bytecode hash (contracts
+  the broadcast skipped, e.g. env-gated adapters, are not), stale ones are left as they are.
+  Facets are recorded with the selectors the diamond routes to their address.
+  Returns the planned contracts found without code.
+  """
+  chain = registry.setdefault('chains', {}).setdefault(alias, {})
+  diamond = to_checksum_address(
+      to_bytes(config['BTRDiamond']['expectedAddress'], 20))
+  planned = {
+      name: target
+      for name, target in targets.items()
+      if classify(target, chain.get(name)) in (MISSING, MOVED)
+  }
+  addresses = [diamond] + [target['address'] for target in planned.values()]
+  codes = rpc_batch(rpc_url, [('eth_getCode', [address, 'latest'])
+                              for address in addresses])
+  deployed = {
+      address.lower()
+      for address, code in zip(addresses, codes) if code and code != '0x'
+  }
+  if diamond.lower() not in deployed:
+    raise ValueError(f"no code at the diamond address {diamond}")
+
+  chain.setdefault('BTRDiamond', {
+      'address': diamond,
+      'codehash': artifact_codehash('BTRDiamond')
+  })
+  undeployed = []
+  for name, target in planned.items():
+    if target['address'].lower() in deployed:
+      chain[name] = {
+          'address': target['address'],
+          'codehash': target['codehash']
+      }
+    else:
+      undeployed.append(name)
+
+  # Route of every signature known locally or recorded, per the diamond loupe
+  known = set()
+  for sigs in signatures.values():
+    known.update(sigs)
+  for entry in chain.values():
+    known.update(entry.get('selectors', []))
+  known = sorted(known)
+  calls = []
+  for signature in known:
+    data = FACET_ADDRESS_SELECTOR + selector(signature)[2:] + '00' * 28
+    calls.append(('eth_call', [{'to': diamond, 'data': data}, 'latest']))
+  words = rpc_batch(rpc_url, calls)
+  routes = {
+      s: (word or '0x')[2:].rjust(40, '0')[-40:].lower()
+      for s, word in zip(known, words)
+  }
+
+  frozen = frozen_facets(config)
+  for name, entry in chain.items():
+    if name in frozen or ('selectors' not in entry and name not in signatures):
+      continue
+    address = entry['address'].lower()[2:]
+    entry['selectors'] = [s for s in known if routes[s] == address]
+  return undeployed
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Plan per-chain deployments of missing/outdated contracts')
+  parser.add_argument('--chains',
+                      help='comma separated rpc aliases (default: all chains)')
+  parser.add_argument(
+      '--record',
+      metavar='ALIAS',
+      help=
+      "record a chain's broadcast plan in registry.json instead of planning")
+  parser.add_argument(
+      '--rpc-url',
+      help='rpc endpoint read by --record (default: HTTPS_RPC_<chain id>)')
+  add_jobs_argument(parser)
+  args = parser.parse_args()
+
+  config = load_contracts_config()
+  targets = load_targets(config)
+  default_store().save()
+  uncompiled = [
+      name for name, target in targets.items() if not target['codehash']
+  ]
+  if uncompiled:
+    print(
+        f"❌ No compiled artifact for {', '.join(uncompiled)}, run make build first"
+    )
+    sys.exit(1)
+
+  mapping = current_mapping(config)
+  signatures = facet_signatures(mapping)
+  registry = load_registry()
+  if args.record:
+    rpc_url = args.rpc_url or alias_rpc_url(args.record)
+    if not rpc_url:
+      sys.exit(f"❌ No rpc endpoint for {args.record} "
+               "(set its HTTPS_RPC_<chain id> or pass --rpc-url)")
+    try:
+      undeployed = record_chain(args.record, registry, config, targets,
+                                signatures, rpc_url)
+    except (OSError, ValueError) as e:
+      sys.exit(f"❌ {args.record}: {e}")
+    save_registry(registry)
+    for name in undeployed:
+      print(f"  ⚠️ {name}: no code at its expected address, not recorded")
+    print(f"✅ Recorded {args.record} deployments in {REGISTRY_PATH.name}")
+    return
+
+  chains = load_chains()
+  if args.chains:
+    wanted = set(args.chains.split(','))
+    chains = {path: alias for path, alias in chains.items() if alias in wanted}
+
+  facets = config.get("facets", {})
+  shared = {
+      'chains': chains,
+      'chain_ids': load_chain_ids(),
+      'registry': registry.get('chains', {}),
+      'targets': targets,
+      'facet_contexts': {
+          name: {
+              "CONTRACT_NAME": name,
+              "SALT": facet_config["salt"],
+              "EXPECTED_ADDRESS": facet_config["expectedAddress"],
+          }
+          for name, facet_config in facets.items()
+          if facet_config.get('includeInDeployer', True)
+      },
+      'mapping': mapping,
+      'signatures': signatures,
+      'frozen': frozen_facets(config),
+      'adapter_contexts': build_adapter_contexts(config),
+  }
+
+  PLANS_DIR.mkdir(parents=True, exist_ok=True)
+  counts = run(list(chains), partial(plan_chain, shared), args.jobs)
+  print(f"Planned {counts[PROCESSED]} chain deployment(s), "
+        f"{counts[SKIPPED]} chain(s) without plan, {counts[ERROR]} error(s)")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Caching JSON-RPC Proxy
+
+Local JSON-RPC endpoint in front of a chain's rpc, for anvil --fork-url or as a stand-in rpc
+alias of fork tests. The proxy pins the chain to one block: eth_blockNumber returns it and
+latest/pending/safe/finalized tags are rewritten to it, so every state read (eth_getStorageAt,
+eth_getCode, eth_call, eth_getBalance, eth_getTransactionCount, eth_getProof) and block header
+is keyed by an explicit block and can be stored. Responses (and eth_call reverts) are kept in
+a sqlite store (.cache/rpc_cache.sqlite), so a fork replayed at the same block runs offline.
+
+The pinned block is recorded per chain and reused until --block or --refresh changes it.
+
+Usage: python scripts/rpc_cache.py --chain bnb_chain [--port 8545] [--block 48000000]
+       python scripts/rpc_cache.py --chain bnb_chain --offline    # serve the store only
+       anvil --fork-url http://127.0.0.1:8545
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import urllib.request
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from chains import FOUNDRY_TOML, load_chain_ids
+
+ROOT = Path(__file__).parent.parent
+STORE_PATH = ROOT / ".cache" / "rpc_cache.sqlite"
+UPSTREAM_TIMEOUT = 60
+
+# Position of the block parameter of the state reads
+BLOCK_PARAM = {
+    'eth_getStorageAt': 2,
+    'eth_getCode': 1,
+    'eth_call': 1,
+    'eth_getBalance': 1,
+    'eth_getTransactionCount': 1,
+    'eth_getProof': 2,
+    'eth_getBlockByNumber': 0,
+}
+# Block independent methods
+STATIC_METHODS = {'eth_chainId', 'net_version'}
+# Immutable once known (a null result is not stored)
+HASH_METHODS = {
+    'eth_getBlockByHash', 'eth_getTransactionByHash',
+    'eth_getTransactionReceipt'
+}
+MOVING_TAGS = {'latest', 'pending', 'safe', 'finalized'}
+# eth_call errors that are a deterministic outcome of the call (reverts), hence cacheable
+REVERT_CODES = {3, -32000, -32015}
+
+
+def _lower(value):
+  """Params with hex strings lowercased, so equal requests share a key"""
+  if isinstance(value, str):
+    return value.lower()
+  if isinstance(value, list):
+    return [_lower(v) for v in value]
+  if isinstance(value, dict):
+    return {k: _lower(v) for k, v in value.items()}
+  return value
+
+
+class ResponseStore:
+  """sqlite store of JSON-RPC responses keyed by (chain id, method, params)"""
+
+  def __init__(self, path: Path = STORE_PATH):
+    self.path = path
+    self.local = threading.local()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with self._connection() as db:
+      db.execute("PRAGMA journal_mode=WAL")
+      db.execute("CREATE TABLE IF NOT EXISTS responses (chain INTEGER, "
+                 "method TEXT, params TEXT, response BLOB, "
+                 "PRIMARY KEY (chain, method, params)) WITHOUT ROWID")
+      db.execute(
+          "CREATE TABLE IF NOT EXISTS pins (chain INTEGER PRIMARY KEY, block INTEGER)"
+      )
+
+  def _connection(self) -> sqlite3.Connection:
+    # One connection per server thread
+    if not hasattr(self.local, 'db'):
+      self.local.db = sqlite3.connect(self.path, timeout=30)
+    return self.local.db
+
+  def get(self, chain: int, method: str, params: str):
+    row = self._connection().execute(
+        "SELECT response FROM responses WHERE chain=? AND method=? AND params=?",
+        (chain, method, params)).fetchone()
+    return json.loads(zlib.decompress(row[0])) if row else None
+
+  def put(self, chain: int, method: str, params: str, response: dict):
+    blob = zlib.compress(json.dumps(response, separators=(',', ':')).encode())
+    with self._connection() as db:
+      db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                 (chain, method, params, blob))
+
+  def pinned_block(self, chain: int) -> Optional[int]:
+    row = self._connection().execute("SELECT block FROM pins WHERE chain=?",
+                                     (chain, )).fetchone()
+    return row[0] if row else None
+
+  def pin(self, chain: int, block: int):
+    with self._connection() as db:
+      db.execute("INSERT OR REPLACE INTO pins VALUES (?, ?)", (chain, block))
+
+  def stats(self) -> list:
+    """(chain, pinned block, method, responses, bytes) per chain and method"""
+    return self._connection().execute(
+        "SELECT r.chain, p.block, r.method, COUNT(*), SUM(LENGTH(r.response)) "
+        "FROM responses r LEFT JOIN pins p ON p.chain = r.chain "
+        "GROUP BY r.chain, r.method ORDER BY r.chain, r.method").fetchall()
+
+
+class CachingProxy:
+  """Serves JSON-RPC requests from the store, forwarding misses upstream when online"""
+
+  def __init__(self,
+               store: ResponseStore,
+               chain: int,
+               upstream: Optional[str],
+               block: Optional[int] = None,
+               refresh: bool = False):
+    self.store, self.chain, self.upstream = store, chain, upstream
+    self.lock = threading.Lock()
+    self.hits = self.misses = 0
+    if block is None and not refresh:
+      block = store.pinned_block(chain)
+    if block is None:
+      if not upstream:
+        raise ValueError(
+            f"no block pinned for chain {chain}, an upstream rpc is required")
+      block = int(self.forward({'method': 'eth_blockNumber'})['result'], 16)
+    store.pin(chain, block)
+    self.block = block
+
+  def forward(self, request: dict) -> dict:
+    payload = json.dumps({
+        'jsonrpc': '2.0',
+        'id': 1,
+        'method': request['method'],
+        'params': request.get('params', [])
+    }).encode()
+    http_request = urllib.request.Request(
+        self.upstream,
+        data=payload,
+        headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(http_request,
+                                timeout=UPSTREAM_TIMEOUT) as response:
+      return json.loads(response.read())
+
+  def _pin(self, params: list, index: int) -> Optional[list]:
+    """params with a moving block tag replaced by the pinned block (None if not cacheable)"""
+    params = list(params)
+    while len(params) <= index:
+      params.append('latest')
+    block = params[index]
+    if isinstance(block, dict):  # EIP-1898 {blockNumber} / {blockHash}
+      block = block.get('blockNumber', block.get('blockHash'))
+    if block in MOVING_TAGS:
+      params[index] = hex(self.block)
+    elif block != 'earliest' and not (isinstance(block, str)
+                                      and block.startswith('0x')):
+      return None
+    return params
+
+  def key(self, request: dict) -> Optional[tuple]:
+    """(method, canonical params) of a cacheable request"""
+    method, params = request.get('method'), request.get('params') or []
+    if method in BLOCK_PARAM:
+      params = self._pin(params, BLOCK_PARAM[method])
+    elif method not in STATIC_METHODS and method not in HASH_METHODS:
+      return None
+    if params is None:
+      return None
+    return method, json.dumps(_lower(params), separators=(',', ':'))
+
+  def handle(self, request: dict) -> dict:
+    """Response to a single JSON-RPC request"""
+    reply = {'jsonrpc': '2.0', 'id': request.get('id')}
+    if request.get('method') == 'eth_blockNumber':
+      return {**reply, 'result': hex(self.block)}
+
+    key = self.key(request)
+    if key:
+      cached = self.store.get(self.chain, *key)
+      if cached is not None:
+        with self.lock:
+          self.hits += 1
+        return {**reply, **cached}
+    with self.lock:
+      self.misses += 1
+    if not self.upstream:
+      return {
+          **reply, 'error': {
+              'code': -32000,
+              'message':
+              f"rpc_cache: {request.get('method')} not cached (offline)"
+          }
+      }
+
+    if key:
+      request = {**request, 'params': json.loads(key[1])}
+    response = self.forward(request)
+    outcome = {k: response[k] for k in ('result', 'error') if k in response}
+    error = outcome.get('error')
+    cacheable = key and (outcome.get('result') is not None or error and key[0]
+                         == 'eth_call' and error.get('code') in REVERT_CODES)
+    if cacheable:
+      self.store.put(self.chain, *key, outcome)
+    return {**reply, **outcome}
+
+
+def make_server(proxy: CachingProxy, port: int) -> ThreadingHTTPServer:
+  """HTTP server answering single and batched JSON-RPC requests through proxy"""
+
+  class Handler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+      try:
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if isinstance(body, list):
+          response = [proxy.handle(request) for request in body]
+        else:
+          response = proxy.handle(body)
+        status = 200
+      except Exception as e:
+        response = {
+            'jsonrpc': '2.0',
+            'id': None,
+            'error': {
+                'code': -32603,
+                'message': f"rpc_cache: {e}"
+            }
+        }
+        status = 500
+      data = json.dumps(response).encode()
+      self.send_response(status)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(data)))
+      self.end_headers()
+      self.wfile.write(data)
+
+    def log_message(self, *args):
+      pass
+
+  return ThreadingHTTPServer(('127.0.0.1', port), Handler)
+
+
+def start_proxy(chain: int,
+                upstream: Optional[str],
+                port: int,
+                block: Optional[int] = None,
+                refresh: bool = False) -> tuple:
+  """Serve a caching proxy from a background thread, returning (proxy, server)"""
+  proxy = CachingProxy(ResponseStore(), chain, upstream, block, refresh)
+  server = make_server(proxy, port)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return proxy, server
+
+
+def alias_upstream(alias: str) -> tuple:
+  """(chain id, resolved endpoint or None) of a foundry rpc alias"""
+  chain_ids = load_chain_ids()
+  if alias not in chain_ids:
+    sys.exit(
+        f"❌ Unknown rpc alias {alias} (see [rpc_endpoints] of {FOUNDRY_TOML})")
+  chain_id = chain_ids[alias]
+  host = os.environ.get(f"HTTPS_RPC_{chain_id}")
+  return chain_id, f"https://{host}" if host else None
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('--chain',
+                      help='foundry rpc alias to proxy (e.g. bnb_chain)')
+  parser.add_argument('--upstream',
+                      help='upstream rpc url (default: the alias endpoint)')
+  parser.add_argument('--chain-id',
+                      type=int,
+                      help='chain id (default: the alias chain id)')
+  parser.add_argument('--port', type=int, default=8545)
+  parser.add_argument('--block',
+                      type=int,
+                      help='block to pin (default: the recorded one)')
+  parser.add_argument(
+      '--refresh',
+      action='store_true',
+      help='pin the upstream latest block instead of the recorded one')
+  parser.add_argument('--offline',
+                      action='store_true',
+                      help='serve the store only, never calling upstream')
+  parser.add_argument('--stats',
+                      action='store_true',
+                      help='print the store content and exit')
+  args = parser.parse_args()
+
+  if args.stats:
+    for chain, block, method, count, size in ResponseStore().stats():
+      print(
+          f"{chain:>8} @{block}  {method:<28} {count:>8} {size / 1e6:8.2f} MB")
+    return
+
+  chain_id, upstream = alias_upstream(args.chain) if args.chain else (None,
+                                                                      None)
+  chain_id = args.chain_id or chain_id
+  upstream = None if args.offline else args.upstream or upstream
+  if chain_id is None:
+    sys.exit("❌ --chain or --chain-id is required")
+  if not upstream and not args.offline:
+    sys.exit(
+        f"❌ No upstream rpc for chain {chain_id} (set HTTPS_RPC_{chain_id} or "
+        "--upstream, or pass --offline)")
+
+  try:
+    proxy, server = start_proxy(chain_id, upstream, args.port, args.block,
+                                args.refresh)
+  except (ValueError, OSError) as e:
+    sys.exit(f"❌ {e}")
+  mode = 'offline' if not upstream else 'online'
+  print(f"🔗 Chain {chain_id} pinned at block {proxy.block}, serving on "
+        f"http://127.0.0.1:{args.port} ({mode})")
+  try:
+    threading.Event().wait()
+  except KeyboardInterrupt:
+    server.shutdown()
+    print(f"\n{proxy.hits} hit(s), {proxy.misses} miss(es)")
+
+
+if __name__ == '__main__':
+  main()
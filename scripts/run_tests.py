@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Sharded Forge Test Runner
+
+Discovers the test contracts under evm/tests (non-abstract contracts declaring or inheriting
+test/invariant functions), splits them into shards balanced on their historical durations
+(.cache/test_durations.json) and runs one `forge test --match-contract` process per shard in
+parallel, after a single shared compilation.
+
+Fork suites (vm.createSelectFork/createFork on an rpc alias, directly or through a chain meta's
+__id()) run against one local anvil fork per chain, started once and shared by every shard:
+upstream state is fetched once and all shards see the same block. The aliases are redirected
+through a generated copy of foundry.toml (FOUNDRY_CONFIG). With --rpc-cache, the forks read
+through the persistent caching proxy of scripts/rpc_cache.py (pinned block, sqlite store), so
+repeated runs need no network with --offline.
+
+Results are merged into one summary and optionally into a JUnit (.xml) or JSON report.
+Unknown arguments are forwarded to forge test.
+
+Usage: python scripts/run_tests.py [-j 4] [--match-contract REGEX] [--report results.xml]
+       python scripts/run_tests.py --rpc-cache [--offline] --match-path "tests/integration/*"
+       python scripts/run_tests.py --no-fork-cache --match-test testDeposit -vvv
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from heapq import heapify, heapreplace
+from pathlib import Path
+from statistics import median
+
+from chains import FOUNDRY_TOML, ID_RE, META_DIR, load_chain_ids
+from rpc_cache import start_proxy
+
+ROOT = Path(__file__).parent.parent
+EVM_DIR = ROOT / "evm"
+TESTS_DIR = EVM_DIR / "tests"
+DURATIONS_PATH = ROOT / ".cache" / "test_durations.json"
+FORK_CONFIG_PATH = ROOT / ".cache" / "foundry.fork.toml"
+DEFAULT_DURATION = 1.0
+ANVIL_BASE_PORT = 8600
+RPC_CACHE_BASE_PORT = 8700
+ANVIL_TIMEOUT = 60
+
+# `[abstract] contract Name [is A, B(args)] {`
+CONTRACT_RE = re.compile(
+    r'^\s*(abstract\s+)?contract\s+(\w+)(?:\s+is\s+([^{]+))?\{', re.MULTILINE)
+BASE_RE = re.compile(r'(\w+)\s*(?:\([^)]*\))?\s*(?:,|$)')
+TEST_FUNCTION_RE = re.compile(r'\bfunction\s+(?:test|invariant)\w*\s*\(')
+# Argument of a fork cheatcode: an rpc alias/url literal or an expression (e.g. __id())
+FORK_RE = re.compile(r'\bvm\.create(?:Select)?Fork\(\s*(?:"([^"]*)"|([^,)]*))')
+META_CONTRACT_RE = re.compile(r'contract\s+(\w+)\s+is')
+# foundry.toml's [rpc_endpoints] table and its `alias = "url"` entries
+RPC_SECTION_RE = re.compile(r'^\[rpc_endpoints\][^\[]*', re.MULTILINE)
+ENDPOINT_RE = re.compile(r'^(\w+)\s*=\s*"([^"\n]*)"', re.MULTILINE)
+# humantime durations of forge's JSON suite results, e.g. "1s 234ms 5us"
+HUMANTIME_RE = re.compile(r'([\d.]+)\s*(ns|us|µs|ms|s|m|h)')
+HUMANTIME_UNITS = {
+    'ns': 1e-9,
+    'us': 1e-6,
+    'µs': 1e-6,
+    'ms': 1e-3,
+    's': 1,
+    'm': 60,
+    'h': 3600
+}
+
+
+def load_meta_aliases() -> dict:
+  """Chain meta contract name -> foundry rpc alias returned by its __id()"""
+  aliases = {}
+  for meta_path in sorted(META_DIR.glob("*.sol")):
+    text = meta_path.read_text()
+    alias, name = ID_RE.search(text), META_CONTRACT_RE.search(text)
+    if alias and name:
+      aliases[name.group(1)] = alias.group(1)
+  return aliases
+
+
+def scan_contracts(tests_dir: Path = TESTS_DIR) -> dict:
+  """Contract name -> {path, abstract, bases, tests, forks} of the contracts under tests_dir"""
+  contracts = {}
+  for path in sorted(tests_dir.rglob("*.t.sol")):
+    text = path.read_text()
+    headers = list(CONTRACT_RE.finditer(text))
+    for i, header in enumerate(headers):
+      end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+      body = text[header.end():end]
+      forks = {
+          literal or '__id()'
+          for literal, expression in FORK_RE.findall(body)
+          if literal or expression.strip().startswith('__id(')
+      }
+      contracts[header.group(2)] = {
+          'path': path,
+          'abstract': bool(header.group(1)),
+          'bases': BASE_RE.findall(header.group(3) or ''),
+          'tests': bool(TEST_FUNCTION_RE.search(body)),
+          'forks': forks,
+      }
+  return contracts
+
+
+def resolve_suites(contracts: dict, meta_aliases: dict) -> dict:
+  """
+  Runnable test contract -> set of forked rpc aliases (literal urls are left out), inheriting
+  test functions and fork calls from the bases declared under tests/
+  """
+  resolved = {}
+
+  def ancestry(name: str) -> list:
+    if name not in resolved:
+      resolved[name] = [name]  # guards against cycles
+      lineage = [name]
+      for base in contracts.get(name, {}).get('bases', []):
+        lineage += [n for n in ancestry(base) if n not in lineage]
+      resolved[name] = lineage
+    return resolved[name]
+
+  suites = {}
+  for name, contract in contracts.items():
+    if contract['abstract']:
+      continue
+    lineage = [n for n in ancestry(name) if n in contracts]
+    if not any(contracts[n]['tests'] for n in lineage):
+      continue
+    forks = set()
+    for target in set().union(*(contracts[n]['forks'] for n in lineage)):
+      if target == '__id()':
+        forks.update(meta_aliases[n] for n in ancestry(name)
+                     if n in meta_aliases)
+      elif target.isidentifier():
+        forks.add(target)
+    suites[name] = forks
+  return suites
+
+
+def load_durations(path: Path = DURATIONS_PATH) -> dict:
+  try:
+    with open(path) as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+def save_durations(durations: dict, path: Path = DURATIONS_PATH):
+  path.parent.mkdir(parents=True, exist_ok=True)
+  with open(path, 'w') as f:
+    json.dump(durations, f, indent=2, sort_keys=True)
+    f.write('\n')
+
+
+def make_shards(suites, durations: dict, count: int) -> list:
+  """
+  Partition suites into at most count shards of similar expected durations (longest first
+  onto the least loaded shard). Suites never timed weigh the median known duration.
+  """
+  known = [durations[name] for name in suites if name in durations]
+  default = median(known) if known else DEFAULT_DURATION
+  weighted = sorted(((durations.get(name, default), name) for name in suites),
+                    reverse=True)
+  shards = [(0.0, i, []) for i in range(min(count, len(weighted)))]
+  heapify(shards)
+  for weight, name in weighted:
+    load, i, names = shards[0]
+    heapreplace(shards, (load + weight, i, names + [name]))
+  return [names for _, _, names in sorted(shards, key=lambda shard: shard[1])]
+
+
+def seconds(duration) -> float:
+  """Seconds of a forge JSON duration: {secs, nanos}, humantime string or number"""
+  if isinstance(duration, dict):
+    return duration.get('secs', 0) + duration.get('nanos', 0) / 1e9
+  if isinstance(duration, str):
+    return sum(
+        float(value) * HUMANTIME_UNITS[unit]
+        for value, unit in HUMANTIME_RE.findall(duration))
+  return float(duration or 0)
+
+
+def parse_results(output: str) -> dict:
+  """
+  Suite name -> {duration, tests: {name: {status, reason, duration}}} of forge test --json
+  output (None when no JSON report could be found)
+  """
+  start = output.find('{')
+  if start < 0:
+    return None
+  try:
+    report, _ = json.JSONDecoder().raw_decode(output, start)
+  except ValueError:
+    return None
+  results = {}
+  for suite_id, suite in report.items():
+    tests = {}
+    for test_name, test in suite.get('test_results', {}).items():
+      tests[test_name] = {
+          'status': test.get('status', 'Failure'),
+          'reason': test.get('reason') or '',
+          'counterexample': test.get('counterexample'),
+          'duration': seconds(test.get('duration')),
+      }
+    results[suite_id.rsplit(':', 1)[-1]] = {
+        'path': suite_id.rsplit(':', 1)[0],
+        'duration': seconds(suite.get('duration')),
+        'tests': tests,
+    }
+  return results
+
+
+def _port_open(port: int) -> bool:
+  with socket.socket() as sock:
+    sock.settimeout(0.5)
+    return sock.connect_ex(('127.0.0.1', port)) == 0
+
+
+@contextmanager
+def fork_nodes(aliases: set,
+               fork_block: int = None,
+               rpc_cache: bool = False,
+               offline: bool = False):
+  """
+  Start one anvil fork per rpc alias whose endpoint resolves, yielding the path of a
+  foundry.toml copy redirecting those aliases to them (None when nothing is forked).
+  With rpc_cache, upstream requests go through a caching proxy (scripts/rpc_cache.py), which
+  also stands in for anvil when it is not installed.
+  """
+  toml = FOUNDRY_TOML.read_text()
+  section = RPC_SECTION_RE.search(toml)
+  endpoints = dict(ENDPOINT_RE.findall(section.group()))
+  chain_ids = load_chain_ids()
+  upstreams, servers, nodes = {}, [], []
+  try:
+    for i, alias in enumerate(sorted(aliases)):
+      url = os.path.expandvars(endpoints.get(alias, ''))
+      if not url or '$' in url or url == 'https://' or offline:
+        url = None
+      if rpc_cache and alias in chain_ids:
+        try:
+          proxy, server = start_proxy(chain_ids[alias], url,
+                                      RPC_CACHE_BASE_PORT + i, fork_block)
+        except ValueError as e:
+          print(f"⚠️  {alias}: {e}")
+          continue
+        servers.append(server)
+        url = f"http://127.0.0.1:{RPC_CACHE_BASE_PORT + i}"
+        print(f"💾 {alias} cached at block {proxy.block} on {url}")
+      if not url:
+        print(
+            f"⚠️  No endpoint set for fork alias {alias}, its suites fork it directly"
+        )
+        continue
+      upstreams[alias] = url
+
+    if upstreams and shutil.which('anvil'):
+      for i, (alias, url) in enumerate(upstreams.items()):
+        port = ANVIL_BASE_PORT + i
+        cmd = ['anvil', '--fork-url', url, '--port', str(port), '--silent']
+        if fork_block:
+          cmd += ['--fork-block-number', str(fork_block)]
+        nodes.append((alias, port, subprocess.Popen(cmd)))
+
+      deadline = time.monotonic() + ANVIL_TIMEOUT
+      for alias, port, node in nodes:
+        while not _port_open(port):
+          if node.poll() is not None or time.monotonic() > deadline:
+            print(f"❌ anvil fork of {alias} failed to start")
+            sys.exit(1)
+          time.sleep(0.2)
+        endpoints[alias] = f"http://127.0.0.1:{port}"
+        print(f"🔗 {alias} forked on 127.0.0.1:{port}")
+    elif upstreams and servers:
+      endpoints.update({
+          alias: url
+          for alias, url in upstreams.items() if url.startswith('http://')
+      })
+    else:
+      if upstreams:
+        print("⚠️  anvil not found, fork suites fork their endpoints directly")
+      yield None
+      return
+
+    redirected = ENDPOINT_RE.sub(
+        lambda m: f'{m.group(1)} = "{endpoints[m.group(1)]}"', section.group())
+    FORK_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    FORK_CONFIG_PATH.write_text(toml[:section.start()] + redirected +
+                                toml[section.end():])
+    yield FORK_CONFIG_PATH
+  finally:
+    for _, _, node in nodes:
+      node.terminate()
+    for _, _, node in nodes:
+      node.wait()
+    for server in servers:
+      server.shutdown()
+
+
+def run_shard(names: list, forge_args: list, env: dict) -> tuple:
+  """Run forge test on a shard, returning (results or None, forge output)"""
+  pattern = f"^({'|'.join(names)})$"
+  result = subprocess.run(
+      ['forge', 'test', '--json', '--match-contract', pattern, *forge_args],
+      cwd=EVM_DIR,
+      env=env,
+      capture_output=True,
+      text=True)
+  return parse_results(result.stdout), result.stdout + result.stderr
+
+
+def write_report(path: Path, results: dict):
+  """Merged results as JUnit XML (.xml) or JSON (anything else)"""
+  path.parent.mkdir(parents=True, exist_ok=True)
+  if path.suffix != '.xml':
+    with open(path, 'w') as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+      f.write('\n')
+    return
+
+  testsuites = ET.Element('testsuites')
+  for suite_name, suite in sorted(results.items()):
+    tests = suite['tests'].items()
+    testsuite = ET.SubElement(
+        testsuites,
+        'testsuite',
+        name=suite_name,
+        file=suite['path'],
+        tests=str(len(tests)),
+        failures=str(sum(t['status'] == 'Failure' for _, t in tests)),
+        skipped=str(sum(t['status'] == 'Skipped' for _, t in tests)),
+        time=f"{suite['duration']:.3f}")
+    for test_name, test in sorted(tests):
+      testcase = ET.SubElement(testsuite,
+                               'testcase',
+                               classname=suite_name,
+                               name=test_name,
+                               time=f"{test['duration']:.3f}")
+      if test['status'] == 'Failure':
+        failure = ET.SubElement(testcase, 'failure', message=test['reason'])
+        if test['counterexample']:
+          failure.text = json.dumps(test['counterexample'])
+      elif test['status'] == 'Skipped':
+        ET.SubElement(testcase, 'skipped')
+  ET.indent(testsuites)
+  ET.ElementTree(testsuites).write(path,
+                                   encoding='utf-8',
+                                   xml_declaration=True)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+  parser.add_argument('-j',
+                      '--jobs',
+                      type=int,
+                      default=0,
+                      help='parallel forge processes (default: CPU count / 2)')
+  parser.add_argument('--match-contract',
+                      metavar='REGEX',
+                      help='only run the test contracts matching REGEX')
+  parser.add_argument(
+      '--report',
+      type=Path,
+      help='merged report path: JUnit if it ends with .xml, JSON otherwise')
+  parser.add_argument('--no-fork-cache',
+                      action='store_true',
+                      help='let fork suites fork their endpoints directly')
+  parser.add_argument('--fork-block',
+                      type=int,
+                      help='block the shared anvil forks are pinned to')
+  parser.add_argument(
+      '--rpc-cache',
+      action='store_true',
+      help=
+      'fetch fork state through the persistent rpc cache (scripts/rpc_cache.py)'
+  )
+  parser.add_argument(
+      '--offline',
+      action='store_true',
+      help='with --rpc-cache, serve fork state from the cache only')
+  parser.add_argument('--no-build',
+                      action='store_true',
+                      help='skip the shared compilation step')
+  args, forge_args = parser.parse_known_args()
+
+  suites = resolve_suites(scan_contracts(), load_meta_aliases())
+  if args.match_contract:
+    suites = {
+        name: forks
+        for name, forks in suites.items()
+        if re.search(args.match_contract, name)
+    }
+  if not suites:
+    print("❌ No test contract found")
+    sys.exit(1)
+
+  jobs = args.jobs or max(1, (os.cpu_count() or 2) // 2)
+  durations = load_durations()
+  shards = make_shards(suites, durations, jobs)
+  print(f"🧪 {len(suites)} test contract(s) in {len(shards)} shard(s)\n")
+
+  if not args.no_build:
+    build = subprocess.run(['forge', 'build'], cwd=EVM_DIR)
+    if build.returncode != 0:
+      print("❌ Compilation failed")
+      sys.exit(1)
+
+  aliases = set() if args.no_fork_cache else set().union(*suites.values())
+  # Each shard gets its share of the cores instead of every forge process using all of them
+  threads = ['--threads', str(max(1, (os.cpu_count() or 1) // len(shards)))]
+  start = time.monotonic()
+  with fork_nodes(aliases, args.fork_block, args.rpc_cache or args.offline,
+                  args.offline) as fork_config:
+    env = dict(os.environ)
+    if fork_config:
+      env['FOUNDRY_CONFIG'] = str(fork_config)
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+      outputs = list(
+          executor.map(
+              lambda names: run_shard(names, threads + forge_args, env),
+              shards))
+  elapsed = time.monotonic() - start
+
+  results, broken = {}, []
+  for names, (shard_results, output) in zip(shards, outputs):
+    if shard_results is None:
+      broken.append(names)
+      print(f"❌ Shard {', '.join(names)} produced no results:\n{output}")
+      continue
+    results.update(shard_results)
+
+  passed = failed = skipped = 0
+  for suite_name, suite in sorted(results.items()):
+    durations[suite_name] = round(suite['duration'], 3)
+    statuses = [test['status'] for test in suite['tests'].values()]
+    passed += statuses.count('Success')
+    failed += statuses.count('Failure')
+    skipped += statuses.count('Skipped')
+    icon = '❌' if 'Failure' in statuses else '✅'
+    print(
+        f"{icon} {suite_name} ({len(statuses)} tests, {suite['duration']:.2f}s)"
+    )
+    for test_name, test in sorted(suite['tests'].items()):
+      if test['status'] == 'Failure':
+        print(f"    ❌ {test_name}: {test['reason']}")
+        if test['counterexample']:
+          print(f"       counterexample: {json.dumps(test['counterexample'])}")
+  save_durations(durations)
+  if args.report:
+    write_report(args.report, results)
+
+  print(f"\n>> {passed} passed, {failed} failed, {skipped} skipped "
+        f"in {elapsed:.1f}s ({len(shards)} shards)")
+  if failed or broken:
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+  main()
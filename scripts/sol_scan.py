@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Solidity Source Scanner
+
+Classifies the lines of a Solidity source in a single linear pass (SPDX, pragma, blank,
+block comment openers, line comments, code) and precomputes the lookups the header
+strippers need (block comment extents, keyword presence), so stripping never mutates
+the line list nor rescans the file.
+"""
+
+import bisect
+import re
+
+SPDX, PRAGMA, BLANK, BLOCK, COMMENT, CODE = range(6)
+
+
+def _classify(stripped: str) -> int:
+  if stripped.startswith('// SPDX-License-Identifier'):
+    return SPDX
+  if stripped.startswith('pragma '):
+    return PRAGMA
+  if not stripped:
+    return BLANK
+  if stripped.startswith('/*'):
+    return BLOCK
+  if stripped.startswith('//'):
+    return COMMENT
+  return CODE
+
+
+class SourceLines:
+  """Line-indexed view of a source file, built in one pass."""
+
+  def __init__(self, lines: list):
+    self.lines = lines
+    self.stripped = [line.strip() for line in lines]
+    self.kinds = [_classify(s) for s in self.stripped]
+
+    # block_end[i]: exclusive end of a block comment opened on line i, i.e. one past the
+    # first line at or after i ending with '*/' (end of file if unterminated)
+    n = len(lines)
+    self.block_end = [n] * n
+    close = n
+    for i in range(n - 1, -1, -1):
+      if self.stripped[i].endswith('*/'):
+        close = i
+      self.block_end[i] = close + 1 if close < n else n
+
+  def keyword_counts(self, keywords) -> list:
+    """Prefix counts of lines containing any keyword (case-insensitive)."""
+    counts = [0]
+    for line in self.lines:
+      lower = line.lower()
+      counts.append(counts[-1] + any(k in lower for k in keywords))
+    return counts
+
+
+def keyword_spans(text: str, keywords) -> tuple:
+  """Start and end offsets of every (non-overlapping) keyword occurrence in text."""
+  pattern = re.compile('|'.join(re.escape(k) for k in keywords))
+  matches = list(pattern.finditer(text))
+  return [m.start() for m in matches], [m.end() for m in matches]
+
+
+def window_has_keyword(spans: tuple, start: int, width: int) -> bool:
+  """Whether a keyword occurrence lies entirely within text[start:start + width]."""
+  starts, ends = spans
+  i = bisect.bisect_left(starts, start)
+  return i < len(starts) and ends[i] <= start + width
+
+
+def collapse_blank_lines(lines: list) -> list:
+  """Collapse runs of blank lines into a single blank line."""
+  cleaned = []
+  prev_empty = False
+  for line in lines:
+    empty = not line.strip()
+    if not (empty and prev_empty):
+      cleaned.append(line)
+    prev_empty = empty
+  return cleaned
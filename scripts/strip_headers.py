@@ -3,99 +3,106 @@
 Solidity Header Stripper
 
 Removes SPDX license identifiers and @title/@notice/@dev/@author comments
-Usage: python scripts/strip_headers.py
+Usage: python scripts/strip_headers.py [--jobs N]
 """
 
+import argparse
 from pathlib import Path
 
+from file_pipeline import PROCESSED, ERROR, add_jobs_argument, run
+from git_changes import add_changed_argument, changed_files
+from walk import DEFAULT_EXCLUDES, add_exclude_argument, iter_files
+from sol_scan import (SourceLines, BLOCK, COMMENT, collapse_blank_lines,
+                      keyword_spans, window_has_keyword)
+
+HEADER_TAGS = ('@title', '@notice', '@dev', '@author')
+HEADER_TAG_LINES = ('* @title', '* @notice', '* @dev', '* @author')
+DECLARATIONS = ('contract ', 'library ', 'interface ', 'abstract ')
+
+# How far past a block comment opener to look for header tags
+HEADER_WINDOW = 500
+
+
+def strip_text(content: str) -> str:
+  """Strip headers and comments from Solidity source text in a single pass"""
+  lines = content.split('\n')
+  src = SourceLines(lines)
+  tag_spans = keyword_spans(content, HEADER_TAGS)
+
+  new_lines = []
+  in_comment_block = False
+  skip_until_contract = False
+  offset = 0
+
+  for i, line in enumerate(lines):
+    line_offset = offset
+    offset += len(line) + 1
+    stripped = src.stripped[i]
+
+    # Skip SPDX license
+    if 'SPDX-License-Identifier' in line:
+      continue
+
+    # Skip comment blocks that contain @title, @notice, @dev, @author
+    if src.kinds[i] == BLOCK and window_has_keyword(tag_spans, line_offset,
+                                                    HEADER_WINDOW):
+      in_comment_block = src.block_end[i] > i + 1
+      continue
+
+    if in_comment_block:
+      if stripped.endswith('*/'):
+        in_comment_block = False
+      continue
+
+    # Skip single-line comments with @title, @notice, etc.
+    if src.kinds[i] == COMMENT and any(x in stripped for x in HEADER_TAGS):
+      continue
+
+    # Skip duplicate title comments
+    lower = stripped.lower()
+    if any(x in lower for x in HEADER_TAG_LINES):
+      skip_until_contract = True
+      continue
+
+    if skip_until_contract and stripped.startswith(DECLARATIONS):
+      skip_until_contract = False
+      new_lines.append(line)
+      continue
 
-def strip_file(file_path: Path):
-  """Strip headers and comments from a single Solidity file"""
-  try:
-    content = file_path.read_text()
-    lines = content.split('\n')
-
-    new_lines = []
-    in_comment_block = False
-    skip_until_contract = False
-
-    for line in lines:
-      stripped = line.strip()
-
-      # Skip SPDX license
-      if 'SPDX-License-Identifier' in line:
-        continue
-
-      # Skip comment blocks that contain @title, @notice, @dev, @author
-      if stripped.startswith('/*') and any(
-          x in content[content.find(line):content.find(line) + 500]
-          for x in ['@title', '@notice', '@dev', '@author']):
-        in_comment_block = True
-        continue
-
-      if in_comment_block:
-        if stripped.endswith('*/'):
-          in_comment_block = False
-        continue
-
-      # Skip single-line comments with @title, @notice, etc.
-      if stripped.startswith('//') and any(
-          x in stripped for x in ['@title', '@notice', '@dev', '@author']):
-        continue
-
-      # Skip duplicate title comments
-      if any(x in stripped.lower()
-             for x in ['* @title', '* @notice', '* @dev', '* @author']):
-        skip_until_contract = True
-        continue
-
-      if skip_until_contract and (stripped.startswith('contract ')
-                                  or stripped.startswith('library ')
-                                  or stripped.startswith('interface ')
-                                  or stripped.startswith('abstract ')):
-        skip_until_contract = False
-        new_lines.append(line)
-        continue
-
-      if skip_until_contract:
-        continue
+    if skip_until_contract:
+      continue
 
-      new_lines.append(line)
+    new_lines.append(line)
+
+  return '\n'.join(collapse_blank_lines(new_lines)).rstrip() + '\n'
 
-    # Clean up excessive empty lines
-    cleaned_lines = []
-    prev_empty = False
-    for line in new_lines:
-      if line.strip() == '':
-        if not prev_empty:
-          cleaned_lines.append(line)
-        prev_empty = True
-      else:
-        cleaned_lines.append(line)
-        prev_empty = False
-
-    new_content = '\n'.join(cleaned_lines).rstrip() + '\n'
-    file_path.write_text(new_content)
-    return True
+
+def strip_file(file_path: Path):
+  """Strip headers and comments from a single Solidity file, returning a pipeline (status, message)"""
+  try:
+    file_path.write_text(strip_text(file_path.read_text()))
+    return PROCESSED, None
 
   except Exception as e:
-    print(f"Error processing {file_path}: {e}")
-    return False
+    return ERROR, f"Error processing {file_path}: {e}"
 
 
 def main():
   """Strip headers from all Solidity files"""
-  sol_files = list(Path('.').rglob('*.sol'))
-  sol_files = [
-      f for f in sol_files if '/out/' not in str(f) and '/.deps/' not in str(f)
-  ]
-
-  stripped = 0
-  for file_path in sol_files:
-    if strip_file(file_path):
-      stripped += 1
-
-  print(f"Stripped headers from {stripped}/{len(sol_files)} files")
+  parser = argparse.ArgumentParser(description='Strip Solidity headers')
+  add_jobs_argument(parser)
+  add_exclude_argument(parser)
+  add_changed_argument(parser)
+  args = parser.parse_args()
+
+  excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+  if args.changed:
+    sol_files = changed_files(args.changed, '.', ('.sol', ), excludes)
+  else:
+    sol_files = list(iter_files('.', ('.sol', ), excludes))
+
+  counts = run(sol_files, strip_file, args.jobs)
+  print(f"Stripped headers from {counts[PROCESSED]}/{len(sol_files)} files")
 
 
 if __name__ == '__main__':
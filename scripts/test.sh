@@ -10,16 +10,13 @@
 #
 # @title Test Runner Script - Executes Foundry tests
 # @copyright 2025
-# @notice Runs the Solidity test suite using `forge test`
-# @dev Standard script for running unit and integration tests
+# @notice Runs the Solidity test suite through scripts/run_tests.py
+# @dev Test contracts are sharded across parallel forge processes, fork suites share local
+#      anvil forks; arguments are forwarded (e.g. -j 4, --report results.xml, --match-test X)
 # @author BTR Team
 #
 
 set -euo pipefail
 
-cd "$(dirname "${BASH_SOURCE[0]}")/../evm" || exit 1
-echo -e "\n>> Running tests\n"
-forge test -vvv "$@"
-exit_code=$?
-echo -e "\n>> $([[ $exit_code -eq 0 ]] && echo '✔️ Success' || echo '⚠️ Failed')\n"
-exit $exit_code
+cd "$(dirname "${BASH_SOURCE[0]}")/.." || exit 1
+exec python3 scripts/run_tests.py "$@"
@@ -0,0 +1,63 @@
+from benchmarks import parse_gas_report
+
+# forge 0.2: markdown-like table, `|---|` rules
+FORGE_02_REPORT = """
+Ran 2 tests for tests/unit/ManagementTest.t.sol:ManagementTest
+[PASS] testPause() (gas: 35123)
+| src/facets/ManagementFacet.sol:ManagementFacet contract |                 |       |        |       |         |
+|---------------------------------------------------------|-----------------|-------|--------|-------|---------|
+| Deployment Cost                                         | Deployment Size |       |        |       |         |
+| 2,345,678                                               | 10,724          |       |        |       |         |
+| Function Name                                           | min             | avg   | median | max   | # calls |
+| pause                                                   | 2301            | 24012 | 27650  | 45211 | 12      |
+| unpause                                                 | 2290            | 11050 | 11050  | 19810 | 2       |
+"""
+
+# forge 1.x: box-drawn table, `|---+---|` and `+===+` rules, blank spacer rows
+FORGE_1X_REPORT = """
+╭---------------------------------------------------------+-----------------+-------+--------+-------+---------╮
+| src/facets/ManagementFacet.sol:ManagementFacet Contract |                 |       |        |       |         |
++===============================================================================================================+
+| Deployment Cost                                         | Deployment Size |       |        |       |         |
+|---------------------------------------------------------+-----------------+-------+--------+-------+---------|
+| 2345678                                                 | 10724           |       |        |       |         |
+|---------------------------------------------------------+-----------------+-------+--------+-------+---------|
+|                                                         |                 |       |        |       |         |
+|---------------------------------------------------------+-----------------+-------+--------+-------+---------|
+| Function Name                                           | Min             | Avg   | Median | Max   | # Calls |
+|---------------------------------------------------------+-----------------+-------+--------+-------+---------|
+| pause                                                   | 2301            | 24012 | 27650  | 45211 | 12      |
+|---------------------------------------------------------+-----------------+-------+--------+-------+---------|
+| unpause                                                 | 2290            | 11050 | 11050  | 19810 | 2       |
+╰---------------------------------------------------------+-----------------+-------+--------+-------+---------╯
+"""
+
+EXPECTED = {
+    'ManagementFacet': {
+        'deployment': [2345678, 10724],
+        'functions': {
+            'pause': [2301, 24012, 27650, 45211, 12],
+            'unpause': [2290, 11050, 11050, 19810, 2],
+        }
+    }
+}
+
+
+def test_parse_forge_02_table():
+  assert parse_gas_report(FORGE_02_REPORT) == EXPECTED
+
+
+def test_parse_forge_1x_table():
+  assert parse_gas_report(FORGE_1X_REPORT) == EXPECTED
+
+
+def test_parse_json_report():
+  report = """[PASS] testPause() (gas: 35123)
+[{"contract": "src/facets/ManagementFacet.sol:ManagementFacet",
+  "deployment": {"gas": 2345678, "size": 10724},
+  "functions": {
+    "pause": {"calls": 12, "min": 2301, "mean": 24012, "median": 27650, "max": 45211},
+    "unpause": {"calls": 2, "min": 2290, "mean": 11050, "median": 11050, "max": 19810}
+  }}]
+"""
+  assert parse_gas_report(report) == EXPECTED
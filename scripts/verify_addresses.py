@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+CreateX CREATE3 Address Verifier
+
+Recomputes the CREATE3 address of every salt in contracts.json (diamond, token, facets and
+adapters) and checks it against its expectedAddress, then cross-checks each salt against the
+assets/createx3-salts lists through a salt -> address index. Duplicate salts or addresses
+(a salt consumed by more than one contract) fail the check, so typos surface before any
+forge compilation.
+
+Usage: python scripts/verify_addresses.py [--sender 0x...] [--crosschain CHAIN_ID] [--all]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+from createx import (InvalidSalt, compute_address, parse_salts_file, to_bytes,
+                     to_checksum_address)
+
+ROOT = Path(__file__).parent.parent
+CONFIG_PATH = ROOT / 'scripts' / 'contracts.json'
+SALTS_DIR = ROOT / 'assets' / 'createx3-salts'
+
+
+def iter_entries(config: dict):
+  """Yield (name, entry) for every contracts.json entry carrying a salt"""
+  for name in ('BTRDiamond', 'BTR'):
+    if name in config:
+      yield name, config[name]
+  for name, entry in config.get('facets', {}).items():
+    yield f"facets.{name}", entry
+  for group, adapters in config.get('adapters', {}).items():
+    for name, entry in adapters.items():
+      yield f"adapters.{group}.{name}", entry
+
+
+def load_salt_index(salts_dir: Path = SALTS_DIR):
+  """
+  Index every salt list as salt -> (address, list file), all lowercase.
+  Returns the index and the errors found while building it (conflicting duplicates).
+  """
+  index, errors = {}, []
+  for path in sorted(salts_dir.glob('*.txt')):
+    for salt, address in parse_salts_file(path):
+      known = index.get(salt)
+      if known and known[0] != address:
+        errors.append(f"{salt} maps to {known[0]} in {known[1].name} "
+                      f"and {address} in {path.name}")
+        continue
+      index[salt] = (address, path)
+  return index, errors
+
+
+def is_valid_address_case(address: str) -> bool:
+  """Single-case hex or a correct EIP-55 checksum (single-case addresses get checksummed when rendered)"""
+  hex_part = address[2:]
+  if hex_part == hex_part.lower() or hex_part == hex_part.upper():
+    return True
+  return to_checksum_address(to_bytes(address, 20)) == address
+
+
+def verify(config: dict,
+           index: dict,
+           sender: Optional[str] = None,
+           chain_id: Optional[int] = None) -> tuple:
+  """Return (errors, warnings) for every salted entry of config"""
+  errors, warnings = [], []
+  salt_owner, address_owner = {}, {}
+
+  for name, entry in iter_entries(config):
+    salt = entry.get('salt', '').lower()
+    expected = entry.get('expectedAddress', '')
+    if not salt:
+      warnings.append(f"{name}: no salt configured")
+      continue
+
+    if salt in salt_owner:
+      errors.append(f"{name}: salt already consumed by {salt_owner[salt]}")
+    salt_owner.setdefault(salt, name)
+
+    try:
+      computed = compute_address(salt, sender, chain_id)
+    except (InvalidSalt, ValueError) as e:
+      errors.append(f"{name}: invalid salt {salt} ({e})")
+      continue
+
+    if not expected:
+      warnings.append(f"{name}: no expectedAddress, computed {computed}")
+    elif expected.lower() != computed.lower():
+      errors.append(
+          f"{name}: expectedAddress {expected} != computed {computed}")
+    elif not is_valid_address_case(expected):
+      errors.append(
+          f"{name}: bad checksum for {expected}, should be {computed}")
+
+    address = computed.lower()
+    if address in address_owner:
+      errors.append(
+          f"{name}: address {computed} already used by {address_owner[address]}"
+      )
+    address_owner.setdefault(address, name)
+
+    listed = index.get(salt)
+    if listed is None:
+      warnings.append(f"{name}: salt not found in {SALTS_DIR.name} lists")
+    elif listed[0] != address:
+      errors.append(
+          f"{name}: {listed[1].name} lists {listed[0]} for this salt")
+
+  return errors, warnings
+
+
+def verify_lists(index: dict,
+                 sender: Optional[str] = None,
+                 chain_id: Optional[int] = None) -> list:
+  """Recompute every listed salt -> address pair"""
+  errors = []
+  for salt, (address, path) in index.items():
+    try:
+      computed = compute_address(salt, sender, chain_id).lower()
+    except (InvalidSalt, ValueError) as e:
+      errors.append(f"{path.name}: invalid salt {salt} ({e})")
+      continue
+    if computed != address:
+      errors.append(f"{path.name}: {salt} => {address}, computed {computed}")
+  return errors
+
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Verify contracts.json CREATE3 salts and addresses')
+  parser.add_argument(
+      '--sender',
+      help='deploying account (default: each salt\'s permissioned prefix)')
+  parser.add_argument('--crosschain',
+                      type=int,
+                      metavar='CHAIN_ID',
+                      help='chain id for cross-chain protected salts')
+  parser.add_argument('--all',
+                      action='store_true',
+                      help='also recompute every pair of the salt lists')
+  args = parser.parse_args()
+
+  with open(CONFIG_PATH) as f:
+    config = json.load(f)
+
+  index, errors = load_salt_index()
+  entry_errors, warnings = verify(config, index, args.sender, args.crosschain)
+  errors += entry_errors
+  if args.all:
+    errors += verify_lists(index, args.sender, args.crosschain)
+
+  for warning in warnings:
+    print(f"⚠️ {warning}")
+  for error in errors:
+    print(f"❌ {error}")
+  if errors:
+    sys.exit(1)
+
+  checked = sum(1 for _ in iter_entries(config))
+  print(f"✅ {checked} CREATE3 addresses verified against {len(index)} "
+        f"indexed salts")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Pruned Source Tree Walker
+
+Streams source file paths with os.scandir, pruning excluded directories (build outputs,
+dependencies) and .gitignore'd entries before descending into them, so dependency trees
+are never enumerated.
+"""
+
+import fnmatch
+import os
+from pathlib import Path
+
+# Directory names never descended into
+DEFAULT_EXCLUDES = ('.git', 'out', 'cache', '.deps', 'lib', 'arrakis-v2',
+                    'node_modules', '__pycache__', '.venv', '.cache')
+
+
+def add_exclude_argument(parser):
+  """Register the --exclude option (repeatable) on an argparse parser"""
+  parser.add_argument('--exclude',
+                      action='append',
+                      default=[],
+                      metavar='DIR',
+                      help='additional directory name to skip')
+
+
+def _load_gitignore(directory: str) -> list:
+  """Parse a directory's .gitignore into (pattern, negated, dir_only, anchored) rules"""
+  rules = []
+  try:
+    with open(os.path.join(directory, '.gitignore')) as f:
+      lines = f.read().splitlines()
+  except OSError:
+    return rules
+  for line in lines:
+    line = line.strip()
+    if not line or line.startswith('#'):
+      continue
+    negated = line.startswith('!')
+    line = line.lstrip('!')
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    anchored = '/' in line
+    rules.append((line.lstrip('/'), negated, dir_only, anchored))
+  return rules
+
+
+def _is_ignored(rules: list, rel_path: str, name: str, is_dir: bool) -> bool:
+  """Apply gitignore rules in order, the last matching rule wins"""
+  ignored = False
+  for pattern, negated, dir_only, anchored in rules:
+    if dir_only and not is_dir:
+      continue
+    target = rel_path if anchored else name
+    if fnmatch.fnmatchcase(target, pattern):
+      ignored = not negated
+  return ignored
+
+
+def iter_files(root='.',
+               suffixes=('.sol', ),
+               excludes=DEFAULT_EXCLUDES,
+               gitignore=True):
+  """
+  Yield paths (relative to root's form) of files ending with one of suffixes.
+  Excluded directory names and gitignored entries are pruned before descending.
+  """
+  excludes = frozenset(excludes)
+  # Stack of (directory, [(gitignore base, rules)]) so nested .gitignore files apply below them
+  stack = [(str(root), [])]
+  while stack:
+    directory, inherited = stack.pop()
+    scopes = inherited
+    if gitignore:
+      rules = _load_gitignore(directory)
+      if rules:
+        scopes = inherited + [(directory, rules)]
+    try:
+      with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+      continue
+
+    subdirs = []
+    for entry in entries:
+      is_dir = entry.is_dir(follow_symlinks=False)
+      if is_dir and entry.name in excludes:
+        continue
+      if scopes and any(
+          _is_ignored(rules, os.path.relpath(entry.path, base), entry.name,
+                      is_dir) for base, rules in scopes):
+        continue
+      if is_dir:
+        subdirs.append((entry.path, scopes))
+      elif entry.name.endswith(suffixes):
+        yield Path(entry.path)
+    # Reversed so directories are visited in name order
+    stack.extend(reversed(subdirs))
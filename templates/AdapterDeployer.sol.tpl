@@ -8,7 +8,7 @@ pragma solidity ^0.8.29;
  * Any manual changes will be overwritten on the next build.
  *
  * To modify this contract:
- * 1. Edit the template: scripts/templates/AdapterDeployer.sol.tpl
+ * 1. Edit the template: templates/AdapterDeployer.sol.tpl
  * 2. Update configuration: scripts/contracts.json
  * 3. Regenerate: python3 scripts/generate_deployers.py
  */
@@ -18,19 +18,20 @@ import {{{CONTRACT_NAME}}} from "{{IMPORT_PATH}}";
 
 /**
  * @title {{CONTRACT_NAME}}Deployer
- * @notice Self-destructing deployer for {{CONTRACT_NAME}}
- * @dev Deploys {{CONTRACT_NAME}} via CreateX using predetermined salt, then self-destructs
+ * @notice CreateX deployment library for {{CONTRACT_NAME}}
+ * @dev Deploys {{CONTRACT_NAME}} via CreateX using predetermined salt, skipped if already deployed.
+ *      Internal so that CreateX is called by the broadcasting deployer (the salt's permissioned
+ *      prefix): an intermediate deployer contract would change the guarded salt and address.
  * @dev {{DESCRIPTION}}
  */
-contract {{CONTRACT_NAME}}Deployer {
+library {{CONTRACT_NAME}}Deployer {
     ICreateX constant CREATEX = ICreateX(0xba5Ed099633D3B313e4D5F7bdc1305d3c28ba5Ed);
     bytes32 constant SALT = {{SALT}};
     address constant EXPECTED_ADDR = {{EXPECTED_ADDRESS}};
 
-    constructor() {
-        address deployed = CREATEX.deployCreate3(SALT, type({{CONTRACT_NAME}}).creationCode);
+    function deploy(bytes memory constructorArgs) internal returns (address deployed) {
+        if (EXPECTED_ADDR.code.length > 0) return EXPECTED_ADDR;
+        deployed = CREATEX.deployCreate3(SALT, abi.encodePacked(type({{CONTRACT_NAME}}).creationCode, constructorArgs));
         require(deployed == EXPECTED_ADDR, "{{CONTRACT_NAME}} deployment address mismatch");
-        require(deployed != address(0), "{{CONTRACT_NAME}} deployment failed");
-        selfdestruct(payable(msg.sender));
     }
 }
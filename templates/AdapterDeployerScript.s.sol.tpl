@@ -0,0 +1,44 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.29;
+
+/*
+ * ⚠️  DO NOT EDIT THIS FILE MANUALLY ⚠️
+ *
+ * This file is auto-generated by scripts/generate_deployers.py
+ * Any manual changes will be overwritten on the next build.
+ *
+ * To modify this script:
+ * 1. Edit the template: templates/AdapterDeployerScript.s.sol.tpl
+ * 2. Update configuration: scripts/contracts.json (adapters)
+ * 3. Regenerate: python3 scripts/generate_deployers.py
+ */
+
+import {Script} from "forge-std/Script.sol";
+import {console} from "forge-std/console.sol";
+{{ADAPTER_IMPORTS}}
+
+/**
+ * @title AdapterDeployer Script - Batched deployment of all configured adapters
+ * @copyright 2025
+ * @notice Deploys every DEX adapter and oracle provider of contracts.json in a single broadcast
+ * @dev Uses DEPLOYER_PK for the broadcaster and DIAMOND (defaults to the expected diamond address).
+ *      Adapters already deployed on the chain are skipped, as are adapters whose extra constructor
+ *      arguments (contracts.json constructorArgs, read from the environment) are not set.
+ *      CreateX is called directly by the deployer: batching through a multicall contract would
+ *      change msg.sender and break the permissioned salts.
+ * @author BTR Team
+ */
+
+contract AdapterDeployerScript is Script {
+    function run() external {
+        address diamond = vm.envOr("DIAMOND", {{DIAMOND_ADDRESS}});
+        uint256 deployerPk = vm.envUint("DEPLOYER_PK");
+
+        vm.startBroadcast(deployerPk);
+
+        console.log("Deploying {{ADAPTER_COUNT}} adapters for diamond:", diamond);
+{{ADAPTER_DEPLOYMENTS}}
+
+        vm.stopBroadcast();
+    }
+}
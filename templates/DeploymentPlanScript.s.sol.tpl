@@ -0,0 +1,55 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.29;
+
+/*
+ * ⚠️  DO NOT EDIT THIS FILE MANUALLY ⚠️
+ *
+ * This file is auto-generated by scripts/plan_deployments.py
+ * Any manual changes will be overwritten on the next plan.
+ *
+ * To modify this script:
+ * 1. Edit the template: templates/DeploymentPlanScript.s.sol.tpl
+ * 2. Update configuration: scripts/contracts.json, evm/registry.json (chains)
+ * 3. Regenerate: python3 scripts/plan_deployments.py
+ */
+
+import {Script} from "forge-std/Script.sol";
+import {console} from "forge-std/console.sol";
+import {ICreateX} from "@interfaces/ICreateX.sol";
+import {IDiamondCut, FacetCut, FacetCutAction} from "@interfaces/IDiamond.sol";
+{{FACET_IMPORTS}}
+{{ADAPTER_IMPORTS}}
+
+/**
+ * @title {{CHAIN_NAME}} Deployment Plan - Deploys what is missing or outdated on {{CHAIN_ALIAS}}
+ * @copyright 2025
+ * @notice Deploys {{FACET_COUNT}} facet(s) and {{ADAPTER_COUNT}} adapter(s), then applies {{CUT_COUNT}} selector cut(s) to the diamond
+ * @dev Uses DEPLOYER_PK for the broadcaster, run with --rpc-url {{CHAIN_ALIAS}}
+ * @author BTR Team
+ */
+
+contract {{CHAIN_NAME}}DeploymentPlan is Script {
+    ICreateX constant CREATEX = ICreateX(0xba5Ed099633D3B313e4D5F7bdc1305d3c28ba5Ed);
+
+    function run() external {
+        {{CHAIN_CHECK}}
+        address diamond = {{DIAMOND_ADDRESS}};
+        uint256 deployerPk = vm.envUint("DEPLOYER_PK");
+
+        vm.startBroadcast(deployerPk);
+
+{{FACET_DEPLOYMENTS}}
+{{ADAPTER_DEPLOYMENTS}}
+
+        FacetCut[] memory cuts = new FacetCut[]({{CUT_COUNT}});
+        bytes4[] memory selectors;
+{{CUTS}}
+
+        if (cuts.length > 0) {
+            console.log("Applying", cuts.length, "cut(s) to diamond...");
+            IDiamondCut(diamond).diamondCut(cuts, address(0), "");
+        }
+
+        vm.stopBroadcast();
+    }
+}
@@ -0,0 +1,43 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.29;
+
+/*
+ * ⚠️  DO NOT EDIT THIS FILE MANUALLY ⚠️
+ *
+ * This file is auto-generated by scripts/diff_cuts.py
+ * Any manual changes will be overwritten on the next diff.
+ *
+ * To modify this script:
+ * 1. Edit the template: templates/DiamondCutScript.s.sol.tpl
+ * 2. Update configuration: scripts/contracts.json, evm/snapshots/{{CHAIN_ALIAS}}.json
+ * 3. Regenerate: python3 scripts/diff_cuts.py --chain {{CHAIN_ALIAS}}
+ */
+
+import {Script} from "forge-std/Script.sol";
+import {console} from "forge-std/console.sol";
+import {IDiamondCut, FacetCut, FacetCutAction} from "@interfaces/IDiamond.sol";
+
+/**
+ * @title {{CHAIN_NAME}} Diamond Cut - Minimal upgrade of the diamond on {{CHAIN_ALIAS}}
+ * @copyright 2025
+ * @notice Applies {{CUT_COUNT}} cut(s) diffed from the deployed selector snapshot
+ * @dev Uses DEPLOYER_PK for the broadcaster and DIAMOND (defaults to the expected diamond address).
+ *      New facets must be deployed beforehand (cf. scripts/plan_deployments.py)
+ * @author BTR Team
+ */
+
+contract {{CHAIN_NAME}}DiamondCut is Script {
+    function run() external {
+        address diamond = vm.envOr("DIAMOND", {{DIAMOND_ADDRESS}});
+        uint256 deployerPk = vm.envUint("DEPLOYER_PK");
+
+        FacetCut[] memory cuts = new FacetCut[]({{CUT_COUNT}});
+        bytes4[] memory selectors;
+{{CUTS}}
+
+        vm.startBroadcast(deployerPk);
+        console.log("Applying {{CUT_COUNT}} cut(s) to diamond:", diamond);
+        IDiamondCut(diamond).diamondCut(cuts, address(0), "");
+        vm.stopBroadcast();
+    }
+}